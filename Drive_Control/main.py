@@ -1,13 +1,17 @@
 import yaml
 import time
-import threading
 from jetbot import Camera
 
 from src.communication.mqtt_client import MQTTClient
+from src.communication.pose_publisher import PosePublisher
+from src.motion.executor import NavigationExecutor
 from src.motion.motor_control import MotorControl
 from src.motion.navigator import Navigator
+from src.motion.odometry import Odometry
 from src.vision.aligner import Aligner
 from src.vision.detector import ObjectDetector
+from src.vision.frame_grabber import FrameGrabber
+from src.vision.detection_worker import DetectionWorker
 from src.manipulation.grasper import Grasper
 from src.utils.logger import get_logger
 
@@ -22,15 +26,26 @@ class RobotController:
         
         # Hardware & Modules
         self.camera = Camera.instance(width=300, height=300)
+        # vision consumers read from the grabber: new frames only, no per-frame allocation
+        self.frames = FrameGrabber(self.camera, slots=self.config['vision'].get('frame_slots', 3)).start()
         self.motor = MotorControl(self.config)
+        # dead-reckoned pose from every wheel command, integrated in the background
+        self.odometry = Odometry(self.config).start()
+        self.motor.attach_odometry(self.odometry)
         self.aligner = Aligner(self.motor, self.config)
         self.detector = ObjectDetector(self.config)
+        # inference in the background on the newest frame; active only while aligning unless detect_always
+        self.detections = DetectionWorker(self.detector, self.frames,
+                                          always_on=self.config['vision'].get('detect_always', False)).start()
         self.grasper = Grasper(self.config)
         # pass grasper and detector into navigator so navigator can perform ordered grasps and alignment
-        self.navigator = Navigator(self.motor, self.aligner, self.config, self.grasper, self.detector)
+        self.navigator = Navigator(self.motor, self.aligner, self.config, self.grasper, self.detections, self.odometry)
+        # one navigation thread; a new path preempts the running one, go/stop from the web
+        self.executor = NavigationExecutor(self.navigator, self.motor, self.frames).start()
         
         # MQTT
-        self.mqtt = MQTTClient(self.config, self.handle_command)
+        self.mqtt = MQTTClient(self.config, self.handle_command, self.handle_control)
+        self.pose_publisher = PosePublisher(self.mqtt, self.odometry, self.config)
         
         self.is_running = True
         self.grasp_mode = False
@@ -65,9 +80,9 @@ class RobotController:
                 self.logger.info(f"Received order: {self.order}")
                 # expose runtime order to navigator for selective grasp triggering
                 try:
-                    self.navigator.full_cfg['runtime_order'] = self.order
-                except Exception:
-                    pass
+                    self.navigator.set_order(self.order)
+                except Exception as e:
+                    self.logger.error(f"Failed to index order: {e}")
             except Exception as e:
                 self.logger.error(f"Failed to parse order: {e}")
 
@@ -75,11 +90,22 @@ class RobotController:
             waypoints = payload.get('waypoints', [])
             path = [[wp.get('x'), wp.get('y')] for wp in waypoints if ('x' in wp and 'y' in wp)]
             if path:
-                threading.Thread(target=self.navigator.execute_path, args=(path, self.camera)).start()
+                self.executor.submit(path)
                 return
 
+    def handle_control(self, payload):
+        """go/stop from agv/web/command: {"action": "go", "source": "button", ...}"""
+        action = payload.get('action', '').lower()
+        if action == 'stop':
+            self.executor.halt()
+        elif action == 'go':
+            self.executor.go()
+        else:
+            self.logger.warning(f"Unknown command action: {action}")
+
     def run(self):
         self.mqtt.start()
+        self.pose_publisher.start()
         self.grasper.set_move_pose()
         self.logger.info("System Ready.")
 
@@ -92,9 +118,14 @@ class RobotController:
     # on_waypoint_grasp handled inside Navigator now
 
     def cleanup(self):
+        self.pose_publisher.stop()
         self.mqtt.stop()
+        self.executor.stop()
         self.grasper.close()
         self.motor.stop()
+        self.odometry.stop()
+        self.detections.stop()
+        self.frames.stop()
         self.camera.stop()
 
 if __name__ == "__main__":
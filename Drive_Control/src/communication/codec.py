@@ -0,0 +1,42 @@
+"""
+JSON codec for MQTT payloads: orjson or ujson when installed, stdlib json otherwise.
+dumps() returns compact UTF-8 bytes, loads() accepts bytes or str.
+"""
+import json
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+try:
+    import ujson as _ujson
+except ImportError:
+    _ujson = None
+
+if _orjson is not None:
+    BACKEND = "orjson"
+
+    def dumps(obj):
+        return _orjson.dumps(obj)
+
+    def loads(data):
+        return _orjson.loads(data)
+
+elif _ujson is not None:
+    BACKEND = "ujson"
+
+    def dumps(obj):
+        return _ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+
+    def loads(data):
+        return _ujson.loads(data)
+
+else:
+    BACKEND = "json"
+
+    def dumps(obj):
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(data):
+        return json.loads(data)
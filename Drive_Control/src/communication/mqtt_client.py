@@ -1,30 +1,54 @@
 import paho.mqtt.client as mqtt
-import json
 from ..utils.logger import get_logger
+from . import codec
+from .validation import PayloadValidator
 
 class MQTTClient:
-    def __init__(self, config, on_message_callback):
+    def __init__(self, config, on_message_callback, on_command_callback=None):
         self.logger = get_logger("MQTT")
         self.broker = config['mqtt']['broker']
         self.port = config['mqtt']['port']
         self.topic = config['mqtt']['topic_sub']
+        # go/stop from the web UI: {"action": "go" | "stop", ...}
+        self.command_topic = config['mqtt'].get('topic_command')
         self.client = mqtt.Client()
         self.client.on_connect = self.on_connect
         self.client.on_message = self.on_message
         self.callback = on_message_callback
+        self.command_callback = on_command_callback
+        self.validator = PayloadValidator(config['mqtt'].get('path_schema'), name="path")
+        self.logger.info(f"JSON backend: {codec.BACKEND}")
 
     def on_connect(self, client, userdata, flags, rc):
         self.logger.info(f"Connected with result code {rc}")
         client.subscribe(self.topic)
+        if self.command_topic and self.command_callback:
+            client.subscribe(self.command_topic, qos=1)
 
     def on_message(self, client, userdata, msg):
         try:
-            payload = json.loads(msg.payload.decode())
+            payload = codec.loads(msg.payload)
+            if msg.topic == self.command_topic:
+                if not isinstance(payload, dict) or not isinstance(payload.get('action'), str):
+                    self.logger.warning(f"Rejected command on {msg.topic}: {payload}")
+                    return
+                self.logger.info(f"Received command: {payload['action']}")
+                self.command_callback(payload)
+                return
+            error = self.validator.check(payload)
+            if error:
+                self.logger.warning(f"Rejected message on {msg.topic}: {error}")
+                return
             self.logger.info(f"Received message: {payload}")
             self.callback(payload)
         except Exception as e:
             self.logger.error(f"Failed to parse message: {e}")
 
+    def publish(self, topic, payload, qos=0):
+        """Queue a message (dict/list encoded with the codec); returns without waiting for the broker."""
+        data = payload if isinstance(payload, (bytes, bytearray, str)) else codec.dumps(payload)
+        return self.client.publish(topic, data, qos=qos)
+
     def start(self):
         self.client.connect(self.broker, self.port, 60)
         self.client.loop_start()
@@ -0,0 +1,83 @@
+import math
+import threading
+import time
+
+from ..utils.logger import get_logger
+
+
+class PosePublisher:
+    """
+    Samples `Odometry.pose()` at `state.sample_rate_hz` in its own thread and publishes
+    them on `state.pose_topic` at `state.publish_rate_hz`. Each message carries the
+    latest pose (the fields the web UI reads) and the samples taken since the previous
+    message:
+
+        {"agv_id": "agv1", "frame": "map", "status": "moving", "timestamp_ms": ...,
+         "pose": {"x": .., "y": .., "theta": ..}, "velocity": {"linear": .., "angular": ..},
+         "samples": [[t_ms, x, y, theta], ...]}
+
+    theta is in rad, map frame (0 = +x). Publishing is a non-blocking paho publish, so
+    the motion thread never waits on the network.
+    """
+
+    def __init__(self, mqtt_client, odometry, config):
+        self.logger = get_logger("PosePublisher")
+        scfg = config.get('state', {}) or {}
+        self.mqtt = mqtt_client
+        self.odometry = odometry
+        self.topic = scfg.get('pose_topic', 'agv/state/pose')
+        self.agv_id = scfg.get('agv_id', 'default')
+        self.frame = scfg.get('frame', 'map')
+        self.qos = scfg.get('qos', 0)
+        self.sample_period = 1.0 / scfg.get('sample_rate_hz', 20)
+        self.publish_period = 1.0 / scfg.get('publish_rate_hz', 5)
+        self.moving_epsilon = 1e-4
+
+        self._samples = []
+        self._stop = threading.Event()
+        self._thread = None
+        self.published = 0
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="pose_publisher")
+            self._thread.daemon = True
+            self._thread.start()
+            self.logger.info(f"Publishing pose on {self.topic} "
+                             f"({1.0 / self.publish_period:.0f} Hz, {1.0 / self.sample_period:.0f} Hz samples)")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self):
+        next_publish = time.monotonic() + self.publish_period
+        while not self._stop.wait(self.sample_period):
+            x, y, theta, v, w = self.odometry.pose()
+            t_ms = int(time.time() * 1000)
+            self._samples.append([t_ms, round(x, 4), round(y, 4), round(theta, 4)])
+            if time.monotonic() >= next_publish:
+                next_publish += self.publish_period
+                self._publish(t_ms, x, y, theta, v, w)
+
+    def _publish(self, t_ms, x, y, theta, v, w):
+        samples, self._samples = self._samples, []
+        moving = abs(v) > self.moving_epsilon or abs(w) > self.moving_epsilon
+        message = {
+            "agv_id": self.agv_id,
+            "frame": self.frame,
+            "status": "moving" if moving else "idle",
+            "timestamp_ms": t_ms,
+            "pose": {"x": round(x, 4), "y": round(y, 4), "theta": round(math.atan2(math.sin(theta), math.cos(theta)), 4)},
+            "velocity": {"linear": round(v, 4), "angular": round(w, 4)},
+            "samples": samples,
+        }
+        try:
+            self.mqtt.publish(self.topic, message, qos=self.qos)
+            self.published += 1
+        except Exception as e:
+            self.logger.warning(f"pose publish failed: {e}")
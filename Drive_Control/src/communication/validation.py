@@ -0,0 +1,54 @@
+import json
+import os
+
+from ..utils.logger import get_logger
+
+try:
+    import fastjsonschema
+except ImportError:  # optional on the robot
+    fastjsonschema = None
+
+# Drive_Control/ (relative schema paths in settings.yaml are resolved against it, not the cwd)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class PayloadValidator:
+    """
+    Checks incoming MQTT payloads against an interface schema (e.g. path.schema.json),
+    compiled once with fastjsonschema. Disabled (accept everything, with a warning) if
+    the schema file or fastjsonschema is missing. A relative `schema_path` is taken
+    from the Drive_Control directory.
+    """
+
+    def __init__(self, schema_path=None, name="payload"):
+        self.logger = get_logger("Validation")
+        self.name = name
+        self._validate = None
+
+        if not schema_path:
+            return
+        if not os.path.isabs(schema_path):
+            schema_path = os.path.normpath(os.path.join(PROJECT_ROOT, schema_path))
+        if fastjsonschema is None:
+            self.logger.warning(f"fastjsonschema not installed; {name} validation disabled")
+            return
+        if not os.path.exists(schema_path):
+            self.logger.warning(f"schema not found: {schema_path}; {name} validation disabled")
+            return
+        with open(schema_path, 'r') as f:
+            self._validate = fastjsonschema.compile(json.load(f))
+        self.logger.info(f"{name} validation enabled ({schema_path})")
+
+    @property
+    def enabled(self):
+        return self._validate is not None
+
+    def check(self, payload):
+        """Returns None if valid, otherwise an error message."""
+        if self._validate is None:
+            return None
+        try:
+            self._validate(payload)
+        except fastjsonschema.JsonSchemaValueException as e:
+            return f"{self.name} invalid: {e.message}"
+        return None
@@ -4,12 +4,19 @@ import threading
 import serial
 from SCSCtrl import TTLServo
 from ..utils.logger import get_logger
+from .servo_sequencer import ServoSequencer
 
 class Grasper:
     def __init__(self, config):
         self.logger = get_logger("Grasper")
         self.cfg = config['manipulation']
         self.grasp_table = self.cfg['grasp_table']
+        # servo commands return immediately; waits cover only the joints the next step needs
+        self.servos = ServoSequencer(TTLServo, config)
+        scfg = self.cfg.get('servo', {}) or {}
+        self.grip_hold = scfg.get('grip_hold', 1.0)
+        self.stow_while_driving = scfg.get('stow_while_driving', True)
+        self._stow_thread = None
         
         # Distance Sensor
         self.serial_port = self.cfg['serial_port']
@@ -39,48 +46,105 @@ class Grasper:
     def get_real_distance(self):
         return self.current_distance - self.cfg['sensor_offset_x']
 
-    def set_move_pose(self):
-        TTLServo.servoAngleCtrl(1, 5, 1, 150)
-        TTLServo.servoAngleCtrl(2, 0, 1, 150)  # Shoulder
-        TTLServo.servoAngleCtrl(3, 90, 1, 150)  # Elbow
-        TTLServo.servoAngleCtrl(4, 90, 1, 150) # Gripper (Open)
-        TTLServo.servoAngleCtrl(5, -30, 1, 150)
-        time.sleep(1.0)
+    def set_move_pose(self, wait=True):
+        self.servos.pose({
+            1: 5,
+            2: 0,    # Shoulder
+            3: 90,   # Elbow
+            4: 90,   # Gripper (Open)
+            5: -30,
+        })
+        if wait:
+            self.servos.wait()
     
-    def set_initial_pose(self):
-        TTLServo.servoAngleCtrl(1, 5, 1, 150)
-        TTLServo.servoAngleCtrl(2, 0, 1, 150)  # Shoulder
-        TTLServo.servoAngleCtrl(3, 90, 1, 150) # Elbow
-        TTLServo.servoAngleCtrl(4, 90, 1, 150) # Gripper (Open)
-        TTLServo.servoAngleCtrl(5, 30, 1, 150)
-        time.sleep(1.0)
-
-    def set_drop_pose(self):
-        TTLServo.servoAngleCtrl(1, 5, 1, 150)
-        TTLServo.servoAngleCtrl(2, 0, 1, 100)
-        TTLServo.servoAngleCtrl(2, 45, 1, 150)
-        TTLServo.servoAngleCtrl(3, -90, 1, 150)
-        time.sleep(5.0)
-        TTLServo.servoAngleCtrl(4, 90, 1, 150) # Open
-        time.sleep(1.0)
-
-    def execute_grasp(self, class_id, camera_instance=None, detector=None, aligner=None):
+    def set_initial_pose(self, wait=True):
+        self.servos.pose({
+            1: 5,
+            2: 0,    # Shoulder
+            3: 90,   # Elbow
+            4: 90,   # Gripper (Open)
+            5: 30,
+        })
+        if wait:
+            self.servos.wait()
+
+    def set_drop_pose(self, wait=True):
+        # finish the lift before swinging back
+        self.servos.wait(2, 3)
+        self.servos.move(1, 5)
+        self.servos.move(2, 45)
+        self.servos.move(3, -90)
+        # open only once the base swing is over, not mid-swing
+        self.servos.wait(1, 2, 3)
+        self.servos.move(4, 90) # Open
+        if wait:
+            self.servos.wait(4)
+
+    def stow(self, drop=True):
+        """
+        Drop the item (unless `drop` is False, e.g. an aborted grasp) and return to the move
+        pose in a background thread, so the chassis can drive to the next stop meanwhile
+        (`manipulation.servo.stow_while_driving`). Call `wait_idle()` before the arm is used again.
+        """
+        self.wait_idle()
+        self._stow_thread = threading.Thread(target=self._stow, args=(drop,), name="stow")
+        self._stow_thread.daemon = True
+        self._stow_thread.start()
+        if not self.stow_while_driving:
+            self.wait_idle()
+
+    def _stow(self, drop=True):
+        try:
+            if drop:
+                self.set_drop_pose()
+            self.set_move_pose()
+        except Exception as e:
+            self.logger.error(f"Stow failed: {e}")
+
+    def wait_idle(self, timeout=None):
+        """Wait for a background stow; True if the arm is idle."""
+        t = self._stow_thread
+        if t is not None:
+            t.join(timeout)
+            if t.is_alive():
+                return False
+            self._stow_thread = None
+        return True
+
+    def _aborted(self, cancel):
+        if cancel is not None and cancel.is_set():
+            self.logger.info("Grasp aborted before gripping")
+            return True
+        return False
+
+    def execute_grasp(self, class_id, camera_instance=None, detector=None, aligner=None, cancel=None):
+        """
+        Look at, reach for and grip the object, then start the lift. Returns True once it
+        is gripped. `cancel` (threading.Event) is checked between arm steps, which each end
+        in a pose the arm can retract from; after the grip the lift always runs.
+        """
         target = self.grasp_table.get(class_id)
         if not target:
             self.logger.warning(f"Class ID {class_id} not in grasp table.")
-            return
+            return False
         
         # 물체 바라보기
-        TTLServo.servoAngleCtrl(1, 90, 1, 150)
-        time.sleep(1.0)
+        self.servos.move(1, 90)
+        self.servos.wait(1)
+        if self._aborted(cancel):
+            return False
 
         # after servo moved, try visual fine alignment if aligner + detector + camera available
         if aligner is not None and detector is not None and camera_instance is not None:
             try:
-                aligned = aligner.align_to_object_with_servo(camera_instance, detector, class_id=class_id)
+                aligned = aligner.align_to_object_with_servo(camera_instance, detector, class_id=class_id,
+                                                             cancel=cancel)
                 self.logger.info(f"Visual fine-align result: {aligned}")
+                self.servos.forget(1)
             except Exception as e:
                 self.logger.warning(f"align_to_object_with_servo failed: {e}")
+        if self._aborted(cancel):
+            return False
 
         self.logger.info(f"Grasping {target['name']}...")
         
@@ -111,22 +175,26 @@ class Grasper:
 
             # Move Arm
 
-            TTLServo.servoAngleCtrl(2, int(beta), 1, 100)
-            TTLServo.servoAngleCtrl(3, int(alpha), 1, 100)
-            time.sleep(5)
+            self.servos.move(2, int(beta), 100)
+            self.servos.move(3, int(alpha), 100)
+            self.servos.wait(2, 3)
+            if self._aborted(cancel):
+                return False
             
-            # Grip
-            TTLServo.servoAngleCtrl(4, grip_angle, 1, 150)
-            time.sleep(5)
+            # Grip (hold a little longer: the gripper stalls on the object)
+            self.servos.move(4, grip_angle)
+            self.servos.wait(4, extra=self.grip_hold)
             
-            # Lift
-            TTLServo.servoAngleCtrl(2, 0, 1, 80)
-            TTLServo.servoAngleCtrl(3, -50, 1, 80)
-            time.sleep(1.0)
+            # Lift; set_drop_pose()/stow() wait for it to finish
+            self.servos.move(2, 0, 80)
+            self.servos.move(3, -50, 80)
+            return True
             
         except Exception as e:
             self.logger.error(f"IK Calculation Error: {e}")
+            return False
 
     def close(self):
+        self.wait_idle(timeout=10.0)
         self.stop_sensor = True
         if hasattr(self, 'ser'): self.ser.close()
\ No newline at end of file
@@ -0,0 +1,92 @@
+import threading
+import time
+
+from ..utils.logger import get_logger
+
+
+class ServoSequencer:
+    """
+    Non-blocking servo commands with per-joint completion estimates.
+
+    `move()` sends `servoAngleCtrl` right away and records when that joint should
+    arrive: |angle change| / (speed * `deg_per_s_per_speed`) + `settle`. Moves on
+    different joints therefore overlap, and `wait(*joints)` only blocks until the
+    joints the next step depends on are done, instead of a fixed sleep after every pose.
+
+    If `read_angle(joint)` is given (servo position feedback), `wait` returns as soon as
+    the joint is within `tolerance_deg` of its target, with the estimate plus
+    `feedback_margin` as the upper bound.
+    """
+
+    def __init__(self, servo, config, read_angle=None):
+        self.logger = get_logger("ServoSequencer")
+        scfg = config['manipulation'].get('servo', {}) or {}
+        self.servo = servo
+        self.read_angle = read_angle
+        self.deg_per_s_per_speed = scfg.get('deg_per_s_per_speed', 0.6)
+        self.settle = scfg.get('settle', 0.2)
+        self.unknown_travel = scfg.get('unknown_travel_deg', 180.0)
+        self.tolerance_deg = scfg.get('tolerance_deg', 3.0)
+        self.feedback_margin = scfg.get('feedback_margin', 1.0)
+        self.poll_interval = 0.02
+
+        self._lock = threading.Lock()
+        self._target = {}   # joint -> last commanded angle
+        self._done_at = {}  # joint -> estimated arrival (time.monotonic)
+
+    def estimate(self, joint, angle, speed):
+        """Seconds for `joint` to reach `angle` at `speed` from its last commanded angle."""
+        prev = self._target.get(joint)
+        travel = abs(angle - prev) if prev is not None else self.unknown_travel
+        return travel / max(1e-3, speed * self.deg_per_s_per_speed) + self.settle
+
+    def move(self, joint, angle, speed=150):
+        """Command `joint` without waiting; returns the estimated arrival (time.monotonic)."""
+        angle = int(angle)
+        with self._lock:
+            duration = self.estimate(joint, angle, speed)
+            self.servo.servoAngleCtrl(joint, angle, 1, speed)
+            self._target[joint] = angle
+            self._done_at[joint] = time.monotonic() + duration
+            return self._done_at[joint]
+
+    def forget(self, joint):
+        """`joint` was moved outside the sequencer (e.g. servo alignment): assume full travel next time."""
+        with self._lock:
+            self._target.pop(joint, None)
+            self._done_at.pop(joint, None)
+
+    def pose(self, angles, speed=150):
+        """Command several joints at once ({joint: angle}); returns when the last one should arrive."""
+        return max(self.move(joint, angle, speed) for joint, angle in angles.items())
+
+    def remaining(self, *joints):
+        """Seconds until the given joints (all if none) should be done."""
+        with self._lock:
+            keys = joints or tuple(self._done_at)
+            done_at = max((self._done_at.get(j, 0.0) for j in keys), default=0.0)
+        return max(0.0, done_at - time.monotonic())
+
+    def _arrived(self, joints):
+        for joint in joints:
+            try:
+                angle = self.read_angle(joint)
+            except Exception:
+                return False
+            if angle is None or abs(angle - self._target[joint]) > self.tolerance_deg:
+                return False
+        return True
+
+    def wait(self, *joints, extra=0.0):
+        """Block until the given joints (all if none) are done, plus `extra` seconds."""
+        delay = self.remaining(*joints)
+        if self.read_angle is None:
+            time.sleep(delay + extra)
+            return
+        with self._lock:
+            joints = tuple(j for j in (joints or tuple(self._target)) if j in self._target)
+        deadline = time.monotonic() + delay + self.feedback_margin
+        while time.monotonic() < deadline and not self._arrived(joints):
+            time.sleep(self.poll_interval)
+        if extra > 0:
+            time.sleep(extra)
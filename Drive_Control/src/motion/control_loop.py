@@ -0,0 +1,147 @@
+import math
+import time
+
+
+class PID:
+    """
+    PID controller on an error signal.
+
+    - Output is clamped to [-max_output, max_output]; while clamped, the integral only
+      moves in the direction that leaves saturation (conditional integration) and is also
+      bounded by `i_limit` (anti-windup).
+    - The derivative is low-pass filtered with time constant `d_tau` seconds, so camera
+      noise does not turn into jitter.
+    - `min_output` lifts small non-zero outputs to the smallest command that still moves
+      the hardware (motor/servo static friction); errors inside `deadband` give 0.
+    """
+
+    def __init__(self, kp, ki=0.0, kd=0.0, max_output=math.inf, min_output=0.0,
+                 i_limit=None, d_tau=0.05, deadband=0.0):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.max_output = max_output
+        self.min_output = min_output
+        self.i_limit = i_limit
+        self.d_tau = d_tau
+        self.deadband = deadband
+        self.reset()
+
+    @classmethod
+    def from_config(cls, cfg, **defaults):
+        """Build from a settings.yaml mapping; keys missing there fall back to `defaults`."""
+        params = dict(defaults)
+        params.update(cfg or {})
+        return cls(**params)
+
+    def reset(self):
+        self.integral = 0.0
+        self.derivative = 0.0
+        self._prev_error = None
+
+    def update(self, error, dt):
+        if dt <= 0:
+            dt = 1e-3
+        if self._prev_error is None:
+            raw_d = 0.0
+        else:
+            raw_d = (error - self._prev_error) / dt
+        self._prev_error = error
+        alpha = self.d_tau / (self.d_tau + dt) if self.d_tau > 0 else 0.0
+        self.derivative = alpha * self.derivative + (1.0 - alpha) * raw_d
+
+        if abs(error) <= self.deadband:
+            return 0.0
+
+        integral = self.integral + error * dt
+        if self.i_limit is not None:
+            integral = max(-self.i_limit, min(self.i_limit, integral))
+        unclamped = self.kp * error + self.ki * integral + self.kd * self.derivative
+        out = max(-self.max_output, min(self.max_output, unclamped))
+        if out != unclamped and (unclamped > out) == (error > 0):
+            # saturated and the error would wind the integral further: hold it
+            out = max(-self.max_output, min(self.max_output,
+                                            self.kp * error + self.ki * self.integral + self.kd * self.derivative))
+        else:
+            self.integral = integral
+
+        if 0 < abs(out) < self.min_output:
+            out = math.copysign(self.min_output, out)
+        return out
+
+
+class RateLoop:
+    """
+    Fixed-rate scheduling for control loops:
+
+        loop = RateLoop(30)
+        while loop.elapsed() < timeout:
+            ...                      # work
+            loop.sleep()             # until the next deadline
+
+    Deadlines advance by a fixed period from the start, so jitter does not accumulate.
+    An iteration that overruns its deadline is counted and the schedule restarts from
+    now (no burst of catch-up iterations). `dt` is the measured period of the last
+    iteration, for controllers.
+
+    `cancel` (threading.Event, optional) is a cooperative cancellation point: `sleep()`
+    returns as soon as it is set and `cancelled` turns True, so loops written as
+    `while ... and not loop.cancelled` stop within one period.
+    """
+
+    def __init__(self, rate_hz, cancel=None):
+        self.period = 1.0 / float(rate_hz)
+        self.cancel = cancel
+        self.start = time.monotonic()
+        self._deadline = self.start + self.period
+        self._last = self.start
+        self.dt = self.period
+        self.iterations = 0
+        self.overruns = 0
+        self.max_period = 0.0
+        self.work_time = 0.0
+
+    @property
+    def cancelled(self):
+        return self.cancel is not None and self.cancel.is_set()
+
+    def elapsed(self):
+        return time.monotonic() - self.start
+
+    def remaining(self):
+        """Time left until the current iteration's deadline (negative if overrun)."""
+        return self._deadline - time.monotonic()
+
+    def sleep(self):
+        now = time.monotonic()
+        self.work_time += now - self._last
+        delay = self._deadline - now
+        if delay > 0:
+            if self.cancel is not None:
+                self.cancel.wait(delay)
+            else:
+                time.sleep(delay)
+            self._deadline += self.period
+        else:
+            self.overruns += 1
+            self._deadline = now + self.period
+        end = time.monotonic()
+        self.dt = end - self._last
+        self.max_period = max(self.max_period, self.dt)
+        self._last = end
+        self.iterations += 1
+
+    def achieved_hz(self):
+        t = self._last - self.start
+        return self.iterations / t if t > 0 else 0.0
+
+    def stats(self):
+        n = max(1, self.iterations)
+        return {
+            'iterations': self.iterations,
+            'target_hz': round(1.0 / self.period, 1),
+            'achieved_hz': round(self.achieved_hz(), 1),
+            'overruns': self.overruns,
+            'max_period_ms': round(self.max_period * 1000.0, 1),
+            'mean_work_ms': round(self.work_time / n * 1000.0, 1),
+        }
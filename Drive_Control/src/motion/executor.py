@@ -0,0 +1,153 @@
+import math
+import threading
+
+from ..utils.logger import get_logger
+
+
+def resume_path(path, pos):
+    """
+    `path` re-anchored at `pos`: start from `pos` and continue at the end of the path
+    segment closest to it, so a replacement or resumed path does not drive back to
+    waypoints already passed. Ties go to the earlier segment, so a waypoint the robot
+    stopped on (e.g. a pending grasp) is kept.
+    """
+    if len(path) < 2:
+        return [list(pos)] + [list(p) for p in path]
+    x, y = float(pos[0]), float(pos[1])
+    best, best_d = 0, float('inf')
+    for i in range(len(path) - 1):
+        (ax, ay), (bx, by) = path[i], path[i + 1]
+        dx, dy = float(bx) - float(ax), float(by) - float(ay)
+        L2 = dx * dx + dy * dy
+        t = max(0.0, min(1.0, ((x - ax) * dx + (y - ay) * dy) / L2)) if L2 > 0 else 0.0
+        d = math.hypot(x - (ax + t * dx), y - (ay + t * dy))
+        if d < best_d:
+            best, best_d = i, d
+    return [[x, y]] + [list(p) for p in path[best + 1:]]
+
+
+class NavigationExecutor:
+    """
+    Single navigation thread fed by a one-slot command queue.
+
+    - `submit(path)` replaces whatever is pending; if a path is running, its cancel
+      event is set and the worker restarts on the new path from the current pose
+      (`resume_path`). Control loops check the event every period, so a replan takes
+      effect within one control period.
+    - `halt()` cancels the running path and holds new ones; `go()` resumes the
+      interrupted (or latest held) path from the current pose.
+
+    During a grasp the event is checked between arm steps, so cancellation can take
+    one servo move (a few seconds) to land; a grasp aborted before the grip retracts
+    the arm and keeps the item in the order, one past the grip finishes the lift.
+    """
+
+    def __init__(self, navigator, motor_control, camera_instance=None):
+        self.logger = get_logger("Executor")
+        self.navigator = navigator
+        self.motor = motor_control
+        self.camera = camera_instance
+
+        self._cond = threading.Condition()
+        self._pending = None      # (path, resume)
+        self._interrupted = None  # path cut short by halt(), resumed by go()
+        self._cancel = None       # cancel event of the running path
+        self._paused = False
+        self._closed = False
+        self._thread = None
+        self.runs = 0
+        self.preemptions = 0
+
+    # ---------- commands ----------
+    def submit(self, path):
+        """Run `path` next, preempting the current one."""
+        with self._cond:
+            resume = self._cancel is not None or self._interrupted is not None
+            if self._cancel is not None:
+                self._cancel.set()
+                self.preemptions += 1
+            self._pending = (path, resume)
+            self._interrupted = None
+            if self._paused:
+                self.logger.info(f"Path of {len(path)} waypoints held until 'go'")
+            self._cond.notify_all()
+
+    def halt(self):
+        with self._cond:
+            self._paused = True
+            if self._cancel is not None:
+                self._cancel.set()
+            self._cond.notify_all()
+        self.motor.stop()
+        self.logger.info("Halted")
+
+    def go(self):
+        with self._cond:
+            self._paused = False
+            if self._pending is None and self._interrupted is not None:
+                self._pending = (self._interrupted, True)
+                self._interrupted = None
+            if self._pending is None and self._cancel is None:
+                self.logger.info("'go' with no path to run")
+            self._cond.notify_all()
+
+    @property
+    def busy(self):
+        with self._cond:
+            return self._cancel is not None
+
+    # ---------- worker ----------
+    def _current_position(self):
+        if self.navigator.odometry is not None:
+            return self.navigator.odometry.pose_deg()[:2]
+        return self.navigator.current_pos
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and (self._pending is None or self._paused):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                path, resume = self._pending
+                self._pending = None
+                cancel = threading.Event()
+                self._cancel = cancel
+
+            if resume:
+                path = resume_path(path, self._current_position())
+                self.logger.info(f"Resuming from {path[0]} ({len(path)} waypoints)")
+            completed = False
+            try:
+                completed = self.navigator.execute_path(path, self.camera, cancel=cancel)
+            except Exception as e:
+                self.logger.error(f"Path execution failed: {e}")
+            finally:
+                self.motor.stop()
+
+            with self._cond:
+                self._cancel = None
+                self.runs += 1
+                if cancel.is_set() and self._pending is None:
+                    # halted (not replaced): keep the path for go()
+                    self._interrupted = path
+                self._cond.notify_all()
+            self.logger.info(f"Path {'completed' if completed else 'stopped'}")
+
+    def start(self):
+        if self._thread is None:
+            self._closed = False
+            self._thread = threading.Thread(target=self._run, name="navigation")
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._closed = True
+            if self._cancel is not None:
+                self._cancel.set()
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
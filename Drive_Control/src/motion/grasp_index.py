@@ -0,0 +1,72 @@
+import math
+
+
+class GraspIndex:
+    """
+    Ordered grasp locations compiled once per order.
+
+    Locations from `manipulation.grasp_table` whose name is in the order go into a grid
+    hash with cell size = `tolerance` (m), so a lookup checks the 3x3 neighbouring cells
+    and matches the nearest location within `tolerance` instead of comparing floats
+    exactly. `pending` is an ordered set of names still to pick; `done(name)` removes one.
+    """
+
+    def __init__(self, grasp_table, order, tolerance=0.02):
+        self.tolerance = float(tolerance)
+        if not self.tolerance > 0:
+            raise ValueError(f"manipulation.grasp_tolerance must be > 0 (got {tolerance!r})")
+        self.pending = dict.fromkeys(str(name) for name in (order or []))
+        self._cells = {}
+        for cid, info in (grasp_table or {}).items():
+            try:
+                name = info.get('name')
+                loc = info.get('location')
+                if name not in self.pending or loc is None:
+                    continue
+                x, y = float(loc[0]), float(loc[1])
+            except (AttributeError, TypeError, ValueError, IndexError):
+                continue
+            self._cells.setdefault(self._cell(x, y), []).append((x, y, cid, name))
+
+    @classmethod
+    def from_config(cls, config, order):
+        mcfg = config.get('manipulation', {}) or {}
+        return cls(mcfg.get('grasp_table', {}), order, mcfg.get('grasp_tolerance', 0.02))
+
+    def _cell(self, x, y):
+        return int(math.floor(x / self.tolerance)), int(math.floor(y / self.tolerance))
+
+    def __contains__(self, name):
+        return name in self.pending
+
+    def __len__(self):
+        return len(self.pending)
+
+    def done(self, name):
+        self.pending.pop(name, None)
+
+    def lookup(self, x, y):
+        """(class_id, name) of the nearest pending location within tolerance of (x, y), else None."""
+        cx, cy = self._cell(float(x), float(y))
+        best, best_d = None, self.tolerance
+        for ix in (cx - 1, cx, cx + 1):
+            for iy in (cy - 1, cy, cy + 1):
+                for lx, ly, cid, name in self._cells.get((ix, iy), ()):
+                    d = math.hypot(lx - x, ly - y)
+                    if d <= best_d and name in self.pending:
+                        best, best_d = (cid, name), d
+        return best
+
+    def annotate(self, path):
+        """
+        {waypoint index: (class_id, name)} for the waypoints of `path` that trigger a grasp.
+        The start point is skipped and each item triggers once, at its first matching waypoint.
+        """
+        triggers = {}
+        seen = set()
+        for i in range(1, len(path)):
+            hit = self.lookup(path[i][0], path[i][1])
+            if hit and hit[1] not in seen:
+                seen.add(hit[1])
+                triggers[i] = hit
+        return triggers
@@ -6,23 +6,45 @@ class MotorControl:
         self.robot = Robot()
         self.speed_move = config['motor']['speed_move']
         self.speed_turn = config['motor']['speed_turn']
+        self.odometry = None
+
+    def attach_odometry(self, odometry):
+        """Report every wheel command to `odometry.set_command(left, right)`."""
+        self.odometry = odometry
+
+    def _report(self, left_speed, right_speed):
+        if self.odometry is not None:
+            self.odometry.set_command(left_speed, right_speed)
 
     def stop(self):
         self.robot.stop()
+        self._report(0.0, 0.0)
 
     def set_motors(self, left_speed, right_speed):
         self.robot.set_motors(left_speed, right_speed)
+        self._report(left_speed, right_speed)
 
-    def forward(self, duration=None):
+    @staticmethod
+    def _wait(duration, cancel=None):
+        # timed moves return early when `cancel` (threading.Event) is set
+        if cancel is not None:
+            cancel.wait(duration)
+        else:
+            time.sleep(duration)
+
+    def forward(self, duration=None, cancel=None):
         self.robot.forward(self.speed_move)
+        self._report(self.speed_move, self.speed_move)
         if duration:
-            time.sleep(duration)
+            self._wait(duration, cancel)
             self.stop()
 
-    def turn_left(self, duration):
+    def turn_left(self, duration, cancel=None):
         self.robot.left(self.speed_turn)
-        time.sleep(duration)
+        self._report(-self.speed_turn, self.speed_turn)
+        self._wait(duration, cancel)
 
-    def turn_right(self, duration):
+    def turn_right(self, duration, cancel=None):
         self.robot.right(self.speed_turn)
-        time.sleep(duration)
\ No newline at end of file
+        self._report(self.speed_turn, -self.speed_turn)
+        self._wait(duration, cancel)
\ No newline at end of file
@@ -1,10 +1,11 @@
 import math
-import time
 import numpy as np
 from ..utils.logger import get_logger
+from .grasp_index import GraspIndex
+from .path_follower import PathFollower
 
 class Navigator:
-    def __init__(self, motor_control, aligner, config, grasper=None, detector=None):
+    def __init__(self, motor_control, aligner, config, grasper=None, detector=None, odometry=None):
         self.motor = motor_control
         self.aligner = aligner
         self.grasper = grasper
@@ -15,14 +16,55 @@ class Navigator:
         self.cfg = config['motor']
         self.current_pos = [0.0, 0.0]
         self.current_angle = 90.0
+        # control.mode: "pursuit" (continuous path following) or "stop_turn_go" (turn, drive, align per waypoint)
+        self.mode = config.get('control', {}).get('mode', 'pursuit')
+        self.odometry = odometry
+        self.marker_weight = (config.get('odometry', {}) or {}).get('marker_weight', 0.8)
+        self.follower = PathFollower(motor_control, config, odometry)
+        # ordered grasp locations, rebuilt by set_order()
+        self.grasp_index = GraspIndex.from_config(config, config.get('runtime_order'))
 
-    def move_straight(self, distance_m):
+    def set_order(self, order):
+        """New pick order: compile its grasp locations once (matched within manipulation.grasp_tolerance)."""
+        self.full_cfg['runtime_order'] = list(order)
+        self.grasp_index = GraspIndex.from_config(self.full_cfg, order)
+        self.logger.info(f"Grasp index: {len(self.grasp_index)} ordered items")
+
+    def _sync_odometry(self):
+        # current_pos/current_angle are snapped to reached waypoints; feed that fix back as a correction
+        if self.odometry is not None:
+            self.odometry.correct(self.current_pos[0], self.current_pos[1], math.radians(self.current_angle))
+
+    def _marker_fix(self, heading_deg):
+        """
+        Red-marker alignment succeeded at current_pos: markers sit straight ahead along the
+        approach direction, so the robot now faces `heading_deg`. Blend that into odometry.
+        """
+        if self.odometry is None:
+            self.current_angle = heading_deg
+            return
+        self.odometry.correct(self.current_pos[0], self.current_pos[1])
+        self.odometry.correct(theta=math.radians(heading_deg), weight=self.marker_weight)
+        self.current_angle = self.odometry.pose_deg()[2]
+
+    def _cancelled(self, cancel):
+        """True if `cancel` is set; the move was cut short, so the pose is taken from odometry."""
+        if cancel is None or not cancel.is_set():
+            return False
+        if self.odometry is not None:
+            x, y, heading = self.odometry.pose_deg()
+            self.current_pos = [x, y]
+            self.current_angle = heading
+        self.logger.info(f"Path cancelled at {self.current_pos}")
+        return True
+
+    def move_straight(self, distance_m, cancel=None):
         if distance_m <= 0: return
         duration = distance_m * self.cfg['time_per_1m']
         self.logger.info(f"Forward {distance_m:.2f}m ({duration:.2f}s)")
-        self.motor.forward(duration)
+        self.motor.forward(duration, cancel)
 
-    def turn_to_angle(self, target_angle_deg):
+    def turn_to_angle(self, target_angle_deg, cancel=None):
         diff = target_angle_deg - self.current_angle
         while diff > 180: diff -= 360
         while diff <= -180: diff += 360
@@ -32,16 +74,19 @@ class Navigator:
         # Calculate duration
         if diff > 0: # Left
             duration = diff * (self.cfg['time_per_90_deg_left'] / 90.0)
-            self.motor.turn_left(duration)
+            self.motor.turn_left(duration, cancel)
             lat_offset = -self.cfg['offset_lateral_90']
             lon_offset = self.cfg['offset_longitudinal_90']
         else: # Right
             duration = abs(diff) * (self.cfg['time_per_90_deg_right'] / 90.0)
-            self.motor.turn_right(duration)
+            self.motor.turn_right(duration, cancel)
             lat_offset = self.cfg['offset_lateral_90']
             lon_offset = self.cfg['offset_longitudinal_90']
             
         self.motor.stop()
+        if cancel is not None and cancel.is_set():
+            # cut short: no offset correction, the caller takes the pose from odometry
+            return
 
         # Correct Position (Offset Logic)
         ratio = abs(diff) / 90.0
@@ -53,16 +98,134 @@ class Navigator:
         self.current_pos[0] += delta_pos[0]
         self.current_pos[1] += delta_pos[1]
         self.current_angle = target_angle_deg
+        self._sync_odometry()
         
         self.logger.info(f"Turned to {target_angle_deg} deg. Pos corrected by {delta_pos}")
 
-    def execute_path(self, path_data, camera_instance=None, on_grasp=None):
-        if not path_data: return
-        
+    def _grasp_triggers(self, path_data):
+        """{waypoint index: (class_id, name)} for the ordered grasp locations on the path."""
+        triggers = self.grasp_index.annotate(path_data)
+        for i, (cid, name) in sorted(triggers.items()):
+            self.logger.info(f"Grasp {name} (class {cid}) at waypoint {i} {path_data[i]}")
+        return triggers
+
+    def _run_grasp(self, cid, name, camera_instance=None, on_grasp=None, cancel=None, approach_deg=None):
+        # grasp 실행
+        if not self.grasper:
+            if on_grasp:
+                try:
+                    on_grasp(int(cid))
+                except Exception as e:
+                    self.logger.error(f"on_grasp callback error: {e}")
+            return
+        try:
+            self.logger.info(f"Arrived at ordered grasp location {name} (class {cid}). Running grasp.")
+            # stop motors
+            try:
+                self.motor.stop()
+            except Exception:
+                pass
+            # align visually if camera provided
+            if camera_instance:
+                try:
+                    if self.aligner.align_to_red_marker(camera_instance, cancel) and approach_deg is not None:
+                        self._marker_fix(approach_deg)
+                except Exception as e:
+                    self.logger.warning(f"Aligner failed: {e}")
+            if cancel is not None and cancel.is_set():
+                return
+
+            # cancel is checked between arm steps (a single servo move is not cut short);
+            # an aborted grasp retracts to the move pose and the item stays in the order
+            try:
+                while not self.grasper.wait_idle(timeout=0.05):
+                    if cancel is not None and cancel.is_set():
+                        return
+                if cancel is not None and cancel.is_set():
+                    return
+                self.grasper.set_initial_pose()
+                if cancel is not None and cancel.is_set():
+                    self.grasper.stow(drop=False)
+                    return
+                # pass camera/detector/aligner so Grasper can perform visual fine-alignment
+                gripped = self.grasper.execute_grasp(int(cid), camera_instance=camera_instance, detector=self.detector,
+                                                     aligner=self.aligner, cancel=cancel)
+                if not gripped and cancel is not None and cancel.is_set():
+                    self.grasper.stow(drop=False)
+                    return
+                # drop + move pose continue in the background while driving on
+                self.grasper.stow()
+                # update runtime_order in config
+                self.grasp_index.done(name)
+                try:
+                    ro = self.full_cfg.get('runtime_order', [])
+                    if name and name in ro:
+                        ro.remove(name)
+                        self.full_cfg['runtime_order'] = ro
+                except Exception:
+                    pass
+            except Exception as e:
+                self.logger.error(f"Grasp failed in navigator: {e}")
+        except Exception as e:
+            self.logger.error(f"Navigator grasp error: {e}")
+
+    def execute_path(self, path_data, camera_instance=None, on_grasp=None, cancel=None):
+        """
+        Drive `path_data`; returns True when the end was reached. Setting `cancel`
+        (threading.Event, see NavigationExecutor) stops the motion and alignment loops
+        within one control period, leaving current_pos at the pose where it stopped.
+        """
+        if not path_data: return False
+        if self.mode == 'stop_turn_go':
+            return self.execute_path_stepwise(path_data, camera_instance, on_grasp, cancel)
+        return self.execute_path_pursuit(path_data, camera_instance, on_grasp, cancel)
+
+    def execute_path_pursuit(self, path_data, camera_instance=None, on_grasp=None, cancel=None):
+        """
+        Follow the path continuously with PathFollower; stop only at ordered grasp
+        locations (and the end), where the marker alignment and grasp run.
+        """
+        self.current_pos = list(path_data[0])
+        self._sync_odometry()
+        self.logger.info(f"Starting Path from {self.current_pos} (pursuit, {len(path_data)} waypoints)")
+
+        stops = sorted(self._grasp_triggers(path_data).items())
+        if not stops or stops[-1][0] != len(path_data) - 1:
+            stops.append((len(path_data) - 1, None))
+
+        start = 0
+        for stop, target in stops:
+            segment = path_data[start:stop + 1]
+            pose = (self.current_pos[0], self.current_pos[1], self.current_angle)
+            reached, (x, y, heading) = self.follower.follow(segment, pose, cancel=cancel)
+            # dead-reckoned heading is kept; position snaps to the waypoint like the stepwise mode
+            self.current_pos = list(path_data[stop]) if reached else [x, y]
+            self.current_angle = heading
+            self._sync_odometry()
+            if self._cancelled(cancel):
+                return False
+            if not reached:
+                self.logger.warning(f"Path following stopped before waypoint {stop}")
+                return False
+            # skip if the item was already picked at an earlier stop
+            if target and target[1] in self.grasp_index:
+                if stop > 0:
+                    prev = path_data[stop - 1]
+                    approach = math.degrees(math.atan2(path_data[stop][1] - prev[1], path_data[stop][0] - prev[0]))
+                else:
+                    # no segment leading here: keep the current heading
+                    approach = self.current_angle
+                self._run_grasp(target[0], target[1], camera_instance, on_grasp, cancel, approach)
+                if self._cancelled(cancel):
+                    return False
+            start = stop
+        return True
+
+    def execute_path_stepwise(self, path_data, camera_instance=None, on_grasp=None, cancel=None):
         self.current_pos = path_data[0]
+        self._sync_odometry()
         self.logger.info(f"Starting Path from {self.current_pos}")
-        # grasp table and tolerance
-        grasp_table = self.full_cfg.get('manipulation', {}).get('grasp_table', {})
+        triggers = self._grasp_triggers(path_data)
 
         for i in range(1, len(path_data)):
             target_pos = path_data[i]
@@ -77,74 +240,31 @@ class Navigator:
             # 1. Turn
             target_angle_rad = math.atan2(dy, dx)
             target_angle_deg = math.degrees(target_angle_rad)
-            self.turn_to_angle(target_angle_deg)
+            self.turn_to_angle(target_angle_deg, cancel)
+            if self._cancelled(cancel):
+                return False
 
             # 2. Move
             new_dx = next_x - self.current_pos[0]
             new_dy = next_y - self.current_pos[1]
             dist = math.hypot(new_dx, new_dy)
-            self.move_straight(dist)
+            self.move_straight(dist, cancel)
+            if self._cancelled(cancel):
+                return False
 
             if camera_instance:
-                self.aligner.align_to_red_marker(camera_instance)
+                self.aligner.align_to_red_marker(camera_instance, cancel)
+                if self._cancelled(cancel):
+                    return False
             
+            # the marker alignment is what makes this full snap of pose and heading valid
             self.current_pos = target_pos
+            self._sync_odometry()
 
             # 3. Check for grasping opportunity
-            do_grasp = False
-            wx, wy = float(self.current_pos[0]), float(self.current_pos[1])
-            runtime_order = self.full_cfg.get('runtime_order')
-
-            # runtime_order 중에 location에 도달했는지 확인
-            for cid, info in grasp_table.items():
-                try:
-                    name = info.get('name')
-                    loc = info.get('location')
-                    if name in runtime_order:
-                        lx, ly = float(loc[0]), float(loc[1])
-                        if lx == wx and ly == wy:
-                            do_grasp = True
-                            self.logger.info(f"At grasp location {info.get('name')} (class {cid}).")
-                            break
-                except Exception:
-                    continue
-
-            # grasp 실행
-            if do_grasp and self.grasper:
-                try:
-                    self.logger.info(f"Arrived at ordered grasp location {name} (class {cid}). Running grasp.")
-                    # stop motors
-                    try:
-                        self.motor.stop()
-                    except Exception:
-                        pass
-                    # align visually if camera provided
-                    if camera_instance:
-                        try:
-                            self.aligner.align_to_red_marker(camera_instance)
-                        except Exception as e:
-                            self.logger.warning(f"Aligner failed: {e}")
-
-                    try:
-                        # pass camera/detector/aligner so Grasper can perform visual fine-alignment
-                        self.grasper.set_initial_pose()
-                        self.grasper.execute_grasp(int(cid), camera_instance=camera_instance, detector=self.detector, aligner=self.aligner)
-                        self.grasper.set_drop_pose()
-                        self.grasper.set_move_pose()
-                        # update runtime_order in config
-                        try:
-                            ro = self.full_cfg.get('runtime_order', [])
-                            if name and name in ro:
-                                ro.remove(name)
-                                self.full_cfg['runtime_order'] = ro
-                        except Exception:
-                            pass
-                    except Exception as e:
-                        self.logger.error(f"Grasp failed in navigator: {e}")
-                except Exception as e:
-                    self.logger.error(f"Navigator grasp error: {e}")
-            elif on_grasp:
-                try:
-                    on_grasp(int(cid))
-                except Exception as e:
-                    self.logger.error(f"on_grasp callback error: {e}")
\ No newline at end of file
+            target = triggers.get(i)
+            if target and target[1] in self.grasp_index:
+                self._run_grasp(target[0], target[1], camera_instance, on_grasp, cancel, target_angle_deg)
+                if self._cancelled(cancel):
+                    return False
+        return True
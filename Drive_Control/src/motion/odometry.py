@@ -0,0 +1,137 @@
+import math
+import threading
+import time
+
+from ..utils.logger import get_logger
+
+
+def wrap_angle(angle):
+    while angle > math.pi: angle -= 2 * math.pi
+    while angle <= -math.pi: angle += 2 * math.pi
+    return angle
+
+
+class WheelModel:
+    """
+    Differential-drive conversion between wheel commands (set_motors values) and body
+    velocity (m/s, rad/s). The model is built from the open-loop calibration in `motor`:
+    time_per_1m at speed_move, and time_per_90_deg_left/right at speed_turn.
+    """
+
+    def __init__(self, config):
+        mcfg = config['motor']
+        # m/s per unit wheel command, rad/s per unit differential command
+        self.v_per_cmd = 1.0 / (mcfg['time_per_1m'] * mcfg['speed_move'])
+        turn_left = (math.pi / 2) / (mcfg['time_per_90_deg_left'] * mcfg['speed_turn'])
+        turn_right = (math.pi / 2) / (mcfg['time_per_90_deg_right'] * mcfg['speed_turn'])
+        self.w_per_cmd = (turn_left + turn_right) / 2.0
+
+    def to_wheels(self, v, w):
+        return v / self.v_per_cmd - w / self.w_per_cmd, v / self.v_per_cmd + w / self.w_per_cmd
+
+    def to_velocity(self, left, right):
+        v = (left + right) / 2.0 * self.v_per_cmd
+        w = (right - left) / 2.0 * self.w_per_cmd
+        return v, w
+
+
+class Odometry:
+    """
+    Dead-reckoned pose (x, y in m, theta in rad, map frame, theta 0 = +x).
+
+    MotorControl reports every wheel command through `set_command`, and a background
+    thread integrates the resulting body velocity at `odometry.rate_hz`.
+    `correct()` blends in absolute fixes from vision/marker alignment or a reached
+    waypoint. Readers (path follower, pose publisher) call `pose()`, which never waits
+    on the motion thread.
+    """
+
+    def __init__(self, config):
+        self.logger = get_logger("Odometry")
+        ocfg = config.get('odometry', {}) or {}
+        self.rate_hz = ocfg.get('rate_hz', 50)
+        self.wheels = WheelModel(config)
+
+        self._lock = threading.Lock()
+        self._x = 0.0
+        self._y = 0.0
+        self._theta = math.pi / 2
+        self._v = 0.0
+        self._w = 0.0
+        self._stamp = time.monotonic()
+        self.corrections = 0
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------- inputs ----------
+    def set_command(self, left, right):
+        """New wheel command (called by MotorControl); integrates up to now with the old one first."""
+        v, w = self.wheels.to_velocity(left, right)
+        with self._lock:
+            self._integrate(time.monotonic())
+            self._v, self._w = v, w
+
+    def reset(self, x, y, theta):
+        with self._lock:
+            self._integrate(time.monotonic())
+            self._x, self._y, self._theta = float(x), float(y), wrap_angle(float(theta))
+
+    def correct(self, x=None, y=None, theta=None, weight=1.0):
+        """
+        Blend an absolute measurement into the estimate; `weight` 1.0 replaces the
+        estimate, smaller values trust the dead reckoning more. None components are skipped.
+        """
+        with self._lock:
+            self._integrate(time.monotonic())
+            if x is not None:
+                self._x += weight * (float(x) - self._x)
+            if y is not None:
+                self._y += weight * (float(y) - self._y)
+            if theta is not None:
+                self._theta = wrap_angle(self._theta + weight * wrap_angle(float(theta) - self._theta))
+            self.corrections += 1
+
+    # ---------- integration ----------
+    def _integrate(self, now):
+        # caller holds self._lock
+        dt = now - self._stamp
+        self._stamp = now
+        if dt <= 0 or (self._v == 0.0 and self._w == 0.0):
+            return
+        mid = self._theta + self._w * dt / 2.0
+        self._x += self._v * math.cos(mid) * dt
+        self._y += self._v * math.sin(mid) * dt
+        self._theta = wrap_angle(self._theta + self._w * dt)
+
+    def _run(self):
+        period = 1.0 / self.rate_hz
+        while not self._stop.wait(period):
+            with self._lock:
+                self._integrate(time.monotonic())
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="odometry")
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # ---------- outputs ----------
+    def pose(self):
+        """(x, y, theta, v, w) integrated up to now."""
+        with self._lock:
+            self._integrate(time.monotonic())
+            return self._x, self._y, self._theta, self._v, self._w
+
+    def pose_deg(self):
+        """(x, y, heading_deg) in Navigator's convention."""
+        x, y, theta = self.pose()[:3]
+        return x, y, math.degrees(theta)
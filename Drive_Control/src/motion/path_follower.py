@@ -0,0 +1,192 @@
+import math
+
+from ..utils.logger import get_logger
+from .control_loop import RateLoop
+from .odometry import WheelModel, wrap_angle as _wrap
+
+
+class PathFollower:
+    """
+    Pure-pursuit follower: drives through a waypoint list with continuous differential-drive
+    commands (`MotorControl.set_motors`) at `control.loop_rate_hz` instead of stopping and
+    turning at every waypoint.
+
+    Each tick: project the pose onto the path (progress only moves forward), take the
+    point `lookahead_distance` further along the path, and steer on the arc through it
+    (curvature = 2 sin(alpha) / L). If that point is more than `rotate_in_place_deg`
+    off the heading (start of a path, U-turns), the robot turns in place first. The speed
+    ramps down over `slowdown_distance` before the end.
+
+    Speeds are in m/s and rad/s. WheelModel converts them to motor commands using the
+    existing open-loop calibration in `motor`, so no new calibration is needed.
+    Pose is (x, y, heading_deg) in the map frame, with heading 90 = +y like Navigator.
+    It is read from `odometry` when one is given, otherwise dead-reckoned here from the
+    commanded wheel speeds.
+    """
+
+    def __init__(self, motor_control, config, odometry=None):
+        self.motor = motor_control
+        self.logger = get_logger("PathFollower")
+        ccfg = config.get('control', {}) or {}
+
+        self.rate_hz = ccfg.get('loop_rate_hz', 20)
+        self.lookahead = ccfg.get('lookahead_distance', 0.15)
+        self.max_v = ccfg.get('max_linear_speed', 0.08)
+        self.max_w = ccfg.get('max_angular_speed', 0.5)
+        self.goal_tolerance = ccfg.get('goal_tolerance', 0.02)
+        self.slowdown_distance = ccfg.get('slowdown_distance', 0.1)
+        self.min_v = ccfg.get('min_linear_speed', 0.02)
+        self.rotate_threshold = math.radians(ccfg.get('rotate_in_place_deg', 60))
+        self.heading_tolerance = math.radians(ccfg.get('heading_tolerance_deg', 10))
+        self.max_cmd = ccfg.get('max_motor_command', 0.6)
+        self.timeout_factor = ccfg.get('timeout_factor', 3.0)
+
+        self.odometry = odometry
+        self.wheels = odometry.wheels if odometry is not None else WheelModel(config)
+
+        self.last_stats = None
+
+    # ---------- geometry ----------
+    @staticmethod
+    def _clean(path):
+        pts = []
+        for p in path:
+            p = (float(p[0]), float(p[1]))
+            if not pts or math.hypot(p[0] - pts[-1][0], p[1] - pts[-1][1]) > 1e-6:
+                pts.append(p)
+        return pts
+
+    def _project(self, pts, cum, seg, x, y):
+        """Closest point on segments seg.. (looking a few segments ahead). Returns (seg, s along path)."""
+        best = (seg, cum[seg], float('inf'))
+        for i in range(seg, min(len(pts) - 1, seg + 4)):
+            (ax, ay), (bx, by) = pts[i], pts[i + 1]
+            dx, dy = bx - ax, by - ay
+            L2 = dx * dx + dy * dy
+            t = max(0.0, min(1.0, ((x - ax) * dx + (y - ay) * dy) / L2))
+            px, py = ax + t * dx, ay + t * dy
+            d = math.hypot(x - px, y - py)
+            if d < best[2]:
+                best = (i, cum[i] + t * math.sqrt(L2), d)
+        return best[0], best[1]
+
+    @staticmethod
+    def _point_at(pts, cum, s):
+        if s >= cum[-1]:
+            return pts[-1]
+        i = 0
+        while cum[i + 1] < s:
+            i += 1
+        t = (s - cum[i]) / (cum[i + 1] - cum[i])
+        (ax, ay), (bx, by) = pts[i], pts[i + 1]
+        return ax + t * (bx - ax), ay + t * (by - ay)
+
+    # ---------- commands ----------
+    def velocity_for(self, pose, target, remaining):
+        """(v m/s, w rad/s) steering from pose (x, y, heading rad) toward the lookahead target."""
+        x, y, th = pose
+        dx, dy = target[0] - x, target[1] - y
+        dist = math.hypot(dx, dy)
+        if dist < 1e-6:
+            return 0.0, 0.0
+        alpha = _wrap(math.atan2(dy, dx) - th)
+        if abs(alpha) > self.rotate_threshold:
+            return 0.0, math.copysign(self.max_w, alpha)
+
+        v = self.max_v * min(1.0, remaining / self.slowdown_distance) if self.slowdown_distance > 0 else self.max_v
+        v = max(self.min_v, v)
+        w = v * 2.0 * math.sin(alpha) / dist
+        if abs(w) > self.max_w:
+            # keep the arc, slow down along it
+            v *= self.max_w / abs(w)
+            w = math.copysign(self.max_w, w)
+        return v, w
+
+    def wheel_commands(self, v, w):
+        left, right = self.wheels.to_wheels(v, w)
+        peak = max(abs(left), abs(right))
+        if peak > self.max_cmd:
+            left *= self.max_cmd / peak
+            right *= self.max_cmd / peak
+        return left, right
+
+    def command_velocity(self, left, right):
+        """(v, w) actually produced by a wheel command pair (after scaling)."""
+        return self.wheels.to_velocity(left, right)
+
+    def _advance(self, pose, left, right, dt):
+        """Pose after `dt` of the given command: from odometry if attached, else integrated here."""
+        if self.odometry is not None:
+            return self.odometry.pose()[:3]
+        x, y, th = pose
+        v, w = self.command_velocity(left, right)
+        x += v * math.cos(th + w * dt / 2.0) * dt
+        y += v * math.sin(th + w * dt / 2.0) * dt
+        return x, y, _wrap(th + w * dt)
+
+    # ---------- main loop ----------
+    def follow(self, path, pose, final_heading_deg=None, cancel=None):
+        """
+        Drive along `path` ([[x, y], ...], first point = start) from `pose` (x, y, heading_deg).
+        Pose comes from odometry if attached, else is dead-reckoned from the commanded wheel speeds.
+        Setting `cancel` (threading.Event) stops within one control period.
+        Returns (reached, (x, y, heading_deg)); motors are stopped on return.
+        """
+        pts = self._clean(path)
+        x, y, th = float(pose[0]), float(pose[1]), math.radians(pose[2])
+        if self.odometry is not None:
+            x, y, th = self.odometry.pose()[:3]
+        if len(pts) < 2:
+            return True, (x, y, math.degrees(th))
+
+        cum = [0.0]
+        for i in range(1, len(pts)):
+            cum.append(cum[-1] + math.hypot(pts[i][0] - pts[i - 1][0], pts[i][1] - pts[i - 1][1]))
+        length = cum[-1]
+        # generous budget: path at min speed plus a full turn per corner
+        timeout = self.timeout_factor * (length / max(self.min_v, 1e-3) + len(pts) * math.pi / self.max_w)
+
+        loop = RateLoop(self.rate_hz, cancel)
+        seg = 0
+        reached = False
+        try:
+            while loop.elapsed() < timeout and not loop.cancelled:
+                seg, s = self._project(pts, cum, seg, x, y)
+                remaining = length - s
+                end_dist = math.hypot(pts[-1][0] - x, pts[-1][1] - y)
+                if end_dist < self.goal_tolerance or (seg == len(pts) - 2 and remaining < self.goal_tolerance):
+                    reached = True
+                    break
+
+                target = self._point_at(pts, cum, s + self.lookahead)
+                v, w = self.velocity_for((x, y, th), target, remaining)
+                left, right = self.wheel_commands(v, w)
+                self.motor.set_motors(left, right)
+                loop.sleep()
+                x, y, th = self._advance((x, y, th), left, right, loop.dt)
+        finally:
+            self.motor.stop()
+
+        if reached and final_heading_deg is not None:
+            th = self.turn_in_place(th, math.radians(final_heading_deg), cancel)
+
+        self.last_stats = dict(loop.stats(), length_m=round(length, 3), seconds=round(loop.elapsed(), 2), reached=reached)
+        outcome = 'done' if reached else ('CANCELLED' if loop.cancelled else 'TIMEOUT')
+        self.logger.info(f"Path {outcome}: {self.last_stats}")
+        return reached, (x, y, math.degrees(th))
+
+    def turn_in_place(self, th, target, cancel=None):
+        loop = RateLoop(self.rate_hz, cancel)
+        try:
+            while loop.elapsed() < 2 * math.pi / self.max_w * self.timeout_factor and not loop.cancelled:
+                err = _wrap(target - th)
+                if abs(err) < self.heading_tolerance:
+                    break
+                w = math.copysign(min(self.max_w, max(abs(err) * 2.0, self.max_w * 0.3)), err)
+                left, right = self.wheel_commands(0.0, w)
+                self.motor.set_motors(left, right)
+                loop.sleep()
+                th = self._advance((0.0, 0.0, th), left, right, loop.dt)[2]
+        finally:
+            self.motor.stop()
+        return th
@@ -0,0 +1,30 @@
+"""Run with `python -m pytest src` from Drive_Control/."""
+import threading
+import time
+
+from .control_loop import PID, RateLoop
+
+
+def test_pid_clamps_without_windup():
+    pid = PID(kp=1.0, ki=10.0, max_output=1.0)
+    for _ in range(50):
+        assert pid.update(5.0, 0.1) == 1.0
+    assert pid.integral == 0.0  # held while saturated
+    assert pid.update(-0.5, 0.1) < 0  # reverses at once
+
+
+def test_pid_deadband_and_min_output():
+    pid = PID(kp=0.01, min_output=0.08, deadband=1.0)
+    assert pid.update(0.5, 0.1) == 0.0
+    assert pid.update(2.0, 0.1) == 0.08
+    assert pid.update(-2.0, 0.1) == -0.08
+
+
+def test_rate_loop_stops_on_cancel():
+    cancel = threading.Event()
+    loop = RateLoop(2, cancel)  # 0.5 s period
+    threading.Timer(0.05, cancel.set).start()
+    t0 = time.monotonic()
+    loop.sleep()
+    assert loop.cancelled
+    assert time.monotonic() - t0 < 0.4
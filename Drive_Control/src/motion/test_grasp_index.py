@@ -0,0 +1,23 @@
+"""Run with `python -m pytest src` from Drive_Control/."""
+import pytest
+
+from .grasp_index import GraspIndex
+
+TABLE = {
+    1: {'name': 'choco', 'location': [1.0, 0.5]},
+    2: {'name': 'vitamin', 'location': [2.0, 0.5]},
+}
+
+
+def test_lookup_within_tolerance():
+    index = GraspIndex(TABLE, ['choco', 'vitamin'], tolerance=0.02)
+    assert index.lookup(1.015, 0.5) == (1, 'choco')
+    assert index.lookup(1.05, 0.5) is None
+    index.done('choco')
+    assert index.lookup(1.0, 0.5) is None
+    assert index.annotate([[0, 0], [1.0, 0.5], [2.0, 0.5]]) == {2: (2, 'vitamin')}
+
+
+def test_zero_tolerance_is_rejected():
+    with pytest.raises(ValueError):
+        GraspIndex(TABLE, ['choco'], tolerance=0)
@@ -0,0 +1,39 @@
+"""Run with `python -m pytest src` from Drive_Control/."""
+import math
+
+from . import odometry
+from .odometry import Odometry, wrap_angle
+
+CONFIG = {
+    'motor': {'speed_move': 0.5, 'speed_turn': 0.5, 'time_per_1m': 12.5,
+              'time_per_90_deg_left': 3.0, 'time_per_90_deg_right': 3.0},
+}
+
+
+def test_wheel_model_round_trip():
+    wheels = Odometry(CONFIG).wheels
+    v, w = wheels.to_velocity(*wheels.to_wheels(0.05, 0.2))
+    assert math.isclose(v, 0.05) and math.isclose(w, 0.2)
+
+
+def test_integrate_straight_and_turn(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(odometry.time, 'monotonic', lambda: clock[0])
+    odo = Odometry(CONFIG)
+    odo.reset(0.0, 0.0, 0.0)
+    odo.set_command(*odo.wheels.to_wheels(0.1, 0.0))
+    clock[0] += 2.0
+    odo.set_command(*odo.wheels.to_wheels(0.0, math.pi / 2))
+    clock[0] += 1.0
+    x, y, theta = odo.pose()[:3]
+    assert math.isclose(x, 0.2) and abs(y) < 1e-9
+    assert math.isclose(theta, math.pi / 2)
+
+
+def test_correct_blends_across_pi():
+    odo = Odometry(CONFIG)
+    odo.reset(0.0, 0.0, math.radians(170))
+    odo.correct(x=1.0, theta=math.radians(-170), weight=0.5)
+    x, _, theta = odo.pose()[:3]
+    assert math.isclose(x, 0.5)
+    assert math.isclose(wrap_angle(theta - math.pi), 0.0, abs_tol=1e-9)  # midpoint is 180, not 0
@@ -1,133 +1,146 @@
-import cv2
 import numpy as np
-import time
 from ..utils.logger import get_logger
+from ..motion.control_loop import PID, RateLoop
+from .frame_grabber import next_frame
+from .marker_tracker import MarkerTracker
 
 class Aligner:
     def __init__(self, motor_control, config):
         self.motor = motor_control
         self.logger = get_logger("Aligner")
-        self.timeout = config['vision']['align_timeout']
-        self.error_offset = config['vision']['align_error_offset']
-        self.turn_gain = config['vision']['turn_gain']
-        self.servo_gain = config['vision'].get('servo_gain', 0.1)
-        
-        # HSV ranges for Red
-        self.lower_red1 = np.array([0, 85, 0])
-        self.upper_red1 = np.array([10, 255, 255])
-        self.lower_red2 = np.array([110, 45, 50])
-        self.upper_red2 = np.array([180, 255, 255])
+        vcfg = config['vision']
+        self.timeout = vcfg['align_timeout']
+        self.error_offset = vcfg['align_error_offset']
+        self.turn_gain = vcfg['turn_gain']
+        self.servo_gain = vcfg.get('servo_gain', 0.1)
+        # red marker: ROI band, downscaled, searched around the last position
+        self.marker = MarkerTracker(config)
+        # frames are copied out of the grabber's ring into this buffer (no torn frames)
+        self._frame = None
+
+        # fixed-rate PID loops; kp defaults to the old proportional gains
+        self.align_rate_hz = vcfg.get('align_rate_hz', 30)
+        self.turn_pid = PID.from_config(vcfg.get('align_pid'), kp=self.turn_gain, ki=0.0, kd=0.0,
+                                        min_output=0.08, max_output=0.4)
+        self.servo_rate_hz = vcfg.get('servo_rate_hz', 20)
+        self.servo_pid = PID.from_config(vcfg.get('servo_pid'), kp=self.servo_gain, ki=0.0, kd=0.0,
+                                         max_output=180.0)
+        self.last_loop_stats = None
+
+    def _finish_loop(self, name, loop):
+        self.last_loop_stats = loop.stats()
+        self.logger.info(f"{name} loop: {self.last_loop_stats}")
 
-    def align_to_red_marker(self, camera_instance):
+    def align_to_red_marker(self, camera_instance, cancel=None):
         self.logger.info("Searching for RED marker...")
-        start_time = time.time()
+        seq = 0
+        self.marker.reset()
+        pid = self.turn_pid
+        pid.reset()
+        loop = RateLoop(self.align_rate_hz, cancel)
         
-        while (time.time() - start_time) < self.timeout:
-            image = camera_instance.value
-            if image is None: continue
+        while loop.elapsed() < self.timeout and not loop.cancelled:
+            # blocks until a frame newer than the last processed one (FrameGrabber)
+            seq, image = next_frame(camera_instance, seq, timeout=self.timeout - loop.elapsed(),
+                                    copy=True, out=self._frame)
+            if image is not None:
+                self._frame = image
+            error = self.marker.error(image) if image is not None else None
             
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-            mask1 = cv2.inRange(hsv, self.lower_red1, self.upper_red1)
-            mask2 = cv2.inRange(hsv, self.lower_red2, self.upper_red2)
-            mask = cv2.bitwise_or(mask1, mask2)
-            mask = cv2.erode(mask, None, iterations=2)
-            mask = cv2.dilate(mask, None, iterations=2)
-            
-            cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            if len(cnts) > 0:
-                c = max(cnts, key=cv2.contourArea)
-                M = cv2.moments(c)
-                
-                if M["m00"] != 0:
-                    cx = int(M["m10"] / M["m00"])
-                    center_x = image.shape[1] / 2
-                    error = (cx - center_x) / center_x
-                    
-                    if abs(error) < self.error_offset:
-                        self.logger.info(f"Aligned! Error: {error:.4f}")
-                        self.motor.stop()
-                        return True
-                    
-                    turn_speed = error * self.turn_gain
-                    # Clamp speed
-                    min_speed = 0.08
-                    max_speed = 0.4
-                    if 0 < turn_speed < min_speed: turn_speed = min_speed
-                    if -min_speed < turn_speed < 0: turn_speed = -min_speed
-                    if turn_speed > max_speed: turn_speed = max_speed
-                    if turn_speed < -max_speed: turn_speed = -max_speed
-                    
-                    self.motor.set_motors(turn_speed, -turn_speed)
-                else:
-                    self.motor.stop()
-            else:
+            if error is None:
                 self.motor.stop()
-            time.sleep(0.01)
+            elif abs(error) < self.error_offset:
+                self.logger.info(f"Aligned! Error: {error:.4f}")
+                self.motor.stop()
+                self._finish_loop("Marker", loop)
+                return True
+            else:
+                # clamped to [min_output, max_output] speed with anti-windup
+                turn_speed = pid.update(error, loop.dt)
+                self.motor.set_motors(turn_speed, -turn_speed)
+            loop.sleep()
         
-        self.logger.warning("Alignment Timeout")
+        self.logger.warning("Alignment cancelled" if loop.cancelled else "Alignment Timeout")
         self.motor.stop()
+        self._finish_loop("Marker", loop)
         return False
 
-    def align_to_object_with_servo(self, camera_instance, detector, neutral=90, tol_px=12, timeout=3.0, min_angle=-90, max_angle=90, class_id=0):
+    def align_to_object_with_servo(self, camera_instance, detector, neutral=90, tol_px=12, timeout=3.0, min_angle=-90, max_angle=90, class_id=0, cancel=None):
         """Use detector to find object center and adjust servo 1 so object's center
         aligns with image vertical center. Calls TTLServo.servoAngleCtrl(1, value, 1, 150).
 
         Args:
-            camera_instance: camera providing `.value` images
-            detector: ObjectDetector instance with `.detect(image)` returning detections with 'bbox' and 'score'
+            camera_instance: FrameGrabber (or camera providing `.value` images)
+            detector: DetectionWorker (latest results from a background thread) or
+                ObjectDetector instance with `.detect(image)` returning `Detections`
             neutral: baseline servo angle (degrees)
-            gain: degrees to apply for normalized error of 1.0
             tol_px: pixel tolerance for alignment
             timeout: seconds to attempt alignment
             min_angle, max_angle: servo angle clamps
+            cancel: optional threading.Event; the loop stops within one period once set
+
+        The servo angle is `neutral + servo_pid(normalized error)` at `servo_rate_hz`;
+        the integral term holds the offset once the object is centered.
 
         Returns:
             True if aligned within tolerance, False otherwise
         """
         from SCSCtrl import TTLServo
 
-        gain = self.servo_gain
-        start = time.time()
-        while (time.time() - start) < timeout:
-            image = camera_instance.value
-            if image is None:
-                time.sleep(0.05)
-                continue
+        async_detect = hasattr(detector, 'wait_result')
+        if async_detect:
+            detector.activate()
+        try:
+            return self._servo_align_loop(TTLServo, camera_instance, detector, async_detect,
+                                          neutral, tol_px, timeout, min_angle, max_angle, class_id, cancel)
+        finally:
+            if async_detect:
+                detector.deactivate()
 
-            detections = detector.detect(image)
-            if not detections:
-                time.sleep(0.05)
+    def _next_detections(self, camera_instance, detector, async_detect, seq, timeout):
+        """(seq, Detections, image width) for a frame newer than `seq`; Detections is None on timeout."""
+        if async_detect:
+            result = detector.wait_result(seq, timeout)
+            if result is None:
+                return seq, None, None
+            return result.seq, result.detections, result.image_size[0]
+        seq, image = next_frame(camera_instance, seq, timeout, copy=True, out=self._frame)
+        if image is None:
+            return seq, None, None
+        self._frame = image
+        return seq, detector.detect(image), image.shape[1]
+
+    def _servo_align_loop(self, TTLServo, camera_instance, detector, async_detect,
+                          neutral, tol_px, timeout, min_angle, max_angle, class_id, cancel=None):
+        seq = 0
+        pid = self.servo_pid
+        pid.reset()
+        loop = RateLoop(self.servo_rate_hz, cancel)
+        while loop.elapsed() < timeout and not loop.cancelled:
+            seq, detections, img_w = self._next_detections(camera_instance, detector, async_detect, seq,
+                                                           timeout - loop.elapsed())
+            if detections is not None:
+                detections = detections.of_class(class_id)
+            if detections is None or not len(detections):
+                loop.sleep()
                 continue
 
             # pick detection whose center is closest to image vertical center
-            img_cx = image.shape[1] / 2.0
-            best = None
-            best_dist = None
-            for d in detections:
-                if d.get('class_id') != class_id:
-                    continue
-                try:
-                    x1, y1, x2, y2 = d.get('bbox', (0,0,0,0))
-                    obj_cx = (x1 + x2) / 2.0
-                    dist = abs(obj_cx - img_cx)
-                    if best is None or dist < best_dist:
-                        best = d
-                        best_dist = dist
-                except Exception:
-                    continue
-            if best is None:
-                time.sleep(0.05)
-                continue
-            x1, y1, x2, y2 = best.get('bbox', (0,0,0,0))
-            obj_cx = (x1 + x2) / 2.0
-            img_cx = image.shape[1] / 2.0
-            error_px = obj_cx - img_cx
+            img_cx = img_w / 2.0
+            centers = detections.centers_x()
+            i = int(np.argmin(np.abs(centers - img_cx)))
+            best = detections[i]
+            error_px = centers[i] - img_cx
             self.logger.info(f"{best}")
 
+            if abs(error_px) <= tol_px:
+                self.logger.info("Object aligned within tolerance")
+                self._finish_loop("Servo", loop)
+                return True
+
             # normalized error in [-1,1]
             norm_err = error_px / img_cx
-            delta_angle = norm_err * gain
+            delta_angle = pid.update(norm_err, loop.dt)
             value = neutral + delta_angle
             # clamp
             if value < min_angle: value = min_angle
@@ -140,11 +153,9 @@ class Aligner:
 
             self.logger.info(f"Align servo -> value={value:.1f} (delta_angle={delta_angle:.1f})")
 
-            if abs(error_px) <= tol_px:
-                self.logger.info("Object aligned within tolerance")
-                return True
-
-            time.sleep(0.05)
+            # with the worker, inference on the next frame already overlaps the servo move
+            loop.sleep()
 
-        self.logger.warning("align_to_object_with_servo: timeout")
+        self.logger.warning("align_to_object_with_servo: " + ("cancelled" if loop.cancelled else "timeout"))
+        self._finish_loop("Servo", loop)
         return False
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Detector pre/post-processing: old per-frame code vs Preprocessor and vectorized decode_yolo (+ NMS).
+
+    python -m src.vision.bench_detector                      # synthetic YOLOv5 output
+    python -m src.vision.bench_detector --pred out.npy       # recorded interpreter output(s)
+
+Record outputs on the robot with `np.save('out.npy', interpreter.get_tensor(out_idx))`;
+a stacked (frames, N, 5 + classes) array is benchmarked frame by frame.
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from .postprocess import decode_yolo
+from .preprocess import Preprocessor
+
+
+def legacy_decode(data, model_w, model_h, orig_w, orig_h, conf_thres):
+    results = []
+    for x, y, w_box, h_box, conf, *cp in data:
+        cls = int(np.argmax(cp))
+        score = conf * cp[cls]
+        if score < conf_thres: continue
+        x1 = int(((x - w_box/2) / model_w) * orig_w)
+        y1 = int(((y - h_box/2) / model_h) * orig_h)
+        x2 = int(((x + w_box/2) / model_w) * orig_w)
+        y2 = int(((y + h_box/2) / model_h) * orig_h)
+        results.append({'bbox': (x1, y1, x2, y2), 'score': score, 'class_id': cls})
+    return results
+
+
+def legacy_preprocess(image, model_w, model_h):
+    img_resized = cv2.resize(image, (model_w, model_h))
+    input_data = np.array(cv2.cvtColor(img_resized, cv2.COLOR_BGR2RGB), dtype=np.float32) / 255.0
+    # set_tensor() copies the transposed (non-contiguous) view into the input tensor
+    return np.ascontiguousarray(input_data.transpose(2, 0, 1)[np.newaxis, ...])
+
+
+def bench_preprocess(model_size, image_size, rounds):
+    image = np.random.RandomState(0).randint(0, 256, (image_size, image_size, 3)).astype(np.uint8)
+    old_ms = _time(lambda: legacy_preprocess(image, model_size, model_size), rounds)
+    print(f"preprocess {image_size}x{image_size} -> {model_size}x{model_size}")
+    print(f"  per-frame allocations : {old_ms:8.3f} ms/frame")
+    variants = (("float32", np.float32, None), ("uint8", np.uint8, (1 / 255.0, 0)), ("int8", np.int8, (1 / 255.0, -128)))
+    for name, dtype, quant in variants:
+        pre = Preprocessor((1, 3, model_size, model_size), dtype, quant)
+        buf = pre.new_buffer()
+        if dtype == np.float32:
+            assert np.allclose(pre.fill(image, buf), legacy_preprocess(image, model_size, model_size))
+        new_ms = _time(lambda: pre.fill(image, buf), rounds)
+        print(f"  preallocated {name:8s} : {new_ms:8.3f} ms/frame ({old_ms / new_ms:.1f}x)")
+
+
+def synthetic(n_anchors, n_classes, size, n_objects=4, seed=0):
+    """Mostly background anchors plus clusters of overlapping boxes around a few objects."""
+    rng = np.random.RandomState(seed)
+    data = np.zeros((n_anchors, 5 + n_classes), np.float32)
+    data[:, 0:2] = rng.uniform(0, size, (n_anchors, 2))
+    data[:, 2:4] = rng.uniform(4, size / 4.0, (n_anchors, 2))
+    data[:, 4] = rng.beta(0.5, 8, n_anchors)
+    data[:, 5:] = rng.dirichlet(np.ones(n_classes), n_anchors)
+    for k in range(n_objects):
+        idx = rng.choice(n_anchors, 30, replace=False)
+        cx, cy = rng.uniform(size * 0.2, size * 0.8, 2)
+        data[idx, 0] = cx + rng.normal(0, 2, 30)
+        data[idx, 1] = cy + rng.normal(0, 2, 30)
+        data[idx, 2:4] = 60 + rng.normal(0, 3, (30, 2))
+        data[idx, 4] = rng.uniform(0.7, 0.99, 30)
+        data[idx, 5:] = 0.01
+        data[idx, 5 + k % n_classes] = 0.95
+    return data
+
+
+def _time(fn, rounds):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds * 1000.0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pred", help=".npy with interpreter output(s)")
+    ap.add_argument("--anchors", type=int, default=6300, help="synthetic: rows (320x320 YOLOv5 = 6300)")
+    ap.add_argument("--classes", type=int, default=10)
+    ap.add_argument("--model-size", type=int, default=320)
+    ap.add_argument("--image-size", type=int, default=300)
+    ap.add_argument("--conf", type=float, default=0.5)
+    ap.add_argument("--iou", type=float, default=0.45)
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+
+    bench_preprocess(args.model_size, args.image_size, args.rounds * 10)
+
+    if args.pred:
+        frames = np.load(args.pred)
+        if frames.ndim == 2:
+            frames = frames[np.newaxis]
+    else:
+        frames = synthetic(args.anchors, args.classes, args.model_size)[np.newaxis]
+
+    m, s = args.model_size, args.image_size
+    old_ms, new_ms, n_old, n_new = 0.0, 0.0, 0, 0
+    for data in frames:
+        old = legacy_decode(data, m, m, s, s, args.conf)
+        # NMS disabled -> must reproduce the loop's boxes exactly
+        same = decode_yolo(data, m, m, s, s, args.conf, iou_thres=1.01, max_det=len(data))
+        assert sorted(d['bbox'] + (d['class_id'],) for d in old) == sorted(d['bbox'] + (d['class_id'],) for d in same)
+        n_old += len(old)
+        n_new += len(decode_yolo(data, m, m, s, s, args.conf, args.iou))
+        old_ms += _time(lambda: legacy_decode(data, m, m, s, s, args.conf), args.rounds)
+        new_ms += _time(lambda: decode_yolo(data, m, m, s, s, args.conf, args.iou), args.rounds)
+
+    n = len(frames)
+    print(f"frames={n} rows={frames.shape[1]} classes={frames.shape[2] - 5}")
+    print(f"  loop       : {old_ms / n:8.3f} ms/frame  boxes={n_old / float(n):.1f}")
+    print(f"  vectorized : {new_ms / n:8.3f} ms/frame  boxes={n_new / float(n):.1f} (after NMS)")
+    print(f"  speedup    : {old_ms / new_ms:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
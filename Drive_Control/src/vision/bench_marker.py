@@ -0,0 +1,69 @@
+"""
+Red-marker centroid: old full-frame HSV/morphology pass vs MarkerTracker (ROI, downscale, tracking window).
+
+    python -m src.vision.bench_marker [--size 300] [--frames 300]
+
+Synthetic frames: noisy background with a red marker drifting toward the center, like
+an alignment turn. Prints ms/frame and the largest centroid difference.
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from .marker_tracker import MarkerTracker
+
+
+def legacy_centroid(image):
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    mask1 = cv2.inRange(hsv, MarkerTracker.LOWER_RED1, MarkerTracker.UPPER_RED1)
+    mask2 = cv2.inRange(hsv, MarkerTracker.LOWER_RED2, MarkerTracker.UPPER_RED2)
+    mask = cv2.bitwise_or(mask1, mask2)
+    mask = cv2.erode(mask, None, iterations=2)
+    mask = cv2.dilate(mask, None, iterations=2)
+    cnts = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]
+    if len(cnts) == 0:
+        return None
+    M = cv2.moments(max(cnts, key=cv2.contourArea))
+    return M["m10"] / M["m00"] if M["m00"] else None
+
+
+def frames(size, n, seed=0):
+    rng = np.random.RandomState(seed)
+    base = np.full((size, size, 3), (90, 140, 60), np.uint8) + rng.randint(0, 30, (size, size, 3)).astype(np.uint8)
+    out = []
+    for i in range(n):
+        img = base.copy()
+        x = int(size * 0.85 - (size * 0.35) * i / max(1, n - 1))
+        cv2.rectangle(img, (x - size // 30, size // 3), (x + size // 30, size // 2), (0, 0, 230), -1)
+        out.append(img)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=300)
+    ap.add_argument("--frames", type=int, default=300)
+    args = ap.parse_args()
+
+    imgs = frames(args.size, args.frames)
+    tracker = MarkerTracker({'vision': {}})
+
+    t0 = time.perf_counter()
+    old = [legacy_centroid(img) for img in imgs]
+    t1 = time.perf_counter()
+    new = [tracker.locate(img) for img in imgs]
+    t2 = time.perf_counter()
+
+    diff = max(abs(a - b) for a, b in zip(old, new) if a is not None and b is not None)
+    n = float(len(imgs))
+    print(f"{args.size}x{args.size}, {len(imgs)} frames")
+    print(f"  full frame : {(t1 - t0) / n * 1000:7.3f} ms/frame")
+    print(f"  tracker    : {(t2 - t1) / n * 1000:7.3f} ms/frame "
+          f"(full searches {tracker.full_searches}, window searches {tracker.window_searches})")
+    print(f"  max centroid difference: {diff:.2f} px")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import threading
+import time
+
+from ..utils.logger import get_logger
+from .frame_grabber import next_frame
+
+
+class DetectionResult:
+    __slots__ = ('seq', 'stamp', 'detections', 'image_size', 'latency_ms')
+
+    def __init__(self, seq, stamp, detections, image_size, latency_ms):
+        self.seq = seq                # frame sequence number the detections belong to
+        self.stamp = stamp            # time.time() when the frame was taken from the grabber
+        self.detections = detections  # Detections
+        self.image_size = image_size  # (width, height)
+        self.latency_ms = latency_ms  # inference + post-processing
+
+    def age(self):
+        return time.time() - self.stamp
+
+
+class DetectionWorker:
+    """
+    Runs `ObjectDetector.detect` in a background thread on the newest FrameGrabber frame
+    and keeps only the latest result, so control loops read detections without waiting
+    for inference (servo motion and inference overlap).
+
+    The worker idles until `activate()`; `deactivate()` pauses it again so it does not
+    take CPU from the motion/marker loops while driving. `always_on=True` starts active.
+    `activate()` drops the previous result (and any inference still running), so a new
+    alignment never sees detections from the last stop.
+    """
+
+    def __init__(self, detector, frames, always_on=False):
+        self.logger = get_logger("DetectionWorker")
+        self.detector = detector
+        self.frames = frames
+        self._active = threading.Event()
+        if always_on:
+            self._active.set()
+        self._stop = threading.Event()
+        self._cond = threading.Condition()
+        self._result = None
+        self._generation = 0  # bumped by activate(); results of older generations are dropped
+        self._thread = None
+        self.runs = 0
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="detection_worker")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._active.set()  # wake an idle worker so it can exit
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        with self._cond:
+            self._cond.notify_all()
+
+    def activate(self):
+        with self._cond:
+            self._generation += 1
+            self._result = None
+        self._active.set()
+
+    def deactivate(self):
+        self._active.clear()
+
+    @property
+    def active(self):
+        return self._active.is_set()
+
+    def _run(self):
+        seq = 0
+        image = None  # own copy of the frame: inference outlasts the grabber's ring slot
+        while not self._stop.is_set():
+            if not self._active.wait(timeout=0.5):
+                continue
+            generation = self._generation
+            seq, frame = next_frame(self.frames, seq, timeout=0.5, copy=True, out=image)
+            if frame is None:
+                continue
+            image = frame
+            stamp = time.time()
+            t0 = time.perf_counter()
+            try:
+                detections = self.detector.detect(image)
+            except Exception as e:
+                self.logger.warning(f"detect failed: {e}")
+                time.sleep(0.1)
+                continue
+            latency = (time.perf_counter() - t0) * 1000.0
+            result = DetectionResult(seq, stamp, detections, (image.shape[1], image.shape[0]), latency)
+            with self._cond:
+                if generation != self._generation:
+                    continue
+                self._result = result
+                self.runs += 1
+                self._cond.notify_all()
+
+    def latest(self):
+        """Newest DetectionResult (None before the first one); never blocks."""
+        return self._result
+
+    def wait_result(self, after_seq=0, timeout=1.0):
+        """Block until a result for a frame newer than `after_seq` exists; None on timeout."""
+        deadline = time.time() + timeout
+        with self._cond:
+            while self._result is None or self._result.seq <= after_seq:
+                remaining = deadline - time.time()
+                if remaining <= 0 or self._stop.is_set():
+                    return None
+                self._cond.wait(remaining)
+            return self._result
@@ -1,48 +1,60 @@
+import os
+
 import tflite_runtime.interpreter as tflite
-import numpy as np
-import cv2
+
+from .postprocess import decode_yolo
+from .preprocess import Preprocessor, dequantize
 
 class ObjectDetector:
     def __init__(self, config):
-        self.model_path = config['vision']['model_path']
-        self.conf_thres = config['vision']['conf_thres']
+        vcfg = config['vision']
+        self.model_path = vcfg['model_path']
+        # optional int8/uint8 model; used instead of model_path when the file exists
+        quant_path = vcfg.get('quantized_model_path')
+        if quant_path and os.path.exists(quant_path):
+            self.model_path = quant_path
+        self.conf_thres = vcfg['conf_thres']
+        self.iou_thres = vcfg.get('iou_thres', 0.45)
+        self.max_det = vcfg.get('max_det', 100)
+        self.num_threads = vcfg.get('num_threads', 4)
         
-        self.interpreter = tflite.Interpreter(model_path=self.model_path)
+        try:
+            self.interpreter = tflite.Interpreter(model_path=self.model_path, num_threads=self.num_threads)
+        except TypeError:  # old tflite_runtime without num_threads
+            self.interpreter = tflite.Interpreter(model_path=self.model_path)
         self.interpreter.allocate_tensors()
         
         input_details = self.interpreter.get_input_details()
         output_details = self.interpreter.get_output_details()
         self.inp_idx = input_details[0]['index']
         self.out_idx = output_details[0]['index']
-        self.model_h = input_details[0]['shape'][2]
-        self.model_w = input_details[0]['shape'][3]
+        self.out_quant = output_details[0].get('quantization')
+
+        self.pre = Preprocessor(input_details[0]['shape'], input_details[0]['dtype'], input_details[0].get('quantization'))
+        self.model_h = self.pre.model_h
+        self.model_w = self.pre.model_w
+        self._input = self.pre.new_buffer()
+        self.zero_copy = True
+
+    def _set_input(self, image):
+        if self.zero_copy:
+            try:
+                # write straight into the interpreter's input tensor; the view must be
+                # released before invoke()
+                view = self.interpreter.tensor(self.inp_idx)()
+                self.pre.fill(image, view)
+                del view
+                return
+            except Exception:
+                self.zero_copy = False
+        self.interpreter.set_tensor(self.inp_idx, self.pre.fill(image, self._input))
 
     def detect(self, image):
+        """Returns `Detections` (boxes/scores/class_ids arrays, NMS applied, best score first)."""
         orig_h, orig_w = image.shape[:2]
-        img_resized = cv2.resize(image, (self.model_w, self.model_h))
-        input_data = np.array(cv2.cvtColor(img_resized, cv2.COLOR_BGR2RGB), dtype=np.float32) / 255.0
-        input_data = input_data.transpose(2, 0, 1)[np.newaxis, ...]
-
-        self.interpreter.set_tensor(self.inp_idx, input_data)
+        self._set_input(image)
         self.interpreter.invoke()
-        pred = self.interpreter.get_tensor(self.out_idx)
+        pred = dequantize(self.interpreter.get_tensor(self.out_idx), self.out_quant)
 
-        results = []
-        data = pred[0]
-        for x, y, w_box, h_box, conf, *cp in data:
-            cls = int(np.argmax(cp))
-            score = conf * cp[cls]
-            if score < self.conf_thres: continue
-            
-            x1 = int(((x - w_box/2) / self.model_w) * orig_w)
-            y1 = int(((y - h_box/2) / self.model_h) * orig_h)
-            x2 = int(((x + w_box/2) / self.model_w) * orig_w)
-            y2 = int(((y + h_box/2) / self.model_h) * orig_h)
-            
-            results.append({
-                'bbox': (x1, y1, x2, y2),
-                'score': score,
-                'class_id': cls
-            })
-            
-        return results
\ No newline at end of file
+        return decode_yolo(pred[0], self.model_w, self.model_h, orig_w, orig_h,
+                           self.conf_thres, self.iou_thres, self.max_det)
\ No newline at end of file
@@ -0,0 +1,178 @@
+import threading
+import time
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+
+class FrameGrabber:
+    """
+    Background capture into a preallocated ring of frame slots.
+
+    The capture thread copies each new camera frame into the next slot (no per-frame
+    allocation) and bumps a sequence number. Consumers call `wait_next(last_seq)` and
+    block until a newer frame exists, so a frame is never processed twice and no loop
+    spins on `camera.value`.
+
+    Returned frames are views into the ring (zero-copy) and the slot is rewritten after
+    `slots - 1` newer frames, i.e. within ~2 frame periods. Consumers that work on a frame
+    longer than that (inference) pass `copy=True`: the frame is then copied, under the
+    lock, into their own reusable `out` buffer, so the capture thread cannot tear it.
+
+    `source` is a jetbot `Camera` (new frame object on `.value`) or anything with a
+    cv2.VideoCapture-style `read() -> (ok, frame)`.
+    """
+
+    def __init__(self, source, slots=3, poll_interval=0.002):
+        self.logger = get_logger("FrameGrabber")
+        self.source = source
+        self.slots = max(2, int(slots))
+        self.poll_interval = poll_interval
+
+        self._ring = None
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+        self.dropped = 0  # frames overwritten before any consumer asked for them
+        self._last_read_seq = 0
+
+    # ---------- capture ----------
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="frame_grabber")
+        self._thread.daemon = True
+        self._thread.start()
+        self.logger.info(f"Frame grabber started ({self.slots} slots)")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        with self._cond:
+            self._cond.notify_all()
+
+    def _grab(self, last):
+        """Returns the next source frame, or None if there is nothing new yet."""
+        if hasattr(self.source, 'read'):
+            ok, frame = self.source.read()  # blocks until the next frame
+            return frame if ok else None
+        frame = self.source.value
+        if frame is None or frame is last:
+            time.sleep(self.poll_interval)
+            return None
+        return frame
+
+    def _run(self):
+        last = None
+        while not self._stop.is_set():
+            try:
+                frame = self._grab(last)
+            except Exception as e:
+                self.logger.warning(f"Capture failed: {e}")
+                time.sleep(0.1)
+                continue
+            if frame is None:
+                continue
+            last = frame
+            self._publish(frame)
+
+    def _publish(self, frame):
+        if self._ring is None or self._ring.shape[1:] != frame.shape or self._ring.dtype != frame.dtype:
+            self._ring = np.empty((self.slots,) + frame.shape, dtype=frame.dtype)
+        seq = self._seq + 1
+        # the slot being written is never the one handed out for the latest seq
+        np.copyto(self._ring[seq % self.slots], frame)
+        with self._cond:
+            if self._seq > self._last_read_seq:
+                self.dropped += 1
+            self._seq = seq
+            self._cond.notify_all()
+
+    # ---------- consumers ----------
+    @staticmethod
+    def _copy_out(frame, out):
+        # caller holds self._cond: the writer cannot publish, so it never touches this slot
+        if out is None or out.shape != frame.shape or out.dtype != frame.dtype:
+            return frame.copy()
+        np.copyto(out, frame)
+        return out
+
+    @property
+    def seq(self):
+        return self._seq
+
+    @property
+    def value(self):
+        """Latest frame (same contract as jetbot `Camera.value`), None before the first frame."""
+        with self._cond:
+            if self._seq == 0:
+                return None
+            return self._ring[self._seq % self.slots]
+
+    def latest(self, copy=False, out=None):
+        """(seq, frame) of the newest frame without waiting; (0, None) before the first frame."""
+        with self._cond:
+            if self._seq == 0:
+                return 0, None
+            self._last_read_seq = self._seq
+            frame = self._ring[self._seq % self.slots]
+            return self._seq, self._copy_out(frame, out) if copy else frame
+
+    def wait_next(self, last_seq=0, timeout=1.0, copy=False, out=None):
+        """
+        Block until a frame newer than `last_seq` exists.
+        Returns (seq, frame), or (last_seq, None) on timeout / stop.
+        Intermediate frames are skipped: the newest one is always returned.
+        With `copy=True` the frame is copied into `out` (reallocated if it does not fit);
+        keep the returned array and pass it back as `out` next time.
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            while self._seq <= last_seq:
+                remaining = deadline - time.time()
+                if remaining <= 0 or self._stop.is_set():
+                    return last_seq, None
+                self._cond.wait(remaining)
+            self._last_read_seq = self._seq
+            frame = self._ring[self._seq % self.slots]
+            return self._seq, self._copy_out(frame, out) if copy else frame
+
+
+# plain cameras: id(camera) -> [last frame object, its sequence number]
+_plain_lock = threading.Lock()
+_plain_state = {}
+
+
+def _plain_seq(camera, frame):
+    """Sequence number of `frame` for a plain camera: bumped whenever `.value` is a new object."""
+    with _plain_lock:
+        state = _plain_state.setdefault(id(camera), [None, 0])
+        if frame is not state[0]:
+            state[0] = frame
+            state[1] += 1
+        return state[1]
+
+
+def next_frame(camera, last_seq=0, timeout=1.0, copy=False, out=None):
+    """
+    `wait_next` for a FrameGrabber. For a plain camera (`.value` only, a new array per
+    frame like jetbot `Camera`) the sequence number advances when `.value` changes, so the
+    same frame is not returned twice; it polls briefly until then.
+    """
+    if hasattr(camera, 'wait_next'):
+        return camera.wait_next(last_seq, timeout, copy=copy, out=out)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        frame = camera.value
+        if frame is not None:
+            seq = _plain_seq(camera, frame)
+            if seq > last_seq:
+                return seq, FrameGrabber._copy_out(frame, out) if copy else frame
+        time.sleep(0.01)
+    return last_seq, None
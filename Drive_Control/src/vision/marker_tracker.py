@@ -0,0 +1,111 @@
+import cv2
+import numpy as np
+
+
+class MarkerTracker:
+    """
+    Red-marker centroid on a horizontal ROI band, processed at reduced resolution.
+
+    All intermediate images (resized BGR, HSV, masks) are allocated once per frame size
+    and written through `dst=` views. After a hit, the next frame only searches a column
+    window around the last position; the full band is searched again when the marker is
+    lost there.
+
+    config['vision'].get('marker', {}):
+        roi: [top, bottom] band as fractions of the frame height (default whole frame)
+        scale: downscale factor for processing (default 0.5)
+        track_window: half-width of the search window as a fraction of the frame width
+        min_area: smallest blob (in full-resolution pixels) accepted as the marker
+    """
+
+    # HSV ranges for Red
+    LOWER_RED1 = np.array([0, 85, 0])
+    UPPER_RED1 = np.array([10, 255, 255])
+    LOWER_RED2 = np.array([110, 45, 50])
+    UPPER_RED2 = np.array([180, 255, 255])
+
+    def __init__(self, config):
+        cfg = config['vision'].get('marker', {}) or {}
+        self.roi = cfg.get('roi', [0.0, 1.0])
+        self.scale = float(cfg.get('scale', 0.5))
+        self.track_window = float(cfg.get('track_window', 0.25))
+        self.min_area = float(cfg.get('min_area', 40))
+        # the original erode/dilate x2 at full resolution, scaled down with the image
+        self.morph_iterations = max(1, int(round(2 * self.scale)))
+
+        self._shape = None
+        self.last_cx = None  # small-image column of the last hit
+        self.full_searches = 0
+        self.window_searches = 0
+
+    def reset(self):
+        self.last_cx = None
+
+    def _allocate(self, shape):
+        h, w = shape[:2]
+        self._y0 = int(h * self.roi[0])
+        self._y1 = max(self._y0 + 1, int(h * self.roi[1]))
+        self._sw = max(1, int(round(w * self.scale)))
+        self._sh = max(1, int(round((self._y1 - self._y0) * self.scale)))
+        self._fx = w / float(self._sw)  # small column -> full column
+        self._small = np.empty((self._sh, self._sw, 3), np.uint8)
+        self._hsv = np.empty_like(self._small)
+        self._mask = np.empty((self._sh, self._sw), np.uint8)
+        self._mask2 = np.empty_like(self._mask)
+        self._min_area_small = self.min_area * self.scale * self.scale
+        self._shape = shape
+
+    def _search(self, image, x0, x1):
+        """Largest red blob centroid (small-image column) within small columns [x0, x1)."""
+        fx0 = int(x0 * self._fx)
+        fx1 = min(image.shape[1], max(fx0 + 1, int(round(x1 * self._fx))))
+        small = self._small[:, x0:x1]
+        hsv = self._hsv[:, x0:x1]
+        mask = self._mask[:, x0:x1]
+        mask2 = self._mask2[:, x0:x1]
+
+        cv2.resize(image[self._y0:self._y1, fx0:fx1], (x1 - x0, self._sh), dst=small, interpolation=cv2.INTER_NEAREST)
+        cv2.cvtColor(small, cv2.COLOR_BGR2HSV, dst=hsv)
+        cv2.inRange(hsv, self.LOWER_RED1, self.UPPER_RED1, dst=mask)
+        cv2.inRange(hsv, self.LOWER_RED2, self.UPPER_RED2, dst=mask2)
+        cv2.bitwise_or(mask, mask2, dst=mask)
+        cv2.erode(mask, None, dst=mask, iterations=self.morph_iterations)
+        cv2.dilate(mask, None, dst=mask, iterations=self.morph_iterations)
+
+        cnts = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]  # OpenCV 3/4
+        if len(cnts) == 0:
+            return None
+        c = max(cnts, key=cv2.contourArea)
+        M = cv2.moments(c)
+        if M["m00"] == 0 or M["m00"] < self._min_area_small:
+            return None
+        return x0 + M["m10"] / M["m00"]
+
+    def locate(self, image):
+        """Marker centroid column in full-image pixels, or None if not visible."""
+        if self._shape != image.shape:
+            self._allocate(image.shape)
+            self.last_cx = None
+
+        cx = None
+        if self.last_cx is not None:
+            half = max(4, int(self._sw * self.track_window))
+            x0 = max(0, int(self.last_cx) - half)
+            x1 = min(self._sw, int(self.last_cx) + half + 1)
+            self.window_searches += 1
+            cx = self._search(image, x0, x1)
+        if cx is None:
+            self.full_searches += 1
+            cx = self._search(image, 0, self._sw)
+
+        self.last_cx = cx
+        # small pixel i covers full pixels [i*fx, (i+1)*fx)
+        return None if cx is None else cx * self._fx + (self._fx - 1) / 2.0
+
+    def error(self, image):
+        """Normalized horizontal error in [-1, 1] (marker right of center > 0), or None."""
+        cx = self.locate(image)
+        if cx is None:
+            return None
+        center_x = image.shape[1] / 2.0
+        return (cx - center_x) / center_x
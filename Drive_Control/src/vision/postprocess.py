@@ -0,0 +1,121 @@
+import numpy as np
+
+
+class Detections:
+    """
+    Detector output as compact arrays (one row per box):
+        boxes     (N, 4) int32  x1, y1, x2, y2 in original image pixels
+        scores    (N,)   float32
+        class_ids (N,)   int32
+    Sorted by score (highest first). Indexing with an int gives the old dict form
+    ({'bbox', 'score', 'class_id'}), so `for d in detections` keeps working.
+    """
+
+    __slots__ = ('boxes', 'scores', 'class_ids')
+
+    def __init__(self, boxes, scores, class_ids):
+        self.boxes = boxes
+        self.scores = scores
+        self.class_ids = class_ids
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros((0, 4), np.int32), np.zeros(0, np.float32), np.zeros(0, np.int32))
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            return {
+                'bbox': tuple(int(v) for v in self.boxes[i]),
+                'score': float(self.scores[i]),
+                'class_id': int(self.class_ids[i]),
+            }
+        return Detections(self.boxes[i], self.scores[i], self.class_ids[i])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return f"Detections(n={len(self)})"
+
+    def of_class(self, class_id):
+        return self[self.class_ids == class_id]
+
+    def centers_x(self):
+        return (self.boxes[:, 0] + self.boxes[:, 2]) * 0.5
+
+    def to_list(self):
+        return list(self)
+
+
+def nms(boxes, scores, iou_thres=0.45, max_det=100):
+    """
+    Greedy NMS over float boxes (N, 4) xyxy. Returns kept indices, best score first.
+    Each step suppresses all remaining overlaps with one vectorized IoU.
+    """
+    if len(scores) == 0:
+        return np.zeros(0, np.int64)
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = np.maximum(x2 - x1, 0) * np.maximum(y2 - y1, 0)
+    order = np.argsort(-scores, kind='stable')
+    keep = []
+    while order.size and len(keep) < max_det:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        w = np.maximum(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0)
+        h = np.maximum(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0)
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_thres]
+    return np.asarray(keep, np.int64)
+
+
+def batched_nms(boxes, scores, class_ids, iou_thres=0.45, max_det=100):
+    """Per-class NMS in one pass: boxes of different classes are shifted apart so they never overlap."""
+    if len(scores) == 0:
+        return np.zeros(0, np.int64)
+    # span-based shift: decoded boxes are not clipped, so coordinates can be negative
+    offset = class_ids.astype(boxes.dtype)[:, None] * (boxes.max() - boxes.min() + 1.0)
+    return nms(boxes + offset, scores, iou_thres, max_det)
+
+
+def decode_yolo(pred, model_w, model_h, orig_w, orig_h, conf_thres=0.5, iou_thres=0.45, max_det=100):
+    """
+    Decode a YOLOv5-style output (N, 5 + num_classes): cx, cy, w, h, objectness, class probs
+    (in model input pixels) into Detections scaled to the original image.
+    score = objectness * best class prob, same as the old per-row loop.
+    """
+    data = np.asarray(pred)
+    if data.ndim == 3:
+        data = data[0]
+    # score <= objectness, so rows under the threshold can be dropped before argmax
+    data = data[data[:, 4] >= conf_thres]
+    if not len(data):
+        return Detections.empty()
+
+    cls_prob = data[:, 5:]
+    cls = cls_prob.argmax(axis=1)
+    scores = data[:, 4] * cls_prob[np.arange(len(data)), cls]
+    mask = scores >= conf_thres
+    data, cls, scores = data[mask], cls[mask], scores[mask]
+    if not len(data):
+        return Detections.empty()
+
+    sx = orig_w / float(model_w)
+    sy = orig_h / float(model_h)
+    half_w = data[:, 2] * 0.5
+    half_h = data[:, 3] * 0.5
+    boxes = np.stack([
+        (data[:, 0] - half_w) * sx,
+        (data[:, 1] - half_h) * sy,
+        (data[:, 0] + half_w) * sx,
+        (data[:, 1] + half_h) * sy,
+    ], axis=1)
+
+    keep = batched_nms(boxes, scores, cls, iou_thres, max_det)
+    # astype truncates toward zero like the old int() conversion
+    return Detections(boxes[keep].astype(np.int32), scores[keep].astype(np.float32), cls[keep].astype(np.int32))
@@ -0,0 +1,76 @@
+import cv2
+import numpy as np
+
+
+class Preprocessor:
+    """
+    BGR frame -> model input, written into a caller-provided buffer without per-frame
+    allocations. The frame is resized into a preallocated uint8 image, and one
+    cv2.split into reversed channel planes does BGR->RGB and HWC->CHW together.
+    Only the final pass touches the model dtype:
+      - float: x / 255
+      - quantized uint8/int8: x / 255 / scale + zero_point, via a 256-entry cv2.LUT
+        (a plain copy when that mapping is the identity)
+
+    input_shape: interpreter input shape, (1, 3, H, W) or (1, H, W, 3)
+    quantization: (scale, zero_point) from the input details; ignored for float inputs
+    """
+
+    def __init__(self, input_shape, dtype=np.float32, quantization=(0.0, 0)):
+        shape = tuple(int(v) for v in input_shape)
+        self.dtype = np.dtype(dtype)
+        self.nchw = shape[1] == 3 and shape[-1] != 3
+        if self.nchw:
+            self.model_h, self.model_w = shape[2], shape[3]
+        else:
+            self.model_h, self.model_w = shape[1], shape[2]
+
+        self._resized = np.empty((self.model_h, self.model_w, 3), np.uint8)
+        if self.nchw:
+            self._rgb = np.empty((3, self.model_h, self.model_w), np.uint8)
+            self._planes = [self._rgb[2], self._rgb[1], self._rgb[0]]
+        else:
+            self._rgb = np.empty((self.model_h, self.model_w, 3), np.uint8)
+
+        self.scale = np.float32(1.0 / 255.0)
+        self.lut = None if self.dtype.kind == 'f' else self._build_lut(quantization)
+        self.identity = self.lut is not None and np.array_equal(self.lut, np.arange(256))
+
+    def _build_lut(self, quantization):
+        scale, zero_point = quantization if quantization else (0.0, 0)
+        if not scale:
+            scale, zero_point = 1.0 / 255.0, 0
+        info = np.iinfo(self.dtype)
+        q = np.round(np.arange(256, dtype=np.float64) / 255.0 / scale + zero_point)
+        return np.clip(q, info.min, info.max).astype(self.dtype)
+
+    def new_buffer(self):
+        return np.empty((1,) + self._rgb.shape, self.dtype)
+
+    def fill(self, image, out):
+        """Write `image` (BGR uint8) into `out` (model input array or the interpreter's tensor view)."""
+        cv2.resize(image, (self.model_w, self.model_h), dst=self._resized)
+        if self.nchw:
+            cv2.split(self._resized, self._planes)
+        else:
+            cv2.cvtColor(self._resized, cv2.COLOR_BGR2RGB, dst=self._rgb)
+
+        dst = out[0]
+        if self.lut is None:
+            np.multiply(self._rgb, self.scale, out=dst, casting='unsafe')
+        elif self.identity:
+            np.copyto(dst, self._rgb, casting='unsafe')
+        else:
+            # cv2.LUT wants 2-D arrays; both sides are contiguous so reshape is a view
+            cv2.LUT(self._rgb.reshape(-1, self._rgb.shape[-1]), self.lut, dst=dst.reshape(-1, dst.shape[-1]))
+        return out
+
+
+def dequantize(tensor, quantization):
+    """Integer output tensor -> float32 using (scale, zero_point); float tensors pass through."""
+    if tensor.dtype.kind == 'f':
+        return tensor
+    scale, zero_point = quantization if quantization else (0.0, 0)
+    if not scale:
+        return tensor.astype(np.float32)
+    return (tensor.astype(np.float32) - zero_point) * scale
@@ -0,0 +1,49 @@
+"""Run with `python -m pytest src` from Drive_Control/."""
+import threading
+
+import numpy as np
+
+from .detection_worker import DetectionWorker
+
+
+class _Frames:
+    """FrameGrabber stand-in: a new frame every `wait_next` call."""
+
+    def __init__(self):
+        self.seq = 0
+
+    def wait_next(self, last_seq, timeout, copy=False, out=None):
+        self.seq += 1
+        return self.seq, np.zeros((4, 6, 3), dtype=np.uint8)
+
+
+class _Detector:
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def detect(self, image):
+        self.calls += 1
+        self.release.wait(2.0)
+        return [f"poi-{self.calls}"]
+
+
+def test_activate_drops_previous_result():
+    frames, detector = _Frames(), _Detector()
+    worker = DetectionWorker(detector, frames).start()
+    try:
+        worker.activate()
+        first = worker.wait_result(0, timeout=2.0)
+        assert first is not None
+        worker.deactivate()
+
+        detector.release.clear()  # hold the next inference until after activate()
+        worker.activate()
+        assert worker.latest() is None
+        assert worker.wait_result(0, timeout=0.1) is None
+        detector.release.set()
+        fresh = worker.wait_result(0, timeout=2.0)
+        assert fresh is not None and fresh.seq > first.seq
+    finally:
+        worker.stop()
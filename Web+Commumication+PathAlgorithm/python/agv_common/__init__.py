@@ -0,0 +1,3 @@
+"""
+Shared helpers for the Python nodes (ai_node, planner_node, webapp).
+"""
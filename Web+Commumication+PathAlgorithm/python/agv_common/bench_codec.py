@@ -0,0 +1,79 @@
+"""
+Path message serialization: dict-per-waypoint + stdlib json (old) vs agv_common.codec.
+
+    python -m agv_common.bench_codec --waypoints 2000 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable, List, Tuple
+
+from agv_common import codec
+
+
+def _route(n: int) -> List[Tuple[int, int]]:
+    # serpentine over a 100-wide grid
+    return [((i % 100) if (i // 100) % 2 == 0 else 99 - (i % 100), i // 100) for i in range(n)]
+
+
+def _header() -> dict:
+    return {
+        "frame": "map",
+        "resolution": 0.05,
+        "origin": {"x": 0.0, "y": 0.0},
+        "start_cell": {"x": 0, "y": 0},
+        "end_cell": {"x": 0, "y": 0},
+        "items": ["choco", "tissue", "vitamin"],
+        "order": ["tissue", "choco", "vitamin"],
+        "total_cost": 123.4,
+        "created_ms": 1720000000000,
+    }
+
+
+def _time(fn: Callable[[], object], rounds: int) -> float:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds * 1000.0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--waypoints", type=int, nargs="+", default=[500, 5000, 20000])
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+
+    print(f"codec backend: {codec.BACKEND}")
+    for n in args.waypoints:
+        cells = _route(n)
+        res = 0.05
+
+        def old() -> bytes:
+            msg = _header()
+            msg["waypoints_cell"] = [{"x": x, "y": y} for (x, y) in cells]
+            msg["waypoints"] = [{"x": x * res, "y": y * res} for (x, y) in cells]
+            return json.dumps(msg).encode("utf-8")
+
+        def new() -> bytes:
+            world = [(x * res, y * res) for (x, y) in cells]
+            return codec.splice(
+                codec.dumps(_header()),
+                {"waypoints_cell": codec.dumps_points(cells), "waypoints": codec.dumps_points(world)},
+            )
+
+        a, b = old(), new()
+        assert json.loads(a) == json.loads(b)
+        t_old, t_new = _time(old, args.rounds), _time(new, args.rounds)
+        t_lo, t_ln = _time(lambda: json.loads(a), args.rounds), _time(lambda: codec.loads(b), args.rounds)
+        print(
+            f"{n:>6} waypoints ({len(b) / 1024:.0f} KiB): "
+            f"encode {t_old:7.2f} -> {t_new:6.2f} ms ({t_old / t_new:4.1f}x), "
+            f"decode {t_lo:6.2f} -> {t_ln:6.2f} ms ({t_lo / t_ln:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Validation cost per message for the compiled schema validators.
+
+    python -m agv_common.bench_schemas --waypoints 500
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from agv_common.schemas import validate_items, validate_path
+
+
+def _items_payload():
+    return {"items": [{"name": "choco", "qty": 2}, {"name": "tissue", "qty": 1}], "timestamp_ms": 1720000000000}
+
+
+def _path_payload(n: int):
+    cells = [{"x": i % 40, "y": i // 40} for i in range(n)]
+    return {
+        "frame": "map",
+        "resolution": 0.05,
+        "origin": {"x": 0.0, "y": 0.0},
+        "start_cell": {"x": 0, "y": 0},
+        "end_cell": cells[-1],
+        "items": ["choco", "tissue"],
+        "order": ["tissue", "choco"],
+        "waypoints_cell": cells,
+        "waypoints": [{"x": c["x"] * 0.05, "y": c["y"] * 0.05} for c in cells],
+        "total_cost": float(n),
+        "created_ms": 1720000000000,
+    }
+
+
+def _bench(fn, payload, rounds: int) -> float:
+    fn(payload)  # compile outside the timing
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn(payload)
+    return (time.perf_counter() - t0) / rounds * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--waypoints", type=int, default=300)
+    ap.add_argument("--rounds", type=int, default=20000)
+    args = ap.parse_args()
+
+    items_us = _bench(validate_items, _items_payload(), args.rounds)
+    path_rounds = max(args.rounds // 20, 100)
+    path_us = _bench(validate_path, _path_payload(args.waypoints), path_rounds)
+    print(f"items (2 entries):        {items_us:8.2f} us/msg")
+    print(f"path ({args.waypoints} waypoints): {path_us:8.2f} us/msg")
+
+
+if __name__ == "__main__":
+    main()
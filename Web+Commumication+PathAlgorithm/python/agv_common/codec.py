@@ -0,0 +1,82 @@
+"""
+JSON codec for MQTT payloads: orjson or ujson when installed, stdlib json otherwise.
+
+`dumps` always returns compact UTF-8 bytes (non-ASCII kept as-is), `loads` accepts
+bytes or str. `dumps_points` encodes coordinate tuples straight into
+`[{"x":..,"y":..}, ...]` without building a dict per point, and `splice` appends
+such pre-encoded members to an encoded object.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, Sequence
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional
+    _orjson = None
+
+try:
+    import ujson as _ujson
+except ImportError:  # pragma: no cover - optional
+    _ujson = None
+
+if _orjson is not None:
+    BACKEND = "orjson"
+
+    def dumps(obj: Any) -> bytes:
+        return _orjson.dumps(obj)
+
+    def loads(data: Any) -> Any:
+        return _orjson.loads(data)
+
+elif _ujson is not None:
+    BACKEND = "ujson"
+
+    def dumps(obj: Any) -> bytes:
+        return _ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+
+    def loads(data: Any) -> Any:
+        return _ujson.loads(data)
+
+else:
+    BACKEND = "json"
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(data: Any) -> Any:
+        return json.loads(data)
+
+
+def dumps_points(points: Iterable[Sequence[float]], keys: Sequence[str] = ("x", "y")) -> bytes:
+    """
+    [(1, 2), (3, 4)] -> b'[{"x":1,"y":2},{"x":3,"y":4}]'.
+    Accepts tuples/lists (or a NumPy array via .tolist()); every point must have len(keys) values.
+    """
+    if hasattr(points, "tolist"):
+        points = points.tolist()
+    elif not isinstance(points, (list, tuple)):
+        points = list(points)
+    if not points:
+        return b"[]"
+    if len(keys) == 2:
+        # encode as nested arrays, then rewrite the separators: numbers never contain , [ ]
+        kx, ky = (f'"{k}":'.encode("utf-8") for k in keys)
+        raw = dumps(points)  # [[x,y],[x,y]]
+        raw = raw.replace(b"],[", b"\x00").replace(b",", b"," + ky).replace(b"\x00", b"},{" + kx)
+        return b"[{" + kx + raw[2:-2] + b"}]"
+    names = [f'"{k}":'.encode("utf-8") for k in keys]
+    out = []
+    for p in points:
+        out.append(b"{" + b",".join(n + dumps(v) for n, v in zip(names, p)) + b"}")
+    return b"[" + b",".join(out) + b"]"
+
+
+def splice(encoded_obj: bytes, members: Dict[str, bytes]) -> bytes:
+    """Append pre-encoded `"key": value` members to an encoded JSON object."""
+    if not members:
+        return encoded_obj
+    extra = b",".join(dumps(k) + b":" + v for k, v in members.items())
+    sep = b"" if encoded_obj == b"{}" else b","
+    return encoded_obj[:-1] + sep + extra + b"}"
@@ -0,0 +1,163 @@
+"""
+MQTT payload validators compiled once from `interfaces/schemas/*.schema.json`.
+
+fastjsonschema generates a Python function per schema. Large arrays of flat objects
+(path waypoints) are checked by a generated tight loop instead; the full validator
+only runs when that quick check fails, to produce the exact error message.
+See bench_schemas.py for per-message costs.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import fastjsonschema
+
+SCHEMA_DIR = Path(os.getenv("AGV_SCHEMA_DIR") or Path(__file__).resolve().parents[2] / "interfaces" / "schemas")
+
+ITEMS = "items"
+PATH = "path"
+
+_SCALAR_TYPES = {"number": "(int, float)", "integer": "(int,)", "string": "(str,)", "boolean": "(bool,)"}
+_BOUNDS = {"minimum": "<", "maximum": ">", "exclusiveMinimum": "<=", "exclusiveMaximum": ">="}
+
+
+class SchemaError(ValueError):
+    """Payload does not match its interface schema."""
+
+
+def load_schema(name: str) -> Dict[str, Any]:
+    path = SCHEMA_DIR / f"{name}.schema.json"
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _resolve(node: Dict[str, Any], root: Dict[str, Any]) -> Dict[str, Any]:
+    ref = node.get("$ref")
+    if not isinstance(ref, str) or not ref.startswith("#/"):
+        return node
+    for part in ref[2:].split("/"):
+        root = root[part]
+    return root
+
+
+def _compile_array_check(item: Dict[str, Any], root: Dict[str, Any]) -> Optional[Callable[[Any], bool]]:
+    """
+    Generate `check(arr) -> bool` for an array of flat objects with scalar fields.
+    Returns None if the item schema uses anything else. A True result implies the
+    full schema accepts the array; False only means "run the full validator".
+    """
+    item = _resolve(item, root)
+    if item.get("type") != "object" or set(item) - {"type", "additionalProperties", "required", "properties", "description"}:
+        return None
+    props = item.get("properties", {})
+    lines = [
+        "def check(arr):",
+        "    for it in arr:",
+        "        if type(it) is not dict:",
+        "            return False",
+        "        keys = it.keys()",
+    ]
+    if item.get("additionalProperties") is False:
+        lines += ["        if not keys <= ALLOWED:", "            return False"]
+    elif "additionalProperties" in item:
+        return None
+    if item.get("required"):
+        lines += ["        if not REQUIRED <= keys:", "            return False"]
+    for key, sub in props.items():
+        sub = _resolve(sub, root)
+        if sub.get("type") not in _SCALAR_TYPES or set(sub) - {"type", "description", *_BOUNDS}:
+            return None
+        # exact type() check keeps bool out of number/integer
+        lines += [f"        v = it.get({key!r}, MISSING)", "        if v is not MISSING:"]
+        lines += [f"            if type(v) not in {_SCALAR_TYPES[sub['type']]}:", "                return False"]
+        for kw, op in _BOUNDS.items():
+            if kw in sub:
+                lines += [f"            if v {op} {float(sub[kw])!r}:", "                return False"]
+    lines.append("    return True")
+    env: Dict[str, Any] = {
+        "ALLOWED": frozenset(props),
+        "REQUIRED": frozenset(item.get("required", [])),
+        "MISSING": object(),
+    }
+    exec("\n".join(lines), env)
+    return env["check"]
+
+
+class _CompiledSchema:
+    def __init__(self, schema: Dict[str, Any]):
+        self.full = fastjsonschema.compile(schema)
+        # header = schema without per-element checks for the arrays handled by fast loops
+        self.arrays: List[Tuple[str, Callable[[Any], bool]]] = []
+        header = copy.deepcopy(schema)
+        for key, sub in schema.get("properties", {}).items():
+            sub = _resolve(sub, schema)
+            if sub.get("type") != "array" or "items" not in sub:
+                continue
+            check = _compile_array_check(sub["items"], schema)
+            if check is not None:
+                self.arrays.append((key, check))
+                header["properties"][key] = {k: v for k, v in sub.items() if k != "items"}
+        self.header = fastjsonschema.compile(header) if self.arrays else self.full
+
+    def __call__(self, payload: Any) -> None:
+        self.header(payload)
+        for key, check in self.arrays:
+            arr = payload.get(key)
+            if arr is not None and not check(arr):
+                self.full(payload)  # raises with the precise location
+                return
+
+
+def _without(schema: Dict[str, Any], omit: Tuple[str, ...]) -> Dict[str, Any]:
+    variant = copy.deepcopy(schema)
+    variant["required"] = [k for k in variant.get("required", []) if k not in omit]
+    for k in omit:
+        variant.get("properties", {}).pop(k, None)
+    return variant
+
+
+_lock = threading.Lock()
+_validators: Dict[Tuple[str, Tuple[str, ...]], Callable[[Any], None]] = {}
+
+
+def get_validator(name: str, omit: Iterable[str] = ()) -> Callable[[Any], None]:
+    """
+    Compiled validator for `<name>.schema.json` (compiled on first use, then cached).
+    `omit` drops top-level properties, for checking a header whose large members are
+    encoded separately.
+    """
+    key = (name, tuple(sorted(omit)))
+    fn = _validators.get(key)
+    if fn is None:
+        with _lock:
+            fn = _validators.get(key)
+            if fn is None:
+                schema = load_schema(name)
+                fn = _validators[key] = _CompiledSchema(_without(schema, key[1]) if key[1] else schema)
+    return fn
+
+
+def validate(name: str, payload: Any, omit: Iterable[str] = ()) -> Any:
+    try:
+        get_validator(name, omit)(payload)
+    except fastjsonschema.JsonSchemaValueException as e:
+        raise SchemaError(f"{name} payload invalid: {e.message}") from None
+    return payload
+
+
+def validate_items(payload: Any) -> Any:
+    return validate(ITEMS, payload)
+
+
+def validate_path(payload: Any) -> Any:
+    return validate(PATH, payload)
+
+
+def validate_path_header(payload: Any) -> Any:
+    """Path message without `waypoints`/`waypoints_cell` (encoded separately from tuples)."""
+    return validate(PATH, payload, omit=("waypoints", "waypoints_cell"))
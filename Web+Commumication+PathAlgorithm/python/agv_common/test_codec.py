@@ -0,0 +1,28 @@
+"""Codec: run with `python -m pytest agv_common` from python/."""
+import numpy as np
+
+from .codec import dumps, dumps_points, loads, splice
+
+
+def test_dumps_points_matches_dict_encoding():
+    pts = [(1, 2), (-0.5, 3.25), (1e-05, 7)]
+    assert loads(dumps_points(pts)) == [{"x": x, "y": y} for x, y in pts]
+    assert loads(dumps_points(np.array(pts))) == [{"x": x, "y": y} for x, y in pts]
+    assert dumps_points([(4, 5)]) == b'[{"x":4,"y":5}]'
+    assert dumps_points([]) == b"[]"
+
+
+def test_dumps_points_other_keys():
+    pts = [(1, 2, 0.5), (3, 4, -0.5)]
+    assert loads(dumps_points(pts, keys=("x", "y", "theta"))) == [
+        {"x": x, "y": y, "theta": t} for x, y, t in pts
+    ]
+
+
+def test_splice_appends_members():
+    assert loads(splice(dumps({"frame": "map"}), {"waypoints": dumps_points([(0, 1)])})) == {
+        "frame": "map",
+        "waypoints": [{"x": 0, "y": 1}],
+    }
+    assert loads(splice(b"{}", {"n": b"1"})) == {"n": 1}
+    assert splice(b'{"a":1}', {}) == b'{"a":1}'
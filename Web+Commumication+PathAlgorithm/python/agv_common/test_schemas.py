@@ -0,0 +1,23 @@
+"""Schema validators: run with `python -m pytest agv_common` from python/."""
+import pytest
+
+from .schemas import SchemaError, validate_path
+
+
+def _path(waypoints):
+    return {"frame": "map", "waypoints": waypoints, "total_cost": 1.5, "created_ms": 0}
+
+
+def test_fast_path_accepts_valid_waypoints():
+    validate_path(_path([{"x": 0, "y": 0.5}, {"x": 1.0, "y": 2, "theta": 3.0}]))
+
+
+@pytest.mark.parametrize("waypoint", [
+    {"x": 0},                      # missing y
+    {"x": 0, "y": 0, "z": 1},      # unknown key
+    {"x": True, "y": 0},           # bool is not a number
+    {"x": 0, "y": 0, "theta": 4},  # out of range
+])
+def test_fast_path_falls_back_to_full_error(waypoint):
+    with pytest.raises(SchemaError, match="path payload invalid"):
+        validate_path(_path([{"x": 0, "y": 0}, waypoint]))
@@ -0,0 +1,97 @@
+"""
+Microbenchmark for keyword/quantity extraction in item_parser.
+
+    python bench_item_parser.py [--synonyms 5000] [--repeat 5]
+
+Compares the precompiled single-pass matcher with a per-keyword scan (the previous
+implementation) on the built-in keyword table and on a synthetic large catalog.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from typing import Dict, List
+
+try:  # script-mode support
+    from item_parser import _KEYWORDS, _NUM_WORDS, _KeywordMatcher
+except ImportError:
+    from .item_parser import _KEYWORDS, _NUM_WORDS, _KeywordMatcher
+
+
+def naive_scan(text: str, keywords: Dict[str, List[str]]) -> Dict[str, int]:
+    lower = text.lower()
+    out: Dict[str, int] = {}
+    for pid, kws in keywords.items():
+        qty = 0
+        for kw in kws:
+            kw_lower = kw.lower()
+            if kw_lower not in lower:
+                continue
+            qty = max(qty, lower.count(kw_lower))
+            for m in re.finditer(rf"{re.escape(kw_lower)}\s*개?\s*(\d+)", lower):
+                qty = max(qty, int(m.group(1)))
+            for word, val in _NUM_WORDS.items():
+                if re.search(rf"{re.escape(kw_lower)}\s*개?\s*{re.escape(word)}", lower):
+                    qty = max(qty, val)
+        if qty:
+            out[pid] = qty
+    return out
+
+
+def build_corpus(keywords: Dict[str, List[str]], n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    all_kws = [kw.strip() for kws in keywords.values() for kw in kws]
+    nums = ["하나", "두 개", "세개", "3개", "열", "", "2"]
+    tails = ["주세요", "찾아줘", "", "좀 줘"]
+    corpus = []
+    for _ in range(n):
+        parts = [f"{rng.choice(all_kws)} {rng.choice(nums)}" for _ in range(rng.randint(1, 3))]
+        corpus.append(" 그리고 ".join(parts) + " " + rng.choice(tails))
+    return corpus
+
+
+def synthetic_catalog(size: int, seed: int = 0) -> Dict[str, List[str]]:
+    rng = random.Random(seed)
+    syllables = [chr(c) for c in range(0xAC00, 0xAC00 + 2000, 7)]
+    catalog = {pid: list(kws) for pid, kws in _KEYWORDS.items()}
+    for i in range(size):
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        catalog.setdefault(f"item_{i // 3}", []).append(name)
+    return catalog
+
+
+def bench(label: str, fn, corpus: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - t0)
+    per_utt_us = best / len(corpus) * 1e6
+    print(f"  {label:<22} {per_utt_us:10.1f} us/utterance")
+    return per_utt_us
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="item_parser keyword matcher benchmark")
+    ap.add_argument("--utterances", type=int, default=500)
+    ap.add_argument("--synonyms", type=int, default=5000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    for label, catalog in (("built-in", _KEYWORDS), (f"synthetic {args.synonyms}", synthetic_catalog(args.synonyms))):
+        n_kws = sum(len(v) for v in catalog.values())
+        corpus = build_corpus(catalog, args.utterances)
+        t0 = time.perf_counter()
+        matcher = _KeywordMatcher(catalog, _NUM_WORDS)
+        compile_ms = (time.perf_counter() - t0) * 1000
+        print(f"[{label}] keywords={n_kws} utterances={len(corpus)} compile={compile_ms:.1f} ms")
+        naive = bench("per-keyword scan", lambda t: naive_scan(t, catalog), corpus, args.repeat)
+        fast = bench("compiled matcher", lambda t: matcher.aggregate(matcher.scan(t.lower())), corpus, args.repeat)
+        print(f"  speedup x{naive / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Offline parser evaluation over logged utterances.
+
+Input: a text file (one utterance per line) or JSONL with {"text": ..., "expected": [{"name", "qty"}]}.
+
+    python eval_parser.py utterances.jsonl --allowed choco,tissue,vitamin --out parsed.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:  # script-mode support
+    from item_parser import parse_items_batch
+except ImportError:
+    from .item_parser import parse_items_batch
+
+
+def load_utterances(path: Path) -> Tuple[List[str], List[Optional[List[Dict[str, Any]]]]]:
+    texts: List[str] = []
+    expected: List[Optional[List[Dict[str, Any]]]] = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                row = json.loads(line)
+                texts.append(str(row.get("text", "")))
+                expected.append(row.get("expected"))
+            else:
+                texts.append(line)
+                expected.append(None)
+    return texts, expected
+
+
+def _as_set(items: List[Dict[str, Any]]) -> set:
+    return {(str(it.get("name")), int(it.get("qty", 1))) for it in items}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Batch-parse logged utterances and score against expected items")
+    ap.add_argument("input", help="utterance .txt or .jsonl")
+    ap.add_argument("--allowed", default="", help="comma-separated allowed item ids")
+    ap.add_argument("--batch-size", type=int, default=None)
+    ap.add_argument("--workers", type=int, default=4, help="parallel LLM prompts")
+    ap.add_argument("--out", default=None, help="write {text, result} JSONL here")
+    args = ap.parse_args()
+
+    texts, expected = load_utterances(Path(args.input))
+    allowed = [x.strip() for x in args.allowed.split(",") if x.strip()]
+
+    t0 = time.perf_counter()
+    out = parse_items_batch(texts, allowed, batch_size=args.batch_size, max_workers=args.workers)
+    elapsed = time.perf_counter() - t0
+    results = out["results"]
+
+    scored = correct = 0
+    for res, exp in zip(results, expected):
+        if exp is None:
+            continue
+        scored += 1
+        if "items" in res and _as_set(res["items"]) == _as_set(exp):
+            correct += 1
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            for text, res in zip(texts, results):
+                f.write(json.dumps({"text": text, "result": res}, ensure_ascii=False) + "\n")
+
+    print(f"[eval_parser] {out['stats']} in {elapsed:.1f}s")
+    if scored:
+        print(f"[eval_parser] exact-match accuracy: {correct}/{scored} = {correct / scored:.3f}")
+
+
+if __name__ == "__main__":
+    main()
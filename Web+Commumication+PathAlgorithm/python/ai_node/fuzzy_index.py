@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import heapq
+from collections import defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 한글 음절 -> 자모 분해 (초성/중성/종성, 호환 자모)
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = ["", *"ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"]
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+
+
+def decompose_hangul(text: str) -> str:
+    """'초코' -> 'ㅊㅗㅋㅗ'. Non-Hangul characters are kept as-is."""
+    out: List[str] = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            idx = code - _HANGUL_BASE
+            out.append(_CHO[idx // 588])
+            out.append(_JUNG[(idx % 588) // 28])
+            out.append(_JONG[idx % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _normalize(name: str) -> str:
+    return decompose_hangul(name.strip().lower())
+
+
+def _trigrams(s: str) -> List[str]:
+    padded = f"^{s}$"
+    return [padded[i : i + 3] for i in range(max(len(padded) - 2, 1))]
+
+
+class FuzzyIndex:
+    """
+    Character-trigram inverted index over a fixed name list (Hangul decomposed into jamo).
+    Only the few names sharing the most trigrams with the query are scored with
+    SequenceMatcher, so lookups don't scale with the catalog size.
+    """
+
+    def __init__(self, names: Iterable[str], max_candidates: int = 8):
+        self.max_candidates = max_candidates
+        self.by_lower: Dict[str, str] = {}
+        self._keys: List[str] = []
+        self._norm: List[str] = []
+        self._grams: Dict[str, List[int]] = defaultdict(list)
+        self._chars: Dict[str, List[int]] = defaultdict(list)
+
+        for name in names:
+            lower = name.strip().lower()
+            if not lower or lower in self.by_lower:
+                continue
+            self.by_lower[lower] = name
+            i = len(self._keys)
+            self._keys.append(lower)
+            norm = _normalize(lower)
+            self._norm.append(norm)
+            for g in set(_trigrams(norm)):
+                self._grams[g].append(i)
+            for c in set(norm):
+                self._chars[c].append(i)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _candidates(self, norm: str) -> List[int]:
+        counts: Dict[int, int] = defaultdict(int)
+        for g in set(_trigrams(norm)):
+            for i in self._grams.get(g, ()):
+                counts[i] += 1
+        if not counts:
+            # 공유 trigram이 없으면 공유 문자(자모) 기준으로 후보를 고른다
+            for c in set(norm):
+                for i in self._chars.get(c, ()):
+                    counts[i] += 1
+        top = heapq.nlargest(self.max_candidates, counts.items(), key=lambda kv: kv[1])
+        return [i for i, _ in top]
+
+    def best(self, query: str, cutoff: float = 0.55) -> Optional[str]:
+        """Closest original name with similarity >= cutoff (exact matches first)."""
+        lower = query.strip().lower()
+        if lower in self.by_lower:
+            return self.by_lower[lower]
+        norm = _normalize(lower)
+        best_i, best_score = -1, -1.0
+        matcher = SequenceMatcher()
+        matcher.set_seq2(norm)
+        floor = max(cutoff, 0.0)
+        for i in self._candidates(norm):
+            matcher.set_seq1(self._norm[i])
+            # cheap upper bounds first (same trick as difflib.get_close_matches)
+            bound = max(best_score, floor)
+            if best_i >= 0 and (matcher.real_quick_ratio() <= bound or matcher.quick_ratio() <= bound):
+                continue
+            score = matcher.ratio()
+            if score > best_score:
+                best_i, best_score = i, score
+        if best_i < 0 or best_score < cutoff:
+            return None
+        return self.by_lower[self._keys[best_i]]
+
+
+@lru_cache(maxsize=8)
+def _cached_index(names: Tuple[str, ...]) -> FuzzyIndex:
+    return FuzzyIndex(names)
+
+
+def get_fuzzy_index(names: Iterable[str]) -> FuzzyIndex:
+    """Build (once per distinct POI set) and return the fuzzy index for `names`."""
+    return _cached_index(tuple(names))
@@ -2,16 +2,29 @@ from __future__ import annotations
 
 import json
 import re
+import sys
+import threading
 import time
-from difflib import get_close_matches
-from typing import Any, Dict, Iterable, List, Optional
-
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
 try:  # script-mode support
-    from openai_utils import optional_env, require_env
+    from fuzzy_index import get_fuzzy_index
+    from openai_utils import get_client, optional_env
+    from parse_cache import get_parse_cache, normalize_utterance
 except ImportError:
-    from .openai_utils import optional_env, require_env
+    from .fuzzy_index import get_fuzzy_index
+    from .openai_utils import get_client, optional_env
+    from .parse_cache import get_parse_cache, normalize_utterance
+
+try:
+    from agv_common.schemas import validate_items
+except ImportError:  # run from ai_node/: make `python/` importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from agv_common.schemas import validate_items
 
 
 _ITEMS_JSON_SCHEMA: Dict[str, Any] = {
@@ -80,29 +93,176 @@ _NUM_WORDS = {
     "10": 10,
 }
 
+# fast path에서 "설명된" 것으로 보는 단위/조사/요청 표현
+_COUNTER_WORDS = ["개", "병", "통", "팩", "박스", "봉지"]
+# 키워드와 수량 사이에 올 수 있는 조사/군말 ("초코를 두 개", "휴지 좀 두 개")
+_PARTICLE_WORDS = ["을", "를", "은", "는", "이", "가", "도", "좀", "만"]
+_FILLER_WORDS = [
+    "주세요", "줘요", "줘", "찾아줘", "찾아", "사줘", "가져다줘", "갖다줘", "담아줘", "필요해", "필요해요",
+    "그리고", "하고", "이랑", "랑", "와", "과", "도", "을", "를", "이", "가", "요", "좀", "만", "씩",
+]
+
+
+def _alternation(words: Iterable[str]) -> str:
+    return "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+
+
+_EXPLAINED_TOKEN_RE = re.compile(
+    rf"^(?:{_alternation(_NUM_WORDS)}|\d+)?(?:{_alternation(_COUNTER_WORDS)})?(?:{_alternation(_FILLER_WORDS)})*$"
+)
+# 수량어로 시작하는 토큰 ("두", "2개", "세개씩")
+_QUANTITY_TOKEN_RE = re.compile(
+    rf"^(?:{_alternation(_NUM_WORDS)}|\d+)(?:{_alternation(_COUNTER_WORDS)})?(?:{_alternation(_FILLER_WORDS)})*$"
+)
+_TOKEN_RE = re.compile(r"[0-9a-z가-힣]+")
+# 부정/제외 표현 ("비타민 말고 초코")은 keyword 매칭으로 처리할 수 없으므로 항상 LLM으로 보낸다
+_NEGATION_RE = re.compile(
+    r"말고|빼고|제외|없|(?:^|[^0-9a-z가-힣])안|\b(?:not|no|except|without|don't|dont)\b"
+)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a prefix-factored regex (trie) for a set of literals, e.g. 초코|초콜릿 -> 초(?:코|콜릿).
+    Matching cost then depends on the text length, not on the number of synonyms.
+    """
+    trie: Dict[str, Any] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict[str, Any]) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node:
+            # greedy optional group -> longest keyword wins
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+@dataclass
+class _KeywordHit:
+    count: int = 0  # occurrences of this keyword
+    qty: int = 0  # largest explicit quantity right after it
+    first_pos: int = -1
+
+
+class _KeywordMatcher:
+    """All keywords and trailing quantity words compiled into one regex, scanned once per text."""
+
+    def __init__(self, keywords: Mapping[str, Iterable[str]], num_words: Mapping[str, int]):
+        self.kw_to_ids: Dict[str, List[str]] = {}
+        for pid, kws in keywords.items():
+            for kw in kws:
+                self.kw_to_ids.setdefault(kw.lower(), []).append(pid)
+        self.num_words = dict(num_words)
+        # 긴 키워드 안에 포함된 짧은 키워드(섀도우 ⊃ 섀도)도 str.count 처럼 함께 센다
+        self.nested: Dict[str, List[Tuple[str, int]]] = {}
+        for kw in self.kw_to_ids:
+            subs = {kw[i:j] for i in range(len(kw)) for j in range(i + 1, len(kw) + 1)} - {kw}
+            self.nested[kw] = [(sub, kw.count(sub)) for sub in subs if sub in self.kw_to_ids]
+        kw_pat = _trie_pattern(self.kw_to_ids)
+        num_pat = _trie_pattern(w for w in self.num_words if not w.isdigit())
+        self.keyword_re = re.compile(kw_pat)
+        # 수량은 키워드 뒤쪽(조사/군말, 개 허용)에 붙은 것만 인식
+        gap = rf"(?:\s|{_alternation(_PARTICLE_WORDS)})*"
+        self.item_re = re.compile(rf"(?P<kw>{kw_pat})(?:{gap}개?\s*(?P<qty>\d+|{num_pat}))?")
+
+    def scan(self, lower_text: str) -> Dict[str, _KeywordHit]:
+        hits: Dict[str, _KeywordHit] = {}
+        for m in self.item_re.finditer(lower_text):
+            kw = m.group("kw")
+            hit = hits.get(kw)
+            if hit is None:
+                hit = hits[kw] = _KeywordHit(first_pos=m.start())
+            hit.count += 1
+            for sub, n in self.nested[kw]:
+                sub_hit = hits.get(sub)
+                if sub_hit is None:
+                    sub_hit = hits[sub] = _KeywordHit(first_pos=m.start())
+                sub_hit.count += n
+            q = m.group("qty")
+            if q:
+                hit.qty = max(hit.qty, int(q) if q.isdigit() else self.num_words[q])
+        return hits
+
+    def aggregate(self, hits: Mapping[str, _KeywordHit], allowed: Optional[set] = None) -> Dict[str, _KeywordHit]:
+        """Per item id: max keyword count, max explicit quantity, first position."""
+        out: Dict[str, _KeywordHit] = {}
+        for kw, hit in hits.items():
+            for pid in self.kw_to_ids[kw]:
+                if allowed is not None and pid not in allowed:
+                    continue
+                agg = out.get(pid)
+                if agg is None:
+                    out[pid] = _KeywordHit(hit.count, hit.qty, hit.first_pos)
+                    continue
+                agg.count = max(agg.count, hit.count)
+                agg.qty = max(agg.qty, hit.qty)
+                agg.first_pos = min(agg.first_pos, hit.first_pos)
+        return out
+
+
+_MATCHER = _KeywordMatcher(_KEYWORDS, _NUM_WORDS)
+
+
+@lru_cache(maxsize=256)
+def _scan_text(text: str) -> Dict[str, _KeywordHit]:
+    # callers must treat the result as read-only (it is shared through the cache)
+    return _MATCHER.scan(text.lower())
+
+_stats_lock = threading.Lock()
+_stats = {"fast_path_hits": 0, "fast_path_misses": 0}
+
+
+def _fast_parse_min_confidence(override: Optional[float]) -> float:
+    if override is not None:
+        return float(override)
+    raw = optional_env("AGV_FAST_PARSE_MIN_CONFIDENCE", "0.9")
+    try:
+        return float(raw)
+    except ValueError:
+        return 0.9
+
+
+def _record_fast_path(hit: bool) -> None:
+    with _stats_lock:
+        _stats["fast_path_hits" if hit else "fast_path_misses"] += 1
+
+
+def parser_stats() -> Dict[str, Any]:
+    """Fast-path counters (hit = answered without calling the API) and response-cache stats."""
+    with _stats_lock:
+        stats: Dict[str, Any] = dict(_stats)
+    total = stats["fast_path_hits"] + stats["fast_path_misses"]
+    stats["fast_path_hit_rate"] = (stats["fast_path_hits"] / total) if total else 0.0
+    stats["cache"] = get_parse_cache().stats()
+    return stats
+
 
 def _normalize_items_to_allowed(items: List[Dict[str, Any]], allowed: Iterable[str]) -> List[Dict[str, Any]]:
     allowed_list = list(allowed)
     if not allowed_list:
         return items
 
-    allowed_lower = {name.lower(): name for name in allowed_list}
+    # exact (case-insensitive) lookup, then fuzzy match to nearest POI id via the cached index
+    index = get_fuzzy_index(allowed_list)
     normalized: List[Dict[str, Any]] = []
     unmatched: List[str] = []
     for it in items:
         raw = str(it.get("name") or "").strip()
         if not raw:
             continue
-        lower = raw.lower()
-        if lower in allowed_lower:
-            canonical = allowed_lower[lower]
-        else:
-            # fuzzy match to nearest POI id
-            matches = get_close_matches(lower, allowed_lower.keys(), n=1, cutoff=0.55)
-            if not matches:
-                unmatched.append(raw)
-                continue
-            canonical = allowed_lower[matches[0]]
+        canonical = index.best(raw, cutoff=0.55)
+        if canonical is None:
+            unmatched.append(raw)
+            continue
         qty = it.get("qty", 1)
         try:
             qty = int(qty)
@@ -115,11 +275,9 @@ def _normalize_items_to_allowed(items: List[Dict[str, Any]], allowed: Iterable[s
     # If everything was unmatched, try a more permissive match to avoid empty results.
     if not normalized and unmatched:
         for raw in unmatched:
-            lower = raw.lower()
-            matches = get_close_matches(lower, allowed_lower.keys(), n=1, cutoff=0.0)
-            if not matches:
+            canonical = index.best(raw, cutoff=0.0)
+            if canonical is None:
                 continue
-            canonical = allowed_lower[matches[0]]
             normalized.append({"name": canonical, "qty": 1})
 
     return normalized
@@ -129,60 +287,98 @@ def _heuristic_items_from_text(text: str, allowed: Iterable[str]) -> List[Dict[s
     allowed_set = set(allowed)
     if not allowed_set:
         return []
-    lower_text = text.lower()
-    items: List[Dict[str, Any]] = []
-    for pid, kws in _KEYWORDS.items():
-        if pid not in allowed_set:
-            continue
-        count = 0
-        for kw in kws:
-            if kw.lower() in lower_text:
-                count = max(count, lower_text.count(kw.lower()))
-        if count > 0:
-            items.append({"name": pid, "qty": count})
-    return items
+    hits = _MATCHER.aggregate(_scan_text(text), allowed_set)
+    # 발화에 나온 순서대로
+    ordered = sorted(hits.items(), key=lambda kv: kv[1].first_pos)
+    return [{"name": pid, "qty": hit.count} for pid, hit in ordered]
 
 
 def _detect_quantity(text: str, keywords: List[str]) -> int:
     if not keywords:
         return 0
-    lower = text.lower()
+    hits = _scan_text(text)
     qty = 0
     for kw in keywords:
-        kw_lower = kw.lower()
-        # 키워드 + 숫자 패턴 (수량은 키워드 뒤쪽에 붙은 것으로만 계산)
-        for m in re.finditer(rf"{re.escape(kw_lower)}\s*개?\s*(\d+)", lower):
-            try:
-                qty = max(qty, int(m.group(1)))
-            except Exception:
-                pass
-        # 한글 수량어는 키워드 뒤쪽에서만 인식
-        for word, val in _NUM_WORDS.items():
-            if re.search(rf"{re.escape(kw_lower)}\s*개?\s*{re.escape(word)}", lower):
-                qty = max(qty, val)
-        # 키워드 출현 횟수로 보정
-        for kw in keywords:
-            count = lower.count(kw.lower())
-            if count > qty:
-                qty = count
+        hit = hits.get(kw.lower())
+        if hit is not None:
+            # 키워드 뒤 수량(숫자/한글 수량어)과 키워드 출현 횟수 중 큰 값
+            qty = max(qty, hit.qty, hit.count)
     return qty
 
 
-def parse_items_from_text(text: str, allowed_names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+def _fast_path_confidence(text: str) -> float:
     """
-    Use an LLM to parse a user utterance into the project's `items` JSON.
+    Fraction of the utterance explained by keywords, quantity words and fillers.
+    1.0 means every token was understood; anything unknown lowers the score.
+    Negation/exclusion words give 0.0, since the keyword hits would include excluded items,
+    and so does a quantity word not attached to a keyword ("두 개 초코"), which the scan
+    would otherwise drop silently.
+    """
+    lower = text.lower()
+    if _NEGATION_RE.search(lower):
+        return 0.0
+    if any(_QUANTITY_TOKEN_RE.match(t) for t in _TOKEN_RE.findall(_MATCHER.item_re.sub(" ", lower))):
+        return 0.0
+    total = sum(len(t) for t in _TOKEN_RE.findall(lower))
+    if total == 0:
+        return 0.0
+    lower = _MATCHER.keyword_re.sub(" ", lower)
+    unexplained = sum(len(t) for t in _TOKEN_RE.findall(lower) if not _EXPLAINED_TOKEN_RE.match(t))
+    return 1.0 - unexplained / total
+
+
+def _fast_parse_items(text: str, allowed: Iterable[str]) -> Tuple[List[Dict[str, Any]], float]:
+    """Deterministic keyword parser. Returns (items, confidence)."""
+    allowed_list = list(allowed) or list(_KEYWORDS)
+    items = _heuristic_items_from_text(text, allowed_list)
+    if not items:
+        return [], 0.0
+    for it in items:
+        detected = _detect_quantity(text, _KEYWORDS.get(it["name"], []))
+        if detected > 0:
+            it["qty"] = detected
+    if len(items) > 1 and "씩" in text:
+        # "초코랑 비타민 두 개씩": the quantity applies to every item, not only the last one
+        return items, 0.0
+    return items, _fast_path_confidence(text)
+
+
+def parse_items_from_text(
+    text: str,
+    allowed_names: Optional[Iterable[str]] = None,
+    *,
+    min_confidence: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Parse a user utterance into the project's `items` JSON.
+
+    Simple utterances covered by `_KEYWORDS`/`_NUM_WORDS` are answered locally when the
+    fast-path confidence reaches `min_confidence` (default: env AGV_FAST_PARSE_MIN_CONFIDENCE
+    or 0.9; a value > 1 disables the fast path). Everything else goes to the LLM, with
+    results cached per normalized utterance + allowed names + model (see parse_cache.py).
 
     Example input:
       "콜라 1개, 라면 2개 주세요"
     """
-    api_key = require_env("OPENAI_API_KEY")
+    created_ms = int(time.time() * 1000)
+    allowed_list = list(allowed_names or [])
+
+    fast_items, confidence = _fast_parse_items(text, allowed_list)
+    if fast_items and confidence >= _fast_parse_min_confidence(min_confidence):
+        _record_fast_path(True)
+        return {"items": fast_items, "timestamp_ms": created_ms}
+    _record_fast_path(False)
+
     model = optional_env("OPENAI_PARSE_MODEL", "gpt-4o-mini")
+    cache = get_parse_cache()
+    cache_key = cache.make_key(text, allowed_list, model)
+    cached = cache.get(cache_key)
+    if cached:
+        return {"items": cached, "timestamp_ms": created_ms}
 
-    client = OpenAI(api_key=api_key)
-    created_ms = int(time.time() * 1000)
+    client = get_client()
 
     allowed_hint = ""
-    allowed_list = list(allowed_names or [])
     if allowed_list:
         allowed_hint = (
             "You must choose item names ONLY from this allowed list (case-insensitive): "
@@ -220,8 +416,15 @@ def parse_items_from_text(text: str, allowed_names: Optional[Iterable[str]] = No
 
     if not isinstance(data, dict) or "items" not in data:
         raise RuntimeError("Failed to parse items JSON from model output")
-    items = data.get("items", [])
-    cleaned = _normalize_items_to_allowed(items, allowed_list)
+    cleaned = _finalize_llm_items(text, data.get("items", []), allowed_list)
+
+    cache.put(cache_key, cleaned)
+    return {"items": cleaned, "timestamp_ms": created_ms}
+
+
+def _finalize_llm_items(text: str, items: Any, allowed_list: List[str]) -> List[Dict[str, Any]]:
+    """Map model output onto allowed ids and fix quantities from the text."""
+    cleaned = _normalize_items_to_allowed(items if isinstance(items, list) else [], allowed_list)
 
     if not cleaned:
         cleaned = _heuristic_items_from_text(text, allowed_list)
@@ -236,20 +439,150 @@ def parse_items_from_text(text: str, allowed_names: Optional[Iterable[str]] = No
 
     if not cleaned:
         raise RuntimeError("No valid items parsed from text")
+    return cleaned
 
-    return {"items": cleaned, "timestamp_ms": created_ms}
+
+def _llm_parse_batch(texts: List[str], allowed_list: List[str], model: str) -> Dict[int, Any]:
+    """One chat completion for several utterances. Returns {index: raw items} for the answered ones."""
+    allowed_hint = ""
+    if allowed_list:
+        allowed_hint = (
+            "You must choose item names ONLY from this allowed list (case-insensitive): "
+            + ", ".join(allowed_list)
+            + ". Do not invent new names. If you are unsure, pick the closest allowed name.\n"
+        )
+    numbered = "\n".join(f"[{i}] {t}" for i, t in enumerate(texts))
+    prompt = (
+        "You are an assistant that extracts a shopping list from each of several independent utterances.\n"
+        'Return ONLY valid JSON of the form {"results": [{"index": <n>, "items": [{"name": <id>, "qty": <int>}]}]} '
+        "with exactly one result per utterance.\n"
+        "Rules:\n"
+        "- Use the allowed item ids, do not create new names.\n"
+        "- Normalize item names into short lowercase ids when possible (e.g., coke, ramen).\n"
+        "- If quantity is missing, assume qty=1.\n"
+        "- Utterances are independent; never merge items across them.\n"
+        f"{allowed_hint}"
+        "\n"
+        f"Utterances:\n{numbered}\n"
+    )
+    completion = get_client().chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": "Extract one shopping list per utterance as JSON."},
+            {"role": "user", "content": prompt},
+        ],
+        response_format={"type": "json_object"},
+        temperature=0.2,
+    )
+    data = json.loads(completion.choices[0].message.content or "{}")
+    out: Dict[int, Any] = {}
+    for res in data.get("results", []) if isinstance(data, dict) else []:
+        if isinstance(res, dict) and isinstance(res.get("index"), int) and 0 <= res["index"] < len(texts):
+            out[res["index"]] = res.get("items", [])
+    return out
+
+
+def parse_items_batch(
+    texts: Iterable[str],
+    allowed_names: Optional[Iterable[str]] = None,
+    *,
+    batch_size: Optional[int] = None,
+    max_workers: int = 4,
+    min_confidence: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Parse many utterances. Duplicates (after `normalize_utterance`) are parsed once; the fast
+    path and the response cache run first, and only the remaining utterances are sent to the
+    LLM, `batch_size` per prompt (default env AGV_PARSE_BATCH_SIZE or 20), prompts in parallel.
+
+    Returns {"results": [...], "stats": {...}} with results aligned to `texts`: an items
+    payload per utterance, or {"error": "..."} for the ones that could not be parsed.
+    """
+    created_ms = int(time.time() * 1000)
+    texts = list(texts)
+    allowed_list = list(allowed_names or [])
+    size = max(int(batch_size or optional_env("AGV_PARSE_BATCH_SIZE", "20")), 1)
+    threshold = _fast_parse_min_confidence(min_confidence)
+    model = optional_env("OPENAI_PARSE_MODEL", "gpt-4o-mini")
+    cache = get_parse_cache()
+
+    # normalized utterance -> indices in `texts`
+    groups: Dict[str, List[int]] = {}
+    for i, text in enumerate(texts):
+        groups.setdefault(normalize_utterance(text), []).append(i)
+
+    resolved: Dict[str, Dict[str, Any]] = {}
+    todo: List[Tuple[str, str, str]] = []  # (normalized, text, cache key)
+    n_fast = n_cached = 0
+    for norm, idxs in groups.items():
+        text = texts[idxs[0]]
+        if not norm:
+            resolved[norm] = {"error": "empty utterance"}
+            continue
+        items, confidence = _fast_parse_items(text, allowed_list)
+        if items and confidence >= threshold:
+            _record_fast_path(True)
+            resolved[norm] = {"items": items}
+            n_fast += 1
+            continue
+        _record_fast_path(False)
+        key = cache.make_key(text, allowed_list, model)
+        cached = cache.get(key)
+        if cached:
+            resolved[norm] = {"items": cached}
+            n_cached += 1
+            continue
+        todo.append((norm, text, key))
+
+    chunks = [todo[i : i + size] for i in range(0, len(todo), size)]
+
+    def run_chunk(chunk: List[Tuple[str, str, str]]) -> None:
+        try:
+            answers = _llm_parse_batch([t for _, t, _ in chunk], allowed_list, model)
+        except Exception as exc:
+            for norm, _, _ in chunk:
+                resolved[norm] = {"error": f"LLM batch failed: {exc}"}
+            return
+        for i, (norm, text, key) in enumerate(chunk):
+            if i not in answers:
+                resolved[norm] = {"error": "missing from model output"}
+                continue
+            try:
+                cleaned = _finalize_llm_items(text, answers[i], allowed_list)
+            except Exception as exc:
+                resolved[norm] = {"error": str(exc)}
+                continue
+            cache.put(key, cleaned)
+            resolved[norm] = {"items": cleaned}
+
+    if chunks:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+            list(pool.map(run_chunk, chunks))
+
+    results: List[Dict[str, Any]] = [{}] * len(texts)
+    for norm, idxs in groups.items():
+        res = resolved[norm]
+        for i in idxs:
+            if "items" in res:
+                results[i] = {"items": [dict(it) for it in res["items"]], "timestamp_ms": created_ms}
+            else:
+                results[i] = dict(res)
+
+    stats = {
+        "total": len(texts),
+        "unique": len(groups),
+        "fast_path": n_fast,
+        "cached": n_cached,
+        "llm": len(todo),
+        "llm_calls": len(chunks),
+        "errors": sum(1 for r in results if "error" in r),
+    }
+    return {"results": results, "stats": stats}
 
 
 def validate_items_payload(payload: Dict[str, Any]) -> None:
-    items = payload.get("items")
-    if not isinstance(items, list) or not items:
-        raise ValueError("items must be a non-empty list")
-    for it in items:
-        if not isinstance(it, dict):
-            raise ValueError("each item must be an object")
-        name = it.get("name")
-        qty = it.get("qty")
-        if not isinstance(name, str) or not name.strip():
+    """Check against interfaces/schemas/items.schema.json (raises SchemaError, a ValueError)."""
+    validate_items(payload)
+    for it in payload["items"]:
+        if not it["name"].strip():
             raise ValueError("item.name must be a non-empty string")
-        if not isinstance(qty, int) or qty < 1:
-            raise ValueError("item.qty must be an int >= 1")
@@ -1,5 +1,6 @@
 import argparse
 import json
+import logging
 import time
 from pathlib import Path
 
@@ -58,20 +59,87 @@ def connect_client(cfg: dict):
     return client
 
 
+def stream_items(source: str, cfg: dict, topic: str, backend_name=None, sample_rate: int = 16000) -> None:
+    """Transcribe + parse utterances from a live audio stream and publish each one as soon as it is parsed."""
+    try:
+        from streaming import StreamingTranscriber, get_backend, iter_pcm_chunks
+    except ImportError:
+        from .streaming import StreamingTranscriber, get_backend, iter_pcm_chunks
+
+    client = connect_client(cfg)
+    client.loop_start()
+
+    def on_items(text: str, payload: dict) -> None:
+        validate_items_payload(payload)
+        print(f"[ai_node] '{text}' -> publishing to {topic}: {payload}")
+        client.publish(topic, json.dumps(payload))
+
+    def on_error(exc: Exception) -> None:
+        print(f"[ai_node] segment failed: {exc}")
+
+    stream = StreamingTranscriber(
+        get_backend(backend_name),
+        sample_rate=sample_rate,
+        on_transcript=lambda text: print(f"[ai_node] transcript: {text}"),
+        on_items=on_items,
+        on_error=on_error,
+    )
+    try:
+        for chunk in iter_pcm_chunks(source, sample_rate=sample_rate):
+            stream.feed(chunk)
+    finally:
+        stream.close()
+        client.loop_stop()
+        client.disconnect()
+
+
+def run_daemon(cfg: dict, workers: int, max_pending: int, socket_addr=None, allowed_names=None) -> None:
+    """Stay connected and serve utterance/audio jobs (see node_daemon.py for the job format)."""
+    # not "daemon": that name belongs to the python-daemon package in script mode
+    try:
+        from node_daemon import AiNodeDaemon
+    except ImportError:
+        from .node_daemon import AiNodeDaemon
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] ai_node: %(message)s")
+    node = AiNodeDaemon(cfg, max_workers=workers, max_pending=max_pending, allowed_names=allowed_names)
+    if socket_addr:
+        node.serve_socket(socket_addr)
+    node.run()
+
+
 def publish_items():
     parser = argparse.ArgumentParser(description="AI Node (items publisher)")
     parser.add_argument("--text", help="Utterance text to parse into items JSON")
     parser.add_argument("--audio", help="Audio file path to transcribe then parse into items JSON")
     parser.add_argument("--sample", action="store_true", help="Publish sample items from data/samples/items_example.json")
+    parser.add_argument("--stream", help="Stream 16-bit mono PCM from a .wav/raw file or '-' (stdin) and publish per utterance")
+    parser.add_argument("--stt-backend", default=None, help="Streaming STT backend: openai | faster_whisper | stub")
+    parser.add_argument("--sample-rate", type=int, default=16000, help="Sample rate of the --stream audio")
+    parser.add_argument("--daemon", action="store_true", help="Stay connected and serve jobs from topics.ai_request")
+    parser.add_argument("--workers", type=int, default=4, help="Daemon: concurrent jobs")
+    parser.add_argument("--max-pending", type=int, default=16, help="Daemon: queued jobs before rejecting with 'busy'")
+    parser.add_argument("--socket", default=None, help="Daemon: also accept JSON-line jobs on host:port or a Unix socket path")
+    parser.add_argument("--allowed", default="", help="Daemon: comma-separated allowed item ids (parsed names are mapped to these)")
+    parser.add_argument("--config", default=None, help="mqtt.json path (default config/dev/mqtt.json)")
     args = parser.parse_args()
 
     repo_root = Path(__file__).resolve().parents[2]
     if load_dotenv is not None:
         load_dotenv(repo_root / ".env")
-    config_path = repo_root / "config" / "dev" / "mqtt.json"
+    config_path = Path(args.config) if args.config else repo_root / "config" / "dev" / "mqtt.json"
     cfg = load_config(config_path)
     topic = cfg.get("topics", {}).get("items", "agv/ai/items")
 
+    if args.daemon:
+        allowed = [x.strip() for x in args.allowed.split(",") if x.strip()]
+        run_daemon(cfg, args.workers, args.max_pending, args.socket, allowed_names=allowed)
+        return
+
+    if args.stream:
+        stream_items(args.stream, cfg, topic, args.stt_backend, args.sample_rate)
+        return
+
     if args.sample or (not args.text and not args.audio):
         payload = build_items_payload(repo_root / "data" / "samples" / "items_example.json")
         payload["timestamp_ms"] = int(time.time() * 1000)
@@ -0,0 +1,269 @@
+"""
+Long-running AI node: stays connected to the broker and turns utterance / audio jobs into
+items payloads with a bounded worker pool.
+
+Job (MQTT `topics.ai_request` or one JSON line on the local socket):
+    {"id": "42", "text": "초코 두 개"}
+    {"id": "43", "audio_path": "/tmp/order.wav"}
+    {"id": "44", "audio_b64": "<base64>", "format": "wav", "publish": false}
+
+Response (MQTT `topics.ai_response` / `reply_to`, or the same socket connection):
+    {"id": "42", "ok": true, "text": ..., "items": {...},
+     "latency_ms": {"queue": .., "stt": .., "parse": .., "publish": .., "total": ..}}
+"""
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import signal
+import socketserver
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import paho.mqtt.client as mqtt
+
+try:  # script-mode support
+    from item_parser import parse_items_from_text, validate_items_payload
+    from stt import transcribe_audio_bytes, transcribe_audio_file
+except ImportError:
+    from .item_parser import parse_items_from_text, validate_items_payload
+    from .stt import transcribe_audio_bytes, transcribe_audio_file
+
+Reply = Callable[[Dict[str, Any]], None]
+
+_STAGES = ("queue", "stt", "parse", "publish", "total")
+
+
+def _ms(start: float, end: float) -> float:
+    return round((end - start) * 1000.0, 2)
+
+
+class AiNodeDaemon:
+    def __init__(
+        self,
+        cfg: Dict[str, Any],
+        *,
+        max_workers: int = 4,
+        max_pending: int = 16,
+        allowed_names: Optional[Iterable[str]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.cfg = cfg
+        topics = cfg.get("topics", {})
+        self.items_topic = topics.get("items", "agv/ai/items")
+        self.request_topic = topics.get("ai_request", "agv/ai/request")
+        self.response_topic = topics.get("ai_response", "agv/ai/response")
+        self.allowed_names = list(allowed_names or [])
+        self.log = logger or logging.getLogger("ai_node")
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai_job")
+        # running + queued jobs; beyond that new jobs are rejected with "busy"
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+        self._stats_lock = threading.Lock()
+        self._counts = {"accepted": 0, "rejected": 0, "ok": 0, "failed": 0}
+        self._latency_sum = {k: 0.0 for k in _STAGES}
+        self._latency_n = {k: 0 for k in _STAGES}
+
+        self.client = mqtt.Client(client_id=f"{cfg.get('client_id', 'agv_dev')}_ai_daemon", protocol=mqtt.MQTTv311)
+        if cfg.get("username"):
+            self.client.username_pw_set(cfg["username"], cfg.get("password") or "")
+        self.client.reconnect_delay_set(min_delay=1, max_delay=30)
+        self.client.on_connect = self.on_connect
+        self.client.on_message = self.on_message
+        self.client.on_disconnect = self.on_disconnect
+
+        self._socket_server: Optional[socketserver.BaseServer] = None
+        self._should_exit = False
+
+    # ---------- jobs ----------
+    def submit(self, job: Dict[str, Any], reply: Reply, received: Optional[float] = None) -> Optional[Future]:
+        """Queue a job; `reply` is called from a worker thread with the response. None if rejected."""
+        received = time.perf_counter() if received is None else received
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            reply({"id": job.get("id"), "ok": False, "error": "busy"})
+            return None
+        self._count("accepted")
+
+        def run() -> Dict[str, Any]:
+            try:
+                resp = self.process(job, received)
+            finally:
+                self._slots.release()
+            try:
+                reply(resp)
+            except Exception as e:
+                self.log.error(f"reply failed for job {job.get('id')}: {e}")
+            return resp
+
+        return self._pool.submit(run)
+
+    def process(self, job: Dict[str, Any], received: float) -> Dict[str, Any]:
+        latency: Dict[str, float] = {}
+        t = time.perf_counter()
+        latency["queue"] = _ms(received, t)
+        resp: Dict[str, Any] = {"id": job.get("id")}
+        try:
+            text = (job.get("text") or "").strip()
+            if not text:
+                if job.get("audio_path"):
+                    text = transcribe_audio_file(Path(job["audio_path"]))
+                elif job.get("audio_b64"):
+                    audio = base64.b64decode(job["audio_b64"])
+                    text = transcribe_audio_bytes(audio, f"audio.{job.get('format') or 'wav'}")
+                else:
+                    raise ValueError("job needs `text`, `audio_path` or `audio_b64`")
+                now = time.perf_counter()
+                latency["stt"] = _ms(t, now)
+                t = now
+
+            payload = parse_items_from_text(text, allowed_names=self.allowed_names or None)
+            validate_items_payload(payload)
+            now = time.perf_counter()
+            latency["parse"] = _ms(t, now)
+            t = now
+
+            if job.get("publish", True):
+                self.client.publish(self.items_topic, json.dumps(payload), qos=1)
+                now = time.perf_counter()
+                latency["publish"] = _ms(t, now)
+
+            resp.update({"ok": True, "text": text, "items": payload})
+            self._count("ok")
+        except Exception as e:
+            resp.update({"ok": False, "error": str(e)})
+            self._count("failed")
+        latency["total"] = _ms(received, time.perf_counter())
+        resp["latency_ms"] = latency
+        self._record_latency(latency)
+        self.log.info(f"job {resp['id']} ok={resp['ok']} latency_ms={latency}")
+        return resp
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._counts[key] += 1
+
+    def _record_latency(self, latency: Dict[str, float]) -> None:
+        with self._stats_lock:
+            for k, v in latency.items():
+                self._latency_sum[k] += v
+                self._latency_n[k] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            mean = {k: round(self._latency_sum[k] / n, 2) for k, n in self._latency_n.items() if n}
+            return {**self._counts, "mean_latency_ms": mean}
+
+    # ---------- MQTT ----------
+    def on_connect(self, client, userdata, flags, rc):
+        if rc == 0:
+            self.log.info(f"connected {self.cfg.get('broker', 'localhost')}:{self.cfg.get('port', 1883)}")
+            client.subscribe(self.request_topic, qos=1)
+            self.log.info(f"subscribed {self.request_topic} -> publishing {self.items_topic}")
+        else:
+            self.log.error(f"connect failed rc={rc}")
+
+    def on_disconnect(self, client, userdata, rc):
+        self.log.warning(f"disconnected rc={rc}")
+
+    def on_message(self, client, userdata, msg):
+        received = time.perf_counter()
+        try:
+            job = json.loads(msg.payload.decode("utf-8", errors="replace"))
+            if not isinstance(job, dict):
+                raise ValueError("job must be a JSON object")
+        except Exception as e:
+            self.log.error(f"invalid job on {msg.topic}: {e}")
+            client.publish(self.response_topic, json.dumps({"id": None, "ok": False, "error": str(e)}))
+            return
+
+        reply_topic = job.get("reply_to") or self.response_topic
+
+        def reply(resp: Dict[str, Any]) -> None:
+            self.client.publish(reply_topic, json.dumps(resp, ensure_ascii=False), qos=1)
+
+        self.submit(job, reply, received)
+
+    # ---------- local socket ----------
+    def serve_socket(self, address: str) -> None:
+        """
+        Accept newline-delimited JSON jobs on "host:port" (TCP) or a filesystem path (Unix socket).
+        Responses are written back on the same connection, one JSON line per job.
+        """
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                write_lock = threading.Lock()
+                pending: List[Future] = []
+
+                def reply(resp: Dict[str, Any]) -> None:
+                    data = (json.dumps(resp, ensure_ascii=False) + "\n").encode("utf-8")
+                    with write_lock:
+                        self.wfile.write(data)
+                        self.wfile.flush()
+
+                for line in self.rfile:
+                    received = time.perf_counter()
+                    if not line.strip():
+                        continue
+                    try:
+                        job = json.loads(line)
+                        if not isinstance(job, dict):
+                            raise ValueError("job must be a JSON object")
+                    except Exception as e:
+                        reply({"id": None, "ok": False, "error": f"invalid job: {e}"})
+                        continue
+                    fut = daemon.submit(job, reply, received)
+                    if fut is not None:
+                        pending.append(fut)
+                # client closed its side: finish outstanding jobs before dropping the connection
+                for fut in pending:
+                    fut.result()
+
+        server: socketserver.BaseServer
+        if ":" in address:
+            host, port = address.rsplit(":", 1)
+            socketserver.ThreadingTCPServer.allow_reuse_address = True
+            server = socketserver.ThreadingTCPServer((host, int(port)), Handler)
+        else:
+            Path(address).unlink(missing_ok=True)
+            server = socketserver.ThreadingUnixStreamServer(address, Handler)
+        server.daemon_threads = True
+        self._socket_server = server
+        threading.Thread(target=server.serve_forever, name="ai_socket", daemon=True).start()
+        self.log.info(f"listening for jobs on {address}")
+
+    # ---------- lifecycle ----------
+    def start(self) -> None:
+        # connect_async + loop_start keeps retrying if the broker is not up yet
+        self.client.connect_async(self.cfg.get("broker", "localhost"), self.cfg.get("port", 1883), self.cfg.get("keepalive", 60))
+        self.client.loop_start()
+
+    def stop(self) -> None:
+        if self._socket_server is not None:
+            self._socket_server.shutdown()
+            self._socket_server.server_close()
+        self._pool.shutdown(wait=True)
+        self.client.loop_stop()
+        self.client.disconnect()
+        self.log.info(f"stopped; stats={self.stats()}")
+
+    def run(self) -> None:
+        def handle_sig(_sig, _frame):
+            self._should_exit = True
+
+        signal.signal(signal.SIGINT, handle_sig)
+        signal.signal(signal.SIGTERM, handle_sig)
+
+        self.start()
+        try:
+            while not self._should_exit:
+                time.sleep(0.2)
+        finally:
+            self.stop()
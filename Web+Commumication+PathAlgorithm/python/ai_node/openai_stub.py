@@ -0,0 +1,129 @@
+"""
+Minimal local stand-in for the OpenAI endpoints used by the AI node, for tests and
+offline development:
+
+    python openai_stub.py --port 8089
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=stub python main.py --text "초코 두 개"
+
+- POST /v1/chat/completions   -> items JSON from the keyword heuristic on the "Input text:" line
+                                (or one result per "[n] ..." line for batch prompts)
+- POST /v1/audio/transcriptions -> {"text": <--transcript>}
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+try:  # script-mode support
+    from item_parser import _KEYWORDS, _fast_parse_items
+except ImportError:
+    from .item_parser import _KEYWORDS, _fast_parse_items
+
+_INPUT_RE = re.compile(r"Input text:\s*(.*)")
+_BATCH_LINE_RE = re.compile(r"^\[(\d+)\] (.*)$", re.MULTILINE)
+
+
+def _chat_completion(body: Dict[str, Any]) -> Dict[str, Any]:
+    prompt = ""
+    for msg in body.get("messages", []):
+        if msg.get("role") == "user":
+            prompt = str(msg.get("content") or "")
+    if "Utterances:" in prompt:  # parse_items_batch
+        results = []
+        for m in _BATCH_LINE_RE.finditer(prompt.split("Utterances:", 1)[1]):
+            items, _ = _fast_parse_items(m.group(2), list(_KEYWORDS))
+            results.append({"index": int(m.group(1)), "items": items})
+        content = json.dumps({"results": results}, ensure_ascii=False)
+    else:
+        m = _INPUT_RE.search(prompt)
+        text = m.group(1) if m else prompt
+        items, _ = _fast_parse_items(text, list(_KEYWORDS))
+        content = json.dumps({"items": items, "timestamp_ms": int(time.time() * 1000)}, ensure_ascii=False)
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        ],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True
+    transcript = "초코 하나 주세요"
+    latency_s = 0.0
+
+    def log_message(self, fmt, *args):  # quiet
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.latency_s > 0:
+            time.sleep(self.latency_s)
+        path = self.path.rstrip("/")
+        if path.endswith("/chat/completions"):
+            try:
+                body = json.loads(raw.decode("utf-8") or "{}")
+            except Exception:
+                self._send_json(400, {"error": {"message": "invalid json"}})
+                return
+            self._send_json(200, _chat_completion(body))
+        elif path.endswith("/audio/transcriptions"):
+            self._send_json(200, {"text": self.transcript})
+        else:
+            self._send_json(404, {"error": {"message": f"unknown endpoint {self.path}"}})
+
+
+def start_stub_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    transcript: Optional[str] = None,
+    latency_s: float = 0.0,
+) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub in a daemon thread. Returns (server, base_url); call server.shutdown() to stop."""
+    attrs: Dict[str, Any] = {"latency_s": latency_s}
+    if transcript is not None:
+        attrs["transcript"] = transcript
+    handler = type("StubHandler", (_Handler,), attrs)
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Local OpenAI API stub")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--transcript", default=None, help="text returned by /audio/transcriptions")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="artificial response delay")
+    args = ap.parse_args()
+
+    server, base_url = start_stub_server(args.host, args.port, args.transcript, args.latency_ms / 1000.0)
+    print(f"[openai_stub] listening, set OPENAI_BASE_URL={base_url}")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
 import os
+import threading
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
 
 
 def require_env(name: str) -> str:
@@ -12,3 +17,83 @@ def optional_env(name: str, default: str) -> str:
     value = os.getenv(name, "").strip()
     return value or default
 
+
+# Shared clients: one connection pool (keep-alive, TLS session reuse) per process
+# instead of a new OpenAI(...) per request.
+_client_lock = threading.Lock()
+_client: Optional[OpenAI] = None
+_async_client: Optional[AsyncOpenAI] = None
+
+
+def _client_options() -> dict:
+    """
+    OPENAI_BASE_URL (e.g. the local stub), OPENAI_TIMEOUT_S, OPENAI_CONNECT_TIMEOUT_S,
+    OPENAI_MAX_RETRIES (SDK retries with exponential backoff), OPENAI_MAX_CONNECTIONS.
+    """
+    timeout = float(optional_env("OPENAI_TIMEOUT_S", "30"))
+    connect_timeout = float(optional_env("OPENAI_CONNECT_TIMEOUT_S", "5"))
+    max_conn = int(optional_env("OPENAI_MAX_CONNECTIONS", "10"))
+    return {
+        "api_key": require_env("OPENAI_API_KEY"),
+        "base_url": optional_env("OPENAI_BASE_URL", "") or None,
+        "timeout": httpx.Timeout(timeout, connect=connect_timeout),
+        "max_retries": int(optional_env("OPENAI_MAX_RETRIES", "2")),
+        "limits": httpx.Limits(
+            max_connections=max_conn,
+            max_keepalive_connections=max_conn,
+            keepalive_expiry=float(optional_env("OPENAI_KEEPALIVE_S", "60")),
+        ),
+    }
+
+
+def get_client() -> OpenAI:
+    """Lazily create the process-wide sync client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            opts = _client_options()
+            http_client = httpx.Client(timeout=opts["timeout"], limits=opts["limits"])
+            _client = OpenAI(
+                api_key=opts["api_key"],
+                base_url=opts["base_url"],
+                timeout=opts["timeout"],
+                max_retries=opts["max_retries"],
+                http_client=http_client,
+            )
+        return _client
+
+
+def get_async_client() -> AsyncOpenAI:
+    """Lazily create the process-wide async client (for asyncio callers such as FastAPI handlers)."""
+    global _async_client
+    with _client_lock:
+        if _async_client is None:
+            opts = _client_options()
+            http_client = httpx.AsyncClient(timeout=opts["timeout"], limits=opts["limits"])
+            _async_client = AsyncOpenAI(
+                api_key=opts["api_key"],
+                base_url=opts["base_url"],
+                timeout=opts["timeout"],
+                max_retries=opts["max_retries"],
+                http_client=http_client,
+            )
+        return _async_client
+
+
+def close_clients() -> None:
+    """Close the sync client's pool (the async client needs `aclose_clients()` from its event loop)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
+async def aclose_clients() -> None:
+    """Close both shared clients; call from the event loop the async client was used on."""
+    global _async_client
+    close_clients()
+    with _client_lock:
+        client, _async_client = _async_client, None
+    if client is not None:
+        await client.close()
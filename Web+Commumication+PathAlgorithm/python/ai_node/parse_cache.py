@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:  # script-mode support
+    from openai_utils import optional_env
+except ImportError:
+    from .openai_utils import optional_env
+
+_PUNCT_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+Items = List[Dict[str, Any]]
+
+
+def normalize_utterance(text: str) -> str:
+    """
+    NFKC + lowercase, drop punctuation and whitespace so that
+    "초코 하나 주세요!" and "초코하나 주세요" share a cache entry.
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    return _PUNCT_RE.sub("", text)
+
+
+@lru_cache(maxsize=16)
+def _names_digest(names: Tuple[str, ...]) -> str:
+    return hashlib.sha1("\n".join(sorted(names)).encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """In-memory LRU with TTL, optionally backed by a SQLite file shared across processes."""
+
+    def __init__(self, max_entries: int = 1024, ttl_s: float = 24 * 3600, db_path: Optional[Path] = None):
+        self.max_entries = max(int(max_entries), 0)
+        self.ttl_s = float(ttl_s)
+        self._lock = threading.Lock()
+        self._mem: "OrderedDict[str, Tuple[float, Items]]" = OrderedDict()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache (key TEXT PRIMARY KEY, items TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(text: str, allowed_names: Iterable[str], model: str) -> str:
+        names = _names_digest(tuple(allowed_names))
+        raw = f"{normalize_utterance(text)}\0{names}\0{model}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_s > 0 and now - created > self.ttl_s
+
+    def get(self, key: str) -> Optional[Items]:
+        now = time.time()
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                if not self._expired(hit[0], now):
+                    self._mem.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return [dict(it) for it in hit[1]]
+                del self._mem[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT items, created FROM parse_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    if not self._expired(row[1], now):
+                        items = json.loads(row[0])
+                        self._remember(key, row[1], items)
+                        self._stats["disk_hits"] += 1
+                        return [dict(it) for it in items]
+                    self._db.execute("DELETE FROM parse_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, items: Items) -> None:
+        now = time.time()
+        frozen = [dict(it) for it in items]
+        with self._lock:
+            self._remember(key, now, frozen)
+            self._stats["stores"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO parse_cache (key, items, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(frozen, ensure_ascii=False), now),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, created: float, items: Items) -> None:
+        # caller holds self._lock
+        if self.max_entries == 0:
+            return
+        self._mem[key] = (created, items)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(self._mem)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = ((stats["memory_hits"] + stats["disk_hits"]) / lookups) if lookups else 0.0
+        return stats
+
+
+_cache: Optional[ParseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParseCache:
+    """
+    Process-wide cache configured from env:
+    AGV_PARSE_CACHE_SIZE (entries, default 1024), AGV_PARSE_CACHE_TTL_S (default 86400),
+    AGV_PARSE_CACHE_DB (optional SQLite file).
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            db = optional_env("AGV_PARSE_CACHE_DB", "")
+            _cache = ParseCache(
+                max_entries=int(optional_env("AGV_PARSE_CACHE_SIZE", "1024")),
+                ttl_s=float(optional_env("AGV_PARSE_CACHE_TTL_S", str(24 * 3600))),
+                db_path=Path(db) if db else None,
+            )
+        return _cache
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import io
+import itertools
+import math
+import sys
+import threading
+import wave
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:  # script-mode support
+    from item_parser import parse_items_from_text
+    from openai_utils import get_client, optional_env
+except ImportError:
+    from .item_parser import parse_items_from_text
+    from .openai_utils import get_client, optional_env
+
+# Streaming audio is 16-bit little-endian mono PCM.
+SAMPLE_WIDTH = 2
+DEFAULT_SAMPLE_RATE = 16000
+
+
+# ----------------------------
+# Audio sources
+# ----------------------------
+def _iter_stream(f: BinaryIO, chunk_bytes: int) -> Iterator[bytes]:
+    while True:
+        chunk = f.read(chunk_bytes)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_pcm_chunks(source: str, chunk_ms: int = 30, sample_rate: int = DEFAULT_SAMPLE_RATE) -> Iterator[bytes]:
+    """
+    Yield PCM16 chunks from a .wav file, a raw PCM file, or "-" (stdin pipe, raw PCM), e.g.
+    `arecord -f S16_LE -r 16000 -c 1 -t raw | python main.py --stream -`.
+    """
+    if source == "-":
+        chunk_bytes = sample_rate * SAMPLE_WIDTH * chunk_ms // 1000
+        yield from _iter_stream(sys.stdin.buffer, chunk_bytes)
+        return
+
+    path = Path(source)
+    if path.suffix.lower() == ".wav":
+        with wave.open(str(path), "rb") as w:
+            if w.getsampwidth() != SAMPLE_WIDTH or w.getnchannels() != 1:
+                raise ValueError("streaming expects 16-bit mono WAV")
+            if w.getframerate() != sample_rate:
+                raise ValueError(f"WAV sample rate {w.getframerate()} != {sample_rate}")
+            frames = sample_rate * chunk_ms // 1000
+            while True:
+                chunk = w.readframes(frames)
+                if not chunk:
+                    return
+                yield chunk
+    else:
+        with path.open("rb") as f:
+            yield from _iter_stream(f, sample_rate * SAMPLE_WIDTH * chunk_ms // 1000)
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(SAMPLE_WIDTH)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm)
+    return buf.getvalue()
+
+
+# ----------------------------
+# Voice activity detection
+# ----------------------------
+class EnergyVAD:
+    """
+    Frame-energy VAD that cuts a PCM stream into utterances.
+    An utterance starts after `start_frames` loud frames and ends after `end_silence_ms`
+    of silence (or at `max_utterance_s`). `pre_roll_ms` of audio before the start is kept.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        frame_ms: int = 30,
+        threshold_dbfs: float = -40.0,
+        start_frames: int = 3,
+        end_silence_ms: int = 600,
+        max_utterance_s: float = 15.0,
+        pre_roll_ms: int = 300,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_bytes = sample_rate * SAMPLE_WIDTH * frame_ms // 1000
+        self.threshold_rms = 32768.0 * (10.0 ** (threshold_dbfs / 20.0))
+        self.start_frames = start_frames
+        self.end_frames = max(end_silence_ms // frame_ms, 1)
+        self.max_frames = int(max_utterance_s * 1000 / frame_ms)
+        self.pre_roll_frames = pre_roll_ms // frame_ms
+
+        self._pending = b""
+        self._pre_roll: List[bytes] = []
+        self._speech: List[bytes] = []
+        self._in_speech = False
+        self._loud_run = 0
+        self._silent_run = 0
+
+    def _is_loud(self, frame: bytes) -> bool:
+        samples = array("h", frame)
+        if sys.byteorder == "big":
+            samples.byteswap()
+        rms = math.sqrt(sum(s * s for s in samples) / len(samples))
+        return rms >= self.threshold_rms
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Add audio; returns the utterances (PCM) completed by this chunk."""
+        done: List[bytes] = []
+        data = self._pending + chunk
+        n_full = len(data) // self.frame_bytes * self.frame_bytes
+        self._pending = data[n_full:]
+        for off in range(0, n_full, self.frame_bytes):
+            frame = data[off : off + self.frame_bytes]
+            loud = self._is_loud(frame)
+            if not self._in_speech:
+                self._pre_roll.append(frame)
+                self._loud_run = self._loud_run + 1 if loud else 0
+                if self._loud_run >= self.start_frames:
+                    self._in_speech = True
+                    self._speech = self._pre_roll[-(self.pre_roll_frames + self.start_frames) :]
+                    self._silent_run = 0
+                    self._pre_roll = []
+                elif len(self._pre_roll) > self.pre_roll_frames + self.start_frames:
+                    self._pre_roll.pop(0)
+                continue
+
+            self._speech.append(frame)
+            self._silent_run = 0 if loud else self._silent_run + 1
+            if self._silent_run >= self.end_frames or len(self._speech) >= self.max_frames:
+                done.append(self._finish())
+        return done
+
+    def flush(self) -> List[bytes]:
+        """End of stream: return the utterance in progress, if any."""
+        if self._in_speech and self._speech:
+            return [self._finish()]
+        return []
+
+    def _finish(self) -> bytes:
+        pcm = b"".join(self._speech)
+        self._speech = []
+        self._in_speech = False
+        self._loud_run = 0
+        self._silent_run = 0
+        return pcm
+
+
+# ----------------------------
+# STT backends
+# ----------------------------
+class SttBackend:
+    name = "base"
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        raise NotImplementedError
+
+
+class OpenAISttBackend(SttBackend):
+    name = "openai"
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or optional_env("OPENAI_STT_MODEL", "gpt-4o-mini-transcribe")
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        wav = io.BytesIO(pcm_to_wav(pcm, sample_rate))
+        wav.name = "utterance.wav"  # the SDK infers the format from the file name
+        result = get_client().audio.transcriptions.create(model=self.model, file=wav)
+        return (getattr(result, "text", None) or "").strip()
+
+
+class FasterWhisperBackend(SttBackend):
+    """Offline transcription with faster-whisper (`pip install faster-whisper`)."""
+
+    name = "faster_whisper"
+
+    def __init__(self, model: Optional[str] = None, language: str = "ko"):
+        from faster_whisper import WhisperModel  # optional dependency
+        import numpy as np
+
+        self._np = np
+        self.language = language
+        self.model = WhisperModel(model or optional_env("AGV_STT_LOCAL_MODEL", "small"), compute_type="int8")
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        if sample_rate != 16000:
+            raise ValueError("faster-whisper backend expects 16 kHz audio")
+        audio = self._np.frombuffer(pcm, dtype="<i2").astype(self._np.float32) / 32768.0
+        segments, _ = self.model.transcribe(audio, language=self.language)
+        return " ".join(seg.text.strip() for seg in segments).strip()
+
+
+class StubSttBackend(SttBackend):
+    """Returns canned transcripts in order (cycling), for tests."""
+
+    name = "stub"
+
+    def __init__(self, texts: Optional[Sequence[str]] = None):
+        self._texts = itertools.cycle(list(texts or ["초코 하나 주세요"]))
+        self._lock = threading.Lock()
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        with self._lock:
+            return next(self._texts)
+
+
+_BACKENDS: Dict[str, Callable[..., SttBackend]] = {
+    OpenAISttBackend.name: OpenAISttBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    StubSttBackend.name: StubSttBackend,
+}
+
+
+def register_backend(name: str, factory: Callable[..., SttBackend]) -> None:
+    _BACKENDS[name] = factory
+
+
+def get_backend(name: Optional[str] = None, **kwargs: Any) -> SttBackend:
+    """Backend by name (default env AGV_STT_BACKEND or "openai")."""
+    key = name or optional_env("AGV_STT_BACKEND", "openai")
+    if key not in _BACKENDS:
+        raise ValueError(f"Unknown STT backend: {key} (available: {', '.join(sorted(_BACKENDS))})")
+    return _BACKENDS[key](**kwargs)
+
+
+# ----------------------------
+# Pipeline
+# ----------------------------
+class StreamingTranscriber:
+    """
+    Feed audio chunks as they arrive. Each utterance cut by the VAD is transcribed and
+    parsed on a worker thread while audio keeps streaming in.
+    """
+
+    def __init__(
+        self,
+        backend: SttBackend,
+        *,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        vad: Optional[EnergyVAD] = None,
+        allowed_names: Optional[Iterable[str]] = None,
+        on_transcript: Optional[Callable[[str], None]] = None,
+        on_items: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        max_workers: int = 2,
+    ):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.vad = vad or EnergyVAD(sample_rate=sample_rate)
+        self.allowed_names = list(allowed_names or [])
+        self.on_transcript = on_transcript
+        self.on_items = on_items
+        self.on_error = on_error
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stt")
+        self._futures: List[Future] = []
+
+    def feed(self, chunk: bytes) -> None:
+        for pcm in self.vad.feed(chunk):
+            self._submit(pcm)
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Flush the VAD, wait for outstanding segments and return their items payloads."""
+        try:
+            for pcm in self.vad.flush():
+                self._submit(pcm)
+            results = []
+            for fut in self._futures:
+                payload = fut.result()
+                if payload is not None:
+                    results.append(payload)
+            return results
+        finally:
+            # release the worker threads even if a segment failed
+            self._pool.shutdown(wait=True)
+
+    def _submit(self, pcm: bytes) -> None:
+        self._futures.append(self._pool.submit(self._process, pcm))
+
+    def _process(self, pcm: bytes) -> Optional[Dict[str, Any]]:
+        try:
+            text = self.backend.transcribe(pcm, self.sample_rate)
+            if not text:
+                return None
+            if self.on_transcript:
+                self.on_transcript(text)
+            payload = parse_items_from_text(text, allowed_names=self.allowed_names or None)
+            if self.on_items:
+                self.on_items(text, payload)
+            return payload
+        except Exception as exc:
+            if self.on_error:
+                self.on_error(exc)
+                return None
+            raise
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
+import io
 from pathlib import Path
 
-from openai import OpenAI
-
 try:  # script-mode support
-    from openai_utils import optional_env, require_env
+    from openai_utils import get_client, optional_env
 except ImportError:
-    from .openai_utils import optional_env, require_env
+    from .openai_utils import get_client, optional_env
 
 
 def transcribe_audio_file(audio_path: Path) -> str:
@@ -18,10 +17,9 @@ def transcribe_audio_file(audio_path: Path) -> str:
     - Provide a pre-recorded audio file (e.g. .wav/.mp3/.m4a).
     - Set OPENAI_API_KEY in your environment.
     """
-    api_key = require_env("OPENAI_API_KEY")
     model = optional_env("OPENAI_STT_MODEL", "gpt-4o-mini-transcribe")
 
-    client = OpenAI(api_key=api_key)
+    client = get_client()
     with audio_path.open("rb") as f:
         result = client.audio.transcriptions.create(model=model, file=f)
 
@@ -29,3 +27,17 @@ def transcribe_audio_file(audio_path: Path) -> str:
     if not text:
         raise RuntimeError("Empty transcription result")
     return text
+
+
+def transcribe_audio_bytes(data: bytes, filename: str = "audio.wav") -> str:
+    """Same as `transcribe_audio_file` for in-memory audio; `filename` tells the API the format."""
+    model = optional_env("OPENAI_STT_MODEL", "gpt-4o-mini-transcribe")
+
+    f = io.BytesIO(data)
+    f.name = filename
+    result = get_client().audio.transcriptions.create(model=model, file=f)
+
+    text = (getattr(result, "text", None) or "").strip()
+    if not text:
+        raise RuntimeError("Empty transcription result")
+    return text
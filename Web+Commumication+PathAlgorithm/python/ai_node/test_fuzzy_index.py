@@ -0,0 +1,12 @@
+"""Fuzzy POI matching: run with `python -m pytest ai_node` from python/."""
+try:  # script-mode support
+    from fuzzy_index import FuzzyIndex
+except ImportError:
+    from .fuzzy_index import FuzzyIndex
+
+
+def test_exact_then_fuzzy_match():
+    index = FuzzyIndex(["choco", "tissue", "vitamin"])
+    assert index.best("CHOCO") == "choco"
+    assert index.best("vitamine") == "vitamin"
+    assert index.best("xyz") is None
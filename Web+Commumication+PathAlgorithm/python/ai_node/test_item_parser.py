@@ -0,0 +1,37 @@
+"""Fast-path regressions: run with `python -m pytest ai_node` from python/."""
+try:  # script-mode support
+    from item_parser import _fast_parse_items, _fast_parse_min_confidence
+except ImportError:
+    from .item_parser import _fast_parse_items, _fast_parse_min_confidence
+
+
+def test_negation_forces_llm():
+    threshold = _fast_parse_min_confidence(None)
+    for text in ["비타민 말고 초코 주세요", "초코 빼고 비타민 하나", "초코 없이 비타민", "비타민 제외하고 초코", "초코 안 줘도 돼"]:
+        items, confidence = _fast_parse_items(text, [])
+        assert items  # keywords are found ...
+        assert confidence < threshold, text  # ... but the LLM decides
+
+
+def test_plain_order_stays_on_fast_path():
+    items, confidence = _fast_parse_items("초코 2개랑 비타민 1개", [])
+    assert items == [{"name": "choco", "qty": 2}, {"name": "vitamin", "qty": 1}]
+    assert confidence >= _fast_parse_min_confidence(None)
+
+
+def test_quantity_after_particle():
+    threshold = _fast_parse_min_confidence(None)
+    for text, expected in [
+        ("초코를 두 개 주세요", [{"name": "choco", "qty": 2}]),
+        ("휴지 좀 두 개 주세요", [{"name": "tissue", "qty": 2}]),
+    ]:
+        items, confidence = _fast_parse_items(text, [])
+        assert items == expected, text
+        assert confidence >= threshold, text
+
+
+def test_unattached_quantity_forces_llm():
+    threshold = _fast_parse_min_confidence(None)
+    for text in ["초코랑 비타민 두 개씩", "두 개 초코 주세요"]:
+        _, confidence = _fast_parse_items(text, [])
+        assert confidence < threshold, text
@@ -0,0 +1,30 @@
+"""Parse cache: run with `python -m pytest ai_node` from python/."""
+try:  # script-mode support
+    from parse_cache import ParseCache
+except ImportError:
+    from .parse_cache import ParseCache
+
+
+def test_key_ignores_punctuation_and_name_order():
+    a = ParseCache.make_key("초코 하나 주세요!", ["choco", "tissue"], "m")
+    b = ParseCache.make_key("초코하나 주세요", ["tissue", "choco"], "m")
+    assert a == b
+    assert a != ParseCache.make_key("초코하나 주세요", ["choco"], "m")
+
+
+def test_lru_eviction_and_returned_copies():
+    cache = ParseCache(max_entries=2)
+    cache.put("a", [{"name": "choco", "qty": 1}])
+    cache.put("b", [{"name": "tissue", "qty": 1}])
+    cache.get("a")[0]["qty"] = 9  # callers must not mutate the cached entry
+    cache.put("c", [{"name": "vitamin", "qty": 1}])  # evicts "b", the least recently used
+    assert cache.get("a") == [{"name": "choco", "qty": 1}]
+    assert cache.get("b") is None
+
+
+def test_sqlite_tier_shared_across_instances(tmp_path):
+    db = tmp_path / "cache.sqlite"
+    ParseCache(db_path=db).put("k", [{"name": "choco", "qty": 2}])
+    other = ParseCache(db_path=db)
+    assert other.get("k") == [{"name": "choco", "qty": 2}]
+    assert other.stats()["disk_hits"] == 1
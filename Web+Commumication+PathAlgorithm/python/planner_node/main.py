@@ -14,6 +14,14 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import paho.mqtt.client as mqtt
 
+# Make `python/` importable so we can reuse the shared `agv_common` package.
+PYTHON_ROOT = Path(__file__).resolve().parents[1]
+if str(PYTHON_ROOT) not in sys.path:
+    sys.path.insert(0, str(PYTHON_ROOT))
+
+from agv_common import codec  # noqa: E402
+from agv_common.schemas import SchemaError, validate_items, validate_path_header  # noqa: E402
+
 
 # ----------------------------
 # Helpers
@@ -87,6 +95,7 @@ class PlannerCfg:
     obstacle_clearance_m: float
     turn_penalty: float
     output_topic: Optional[str]
+    validate_messages: bool = True  # check items input / path output against interfaces/schemas
 
 
 def parse_planner_cfg(d: Dict[str, Any]) -> PlannerCfg:
@@ -98,6 +107,7 @@ def parse_planner_cfg(d: Dict[str, Any]) -> PlannerCfg:
         obstacle_clearance_m=float(d.get("obstacle_clearance_m", 0.0)),
         turn_penalty=float(d.get("turn_penalty", 0.0)),
         output_topic=(str(d.get("output_topic")) if d.get("output_topic") else None),
+        validate_messages=bool(d.get("validate_messages", True)),
     )
 
 
@@ -126,8 +136,21 @@ class GridMap:
     poi: Dict[str, Tuple[int, int]]
 
 
+@dataclass
+class PlannedRoute:
+    """Planner result before serialization (cells in visiting order)."""
+
+    items: List[str]
+    order: List[str]
+    cells: List[Tuple[int, int]]
+    total_cost: float
+
+
 def load_grid_map(map_path: str) -> GridMap:
-    d = load_json(map_path)
+    return grid_map_from_dict(load_json(map_path))
+
+
+def grid_map_from_dict(d: Dict[str, Any]) -> GridMap:
     origin = d.get("origin", {}) or {}
     poi_dict: Dict[str, Tuple[int, int]] = {}
     for p in (d.get("poi", []) or []):
@@ -303,41 +326,76 @@ class AStarPlanner:
         y = self.map.origin_y + cell[1] * self.map.resolution
         return (x, y)
 
-    def plan(self, item_ids: List[str]) -> Dict[str, Any]:
+    def path_cost(self, path: List[Tuple[int, int]]) -> float:
+        """A* cost of a cell path (step lengths + turn penalties), in cells."""
+        cost = 0.0
+        prev: Optional[Tuple[int, int]] = None
+        for (ax, ay), (bx, by) in zip(path, path[1:]):
+            d = (bx - ax, by - ay)
+            cost += math.hypot(d[0], d[1])
+            if prev is not None and d != prev:
+                cost += float(self.cfg.turn_penalty)
+            prev = d
+        return cost
+
+    def plan_route(self, item_ids: List[str]) -> PlannedRoute:
         order = self.greedy_order(item_ids)
 
         # visit points: start -> items -> end
         points: List[Tuple[int, int]] = [self.start] + [self.poi[i] for i in order] + [self.end]
 
         full: List[Tuple[int, int]] = []
+        total_cost = 0.0
         for a, b in zip(points, points[1:]):
             seg = self.astar(a, b)
             if seg is None:
                 raise RuntimeError(f"No path from {a} to {b}")
+            total_cost += self.path_cost(seg)
             if full and seg and full[-1] == seg[0]:
                 full.extend(seg[1:])
             else:
                 full.extend(seg)
+        return PlannedRoute(items=list(item_ids), order=order, cells=full, total_cost=round(total_cost, 4))
 
-        # output: both cell + world
-        waypoints_cell = [{"x": x, "y": y} for (x, y) in full]
-        waypoints_world = []
-        for c in full:
-            wx, wy = self.cell_to_world(c)
-            waypoints_world.append({"x": wx, "y": wy})
-
+    def _message_header(self, route: PlannedRoute) -> Dict[str, Any]:
         return {
             "frame": self.cfg.frame or self.map.frame,
             "resolution": self.map.resolution,
             "origin": {"x": self.map.origin_x, "y": self.map.origin_y},
             "start_cell": {"x": self.start[0], "y": self.start[1]},
             "end_cell": {"x": self.end[0], "y": self.end[1]},
-            "items": item_ids,
-            "order": order,
-            "waypoints_cell": waypoints_cell,
-            "waypoints": waypoints_world,  # meter coordinates
+            "items": route.items,
+            "order": route.order,
+            "total_cost": route.total_cost,
+            "created_ms": int(time.time() * 1000),
         }
 
+    def plan(self, item_ids: List[str]) -> Dict[str, Any]:
+        route = self.plan_route(item_ids)
+
+        # output: both cell + world
+        msg = self._message_header(route)
+        msg["waypoints_cell"] = [{"x": x, "y": y} for (x, y) in route.cells]
+        msg["waypoints"] = [{"x": wx, "y": wy} for (wx, wy) in map(self.cell_to_world, route.cells)]  # meter coordinates
+        return msg
+
+    def encode_message(self, route: PlannedRoute, validate: bool = False) -> bytes:
+        """
+        Same document as `plan()`, serialized directly: waypoint arrays are encoded from the
+        cell tuples without building a dict per point. With `validate`, the header is checked
+        against path.schema.json (the waypoints are valid by construction).
+        """
+        header = self._message_header(route)
+        if validate:
+            validate_path_header(header)
+            if not route.cells:
+                raise SchemaError("path payload invalid: waypoints must contain at least 1 items")
+        world = [self.cell_to_world(c) for c in route.cells]
+        return codec.splice(
+            codec.dumps(header),
+            {"waypoints_cell": codec.dumps_points(route.cells), "waypoints": codec.dumps_points(world)},
+        )
+
 
 def extract_items(payload: Dict[str, Any]) -> List[str]:
     """
@@ -363,11 +421,19 @@ def extract_items(payload: Dict[str, Any]) -> List[str]:
 # MQTT Node
 # ----------------------------
 class PlannerNode:
-    def __init__(self, mqtt_cfg: MqttCfg, planner: AStarPlanner, output_topic: str, logger: logging.Logger):
+    def __init__(
+        self,
+        mqtt_cfg: MqttCfg,
+        planner: AStarPlanner,
+        output_topic: str,
+        logger: logging.Logger,
+        validate_messages: bool = True,
+    ):
         self.cfg = mqtt_cfg
         self.planner = planner
         self.output_topic = output_topic
         self.log = logger
+        self.validate_messages = validate_messages
 
         # MQTT v3.1.1
         self.client = mqtt.Client(client_id=f"{self.cfg.client_id}_planner", protocol=mqtt.MQTTv311)
@@ -394,27 +460,36 @@ class PlannerNode:
 
     def on_message(self, client, userdata, msg):
         try:
-            payload = json.loads(msg.payload.decode("utf-8", errors="replace"))
+            payload = codec.loads(msg.payload)
         except Exception as e:
             self.log.error(f"invalid json on {msg.topic}: {e}")
             return
 
+        if self.validate_messages:
+            try:
+                validate_items(payload)
+            except SchemaError as e:
+                self.log.error(f"rejected {msg.topic}: {e}")
+                client.publish(self.output_topic, codec.dumps({"error": str(e), "items": []}), qos=0, retain=False)
+                return
+
         item_ids = extract_items(payload)
         self.log.info(f"rx {msg.topic}: items={item_ids}")
 
         try:
-            result = self.planner.plan(item_ids)
+            route = self.planner.plan_route(item_ids)
+            data = self.planner.encode_message(route, validate=self.validate_messages)
         except Exception as e:
             self.log.error(f"plan failed: {e}")
             err = {"error": str(e), "items": item_ids}
-            client.publish(self.output_topic, json.dumps(err), qos=0, retain=False)
+            client.publish(self.output_topic, codec.dumps(err), qos=0, retain=False)
             return
 
-        client.publish(self.output_topic, json.dumps(result), qos=0, retain=False)
+        client.publish(self.output_topic, data, qos=0, retain=False)
         self.log.info(
             f"published {self.output_topic} "
-            f"order={result.get('order')} "
-            f"waypoints_cell={len(result.get('waypoints_cell', []))}"
+            f"order={route.order} "
+            f"waypoints_cell={len(route.cells)} bytes={len(data)}"
         )
 
     def run(self):
@@ -458,7 +533,7 @@ def main():
     # output topic: planner.json output_topic 우선, 없으면 mqtt.json topics.global_path
     out_topic = planner_cfg.output_topic or mqtt_cfg.topic_global_path
 
-    node = PlannerNode(mqtt_cfg, planner, out_topic, logger)
+    node = PlannerNode(mqtt_cfg, planner, out_topic, logger, validate_messages=planner_cfg.validate_messages)
     node.run()
 
 
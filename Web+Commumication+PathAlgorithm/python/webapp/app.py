@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import sys
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal, Tuple, Union
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
@@ -18,6 +20,7 @@ load_dotenv(REPO_ROOT / ".env")
 MQTT_CFG_PATH = REPO_ROOT / os.getenv("AGV_MQTT_CONFIG", "config/dev/mqtt.json")
 PLANNER_CFG_PATH = REPO_ROOT / os.getenv("AGV_PLANNER_CONFIG", "config/dev/planner.json")
 MAP_FILE_OVERRIDE = os.getenv("AGV_MAP_FILE")
+RECORD_DIR = os.getenv("AGV_RECORD_DIR")
 
 # Make `python/` importable so we can reuse `ai_node` modules.
 PYTHON_ROOT = REPO_ROOT / "python"
@@ -25,11 +28,24 @@ if str(PYTHON_ROOT) not in sys.path:
     sys.path.insert(0, str(PYTHON_ROOT))
 
 try:
-    from ai_node.item_parser import parse_items_from_text, validate_items_payload  # type: ignore
+    from ai_node.item_parser import (  # type: ignore
+        parse_items_batch,
+        parse_items_from_text,
+        parser_stats,
+        validate_items_payload,
+    )
+    from ai_node.openai_utils import aclose_clients  # type: ignore
+    from ai_node.streaming import StreamingTranscriber, get_backend  # type: ignore
 except Exception as e:  # pragma: no cover
     raise RuntimeError(f"Failed to import ai_node modules: {e}") from e
 
+try:
+    from planner_node.main import extract_items  # type: ignore
+except Exception as e:  # pragma: no cover
+    raise RuntimeError(f"Failed to import planner_node modules: {e}") from e
+
 from .mqtt_pub import publish_items_payload
+from .planning import PlannerService
 from .telemetry import AgvTelemetry
 
 
@@ -37,11 +53,20 @@ class ParseRequest(BaseModel):
     text: str = Field(..., min_length=1)
 
 
+class BatchParseRequest(BaseModel):
+    texts: List[str] = Field(..., min_items=1, max_items=5000)
+    batch_size: Optional[int] = Field(None, ge=1, le=100)
+
+
 class PublishRequest(BaseModel):
     text: Optional[str] = None
     items: Optional[Dict[str, Any]] = None
 
 
+class PlanRequest(BaseModel):
+    items: List[Union[str, Dict[str, Any]]] = Field(..., min_items=1)
+
+
 class CommandRequest(BaseModel):
     action: Literal["go", "stop"]
     source: Optional[str] = "ui"
@@ -55,12 +80,26 @@ app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
 telemetry: Optional[AgvTelemetry] = None
 telemetry_error: Optional[str] = None
+planner_service = PlannerService()
+
+# path -> (mtime_ns, parsed json); shared by /api/map, POI lookup and /api/plan
+_json_cache: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
 
 
 def _load_json(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+def _load_json_cached(path: Path) -> Tuple[Dict[str, Any], int]:
+    mtime = path.stat().st_mtime_ns
+    hit = _json_cache.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1], mtime
+    data = _load_json(path)
+    _json_cache[path] = (mtime, data)
+    return data, mtime
+
+
 def _resolve_map_path() -> Path:
     if MAP_FILE_OVERRIDE:
         path = Path(MAP_FILE_OVERRIDE)
@@ -68,24 +107,34 @@ def _resolve_map_path() -> Path:
             path = REPO_ROOT / path
         return path
 
-    try:
-        planner_cfg = _load_json(PLANNER_CFG_PATH)
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"Failed to read planner config: {exc}")
-
+    planner_cfg, _ = _load_planner_cfg()
     rel = planner_cfg.get("map_file", "data/poi/store_A_grid_map.json")
     path = Path(rel)
     if not path.is_absolute():
-        path = REPO_ROOT / path
+        # planner_node와 동일하게 planner.json 위치 기준으로 먼저 해석하고, 없으면 repo root 기준
+        candidate = (PLANNER_CFG_PATH.parent / path).resolve()
+        path = candidate if candidate.exists() else REPO_ROOT / path
     return path
 
 
-def _load_poi_ids() -> list[str]:
+def _load_planner_cfg() -> Tuple[Dict[str, Any], int]:
+    try:
+        return _load_json_cached(PLANNER_CFG_PATH)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Failed to read planner config: {exc}")
+
+
+def _load_map() -> Tuple[Dict[str, Any], Path, int]:
     path = _resolve_map_path()
     try:
-        data = _load_json(path)
+        data, mtime = _load_json_cached(path)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to load map: {exc}")
+    return data, path, mtime
+
+
+def _load_poi_ids() -> list[str]:
+    data, _, _ = _load_map()
     poi_list = data.get("poi", [])
     ids = []
     for p in poi_list:
@@ -99,16 +148,22 @@ def _load_poi_ids() -> list[str]:
 def _startup():
     global telemetry, telemetry_error
     try:
-        telemetry = AgvTelemetry(MQTT_CFG_PATH)
+        record_dir = None
+        if RECORD_DIR:
+            record_dir = Path(RECORD_DIR)
+            if not record_dir.is_absolute():
+                record_dir = REPO_ROOT / record_dir
+        telemetry = AgvTelemetry(MQTT_CFG_PATH, record_dir=record_dir)
         telemetry.start()
     except Exception as exc:  # pragma: no cover - startup errors are reported via API
         telemetry_error = str(exc)
 
 
 @app.on_event("shutdown")
-def _shutdown():
+async def _shutdown():
     if telemetry:
         telemetry.stop()
+    await aclose_clients()
 
 
 @app.get("/")
@@ -123,8 +178,7 @@ def health():
 
 @app.post("/api/parse")
 def api_parse(req: ParseRequest):
-    if not os.getenv("OPENAI_API_KEY", "").strip():
-        raise HTTPException(status_code=400, detail="OPENAI_API_KEY not set (create .env)")
+    # Simple utterances are parsed locally; OPENAI_API_KEY is only required for the LLM fallback.
     try:
         items_payload = parse_items_from_text(req.text, allowed_names=_load_poi_ids())
         validate_items_payload(items_payload)
@@ -133,6 +187,17 @@ def api_parse(req: ParseRequest):
     return items_payload
 
 
+@app.post("/api/parse_batch")
+def api_parse_batch(req: BatchParseRequest):
+    # results are aligned with `texts`; failed utterances carry {"error": ...} instead of items
+    return parse_items_batch(req.texts, allowed_names=_load_poi_ids(), batch_size=req.batch_size)
+
+
+@app.get("/api/parse/stats")
+def api_parse_stats():
+    return parser_stats()
+
+
 @app.post("/api/publish")
 def api_publish(req: PublishRequest):
     if req.items is None and not (req.text and req.text.strip()):
@@ -142,8 +207,6 @@ def api_publish(req: PublishRequest):
         if req.items is not None:
             payload = req.items
         else:
-            if not os.getenv("OPENAI_API_KEY", "").strip():
-                raise HTTPException(status_code=400, detail="OPENAI_API_KEY not set (create .env)")
             payload = parse_items_from_text(req.text or "", allowed_names=_load_poi_ids())
 
         validate_items_payload(payload)
@@ -154,6 +217,66 @@ def api_publish(req: PublishRequest):
     return {"published": True, "items": payload}
 
 
+@app.websocket("/ws/audio")
+async def ws_audio(
+    ws: WebSocket,
+    sample_rate: int = 16000,
+    backend: Optional[str] = None,
+    publish: bool = False,
+):
+    """
+    Streaming voice order: send binary 16-bit mono PCM frames, then the text message "end".
+    Each utterance is answered as soon as it is parsed:
+    {"type": "transcript", "text"}, {"type": "items", "text", "items", "published"}, ... {"type": "done"}.
+    """
+    await ws.accept()
+    loop = asyncio.get_running_loop()
+
+    def send(msg: Dict[str, Any]) -> None:
+        asyncio.run_coroutine_threadsafe(ws.send_json(msg), loop)
+
+    def on_items(text: str, payload: Dict[str, Any]) -> None:
+        validate_items_payload(payload)
+        if publish:
+            publish_items_payload(payload, repo_root=REPO_ROOT)
+        send({"type": "items", "text": text, "items": payload, "published": publish})
+
+    try:
+        stream = StreamingTranscriber(
+            get_backend(backend),
+            sample_rate=sample_rate,
+            allowed_names=_load_poi_ids(),
+            on_transcript=lambda text: send({"type": "transcript", "text": text}),
+            on_items=on_items,
+            on_error=lambda exc: send({"type": "error", "detail": str(exc)}),
+        )
+    except Exception as exc:
+        await ws.send_json({"type": "error", "detail": f"STT backend unavailable: {exc}"})
+        await ws.close()
+        return
+
+    try:
+        while True:
+            msg = await ws.receive()
+            if msg.get("type") == "websocket.disconnect":
+                break
+            if msg.get("bytes"):
+                # VAD framing/RMS is CPU work: keep it off the event loop
+                await asyncio.to_thread(stream.feed, msg["bytes"])
+            elif (msg.get("text") or "").strip() == "end":
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await asyncio.to_thread(stream.close)
+
+    try:
+        await ws.send_json({"type": "done"})
+        await ws.close()
+    except Exception:
+        pass  # client already gone
+
+
 @app.get("/api/config")
 def api_config():
     try:
@@ -179,21 +302,55 @@ def api_config():
 
 @app.get("/api/map")
 def api_map():
-    path = _resolve_map_path()
+    data, _, _ = _load_map()
+    return data
+
+
+@app.post("/api/plan")
+def api_plan(req: PlanRequest):
+    item_ids = extract_items({"items": req.items})
+    if not item_ids:
+        raise HTTPException(status_code=400, detail="No valid item names in `items`.")
+
+    planner_cfg, cfg_mtime = _load_planner_cfg()
+    map_data, map_path, map_mtime = _load_map()
     try:
-        data = _load_json(path)
+        planner = planner_service.get_planner((map_path, map_mtime, cfg_mtime), planner_cfg, map_data)
     except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"Failed to load map: {exc}")
-    return data
+        raise HTTPException(status_code=500, detail=f"Failed to initialize planner: {exc}")
+
+    started = time.perf_counter()
+    try:
+        result, coalesced = planner_service.plan(planner, item_ids)
+    except Exception as exc:
+        raise HTTPException(status_code=422, detail=f"Plan failed: {exc}")
+    return {
+        "path": result,
+        "timing": {
+            "plan_ms": round((time.perf_counter() - started) * 1000.0, 3),
+            "coalesced": coalesced,
+        },
+    }
 
 
 @app.get("/api/state")
 def api_state():
     if telemetry:
-        return telemetry.snapshot()
+        return Response(content=telemetry.snapshot(), media_type="application/json")
     return {"connected": False, "last_error": telemetry_error or "Telemetry not initialized"}
 
 
+@app.get("/api/trajectory")
+def api_trajectory(
+    since: Optional[int] = Query(None, ge=0, description="Only samples newer than this timestamp (ms)"),
+    downsample: int = Query(1, ge=1, description="Keep every N-th sample"),
+    agv_id: Optional[str] = None,
+):
+    if telemetry is None:
+        raise HTTPException(status_code=500, detail="Telemetry not initialized")
+    return telemetry.trajectory(agv_id=agv_id, since_ms=since, downsample=downsample)
+
+
 @app.post("/api/command")
 def api_command(req: CommandRequest):
     if telemetry is None:
@@ -7,12 +7,16 @@ from typing import Any, Dict, Optional
 
 import paho.mqtt.client as mqtt
 
+from agv_common import codec
+from agv_common.schemas import validate_items
+
 
 def _load_json(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
 def publish_items_payload(payload: Dict[str, Any], *, repo_root: Optional[Path] = None) -> None:
+    validate_items(payload)  # never put a payload the planner would reject on the bus
     root = repo_root or Path(__file__).resolve().parents[2]
     cfg = _load_json(root / "config" / "dev" / "mqtt.json")
     topic = cfg.get("topics", {}).get("items", "agv/ai/items")
@@ -26,7 +30,7 @@ def publish_items_payload(payload: Dict[str, Any], *, repo_root: Optional[Path]
         client.username_pw_set(username, password)
 
     client.connect(cfg.get("broker", "localhost"), int(cfg.get("port", 1883)), int(cfg.get("keepalive", 60)))
-    client.publish(topic, json.dumps(payload), qos=1, retain=False)
+    client.publish(topic, codec.dumps(payload), qos=1, retain=False)
     client.loop(timeout=2.0)
     client.disconnect()
 
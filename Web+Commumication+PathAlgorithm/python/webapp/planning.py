@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+try:
+    from planner_node.main import AStarPlanner, grid_map_from_dict, parse_planner_cfg  # type: ignore
+except Exception as e:  # pragma: no cover
+    raise RuntimeError(f"Failed to import planner_node modules: {e}") from e
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestCoalescer:
+    """Run identical concurrent requests once and hand the result to every caller."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Call] = {}
+
+    def run(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Returns (result, coalesced). coalesced=True if another caller computed it."""
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+
+class PlannerService:
+    """In-process AStarPlanner, rebuilt only when the map or planner config changes."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self.log = logger or logging.getLogger("webapp.planner")
+        self._lock = threading.Lock()
+        self._planner: Optional[AStarPlanner] = None
+        self._planner_key: Optional[Hashable] = None
+        self._coalescer = RequestCoalescer()
+
+    def get_planner(self, cache_key: Hashable, planner_cfg: Dict[str, Any], map_data: Dict[str, Any]) -> AStarPlanner:
+        with self._lock:
+            if self._planner is None or self._planner_key != cache_key:
+                self._planner = AStarPlanner(grid_map_from_dict(map_data), parse_planner_cfg(planner_cfg), self.log)
+                self._planner_key = cache_key
+            return self._planner
+
+    def plan(self, planner: AStarPlanner, item_ids: list[str]) -> Tuple[Dict[str, Any], bool]:
+        key = (id(planner), tuple(item_ids))
+        return self._coalescer.run(key, lambda: planner.plan(item_ids))
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import bisect
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# Segment file layout (append-only):
+#   file header : MAGIC(8)
+#   record      : <q ts_ms> <H topic_len> <I payload_len> topic payload
+# Each segment has a sidecar index (.idx) of fixed-size <q ts_ms> <Q offset> entries,
+# written every `index_every` records so readers can seek by timestamp.
+MAGIC = b"AGVLOG01"
+_REC_HEADER = struct.Struct("<qHI")
+_IDX_ENTRY = struct.Struct("<qQ")
+
+SEGMENT_SUFFIX = ".agvlog"
+INDEX_SUFFIX = ".idx"
+
+Record = Tuple[int, str, bytes]
+
+
+class TelemetryRecorder:
+    """Append raw MQTT messages to rotating binary segment files."""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        max_segments: int = 20,
+        index_every: int = 64,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = int(max_segment_bytes)
+        self.max_segments = int(max_segments)
+        self.index_every = max(int(index_every), 1)
+
+        self._lock = threading.Lock()
+        self._seg = None
+        self._idx = None
+        self._seg_bytes = 0
+        self._seg_records = 0
+        self._seg_name = (-1, 0)  # (first_ms, seq) of the current segment's file name
+
+    def write(self, topic: str, payload: bytes, ts_ms: Optional[int] = None) -> None:
+        ts = int(time.time() * 1000) if ts_ms is None else int(ts_ms)
+        topic_b = topic.encode("utf-8")
+        header = _REC_HEADER.pack(ts, len(topic_b), len(payload))
+        with self._lock:
+            if self._seg is None or self._seg_bytes >= self.max_segment_bytes:
+                self._rotate(ts)
+            offset = self._seg_bytes
+            if self._seg_records % self.index_every == 0:
+                self._idx.write(_IDX_ENTRY.pack(ts, offset))
+            self._seg.write(header)
+            self._seg.write(topic_b)
+            self._seg.write(payload)
+            self._seg_bytes += len(header) + len(topic_b) + len(payload)
+            self._seg_records += 1
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._seg is not None:
+                self._seg.flush()
+                self._idx.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_segment()
+
+    def _close_segment(self) -> None:
+        if self._seg is not None:
+            self._seg.close()
+            self._idx.close()
+        self._seg = None
+        self._idx = None
+
+    def _rotate(self, ts_ms: int) -> None:
+        self._close_segment()
+        # 같은 ms에 회전이 일어나도 이름 순서 = 기록 순서가 되도록 항상 순번을 붙인다.
+        # (prune으로 지워진 번호를 다시 쓰지 않도록 마지막 순번 다음부터)
+        n = self._seg_name[1] + 1 if self._seg_name[0] == ts_ms else 0
+        while True:
+            seg_path = self.directory / f"telemetry-{ts_ms:013d}-{n:03d}{SEGMENT_SUFFIX}"
+            if not seg_path.exists():
+                break
+            n += 1
+        self._seg_name = (ts_ms, n)
+        self._seg = seg_path.open("ab", buffering=64 * 1024)
+        self._idx = seg_path.with_suffix(INDEX_SUFFIX).open("ab", buffering=4096)
+        self._seg.write(MAGIC)
+        self._seg_bytes = len(MAGIC)
+        self._seg_records = 0
+        self._prune()
+
+    def _prune(self) -> None:
+        if self.max_segments <= 0:
+            return
+        segments = list_segments(self.directory)
+        for old in segments[: max(len(segments) - self.max_segments, 0)]:
+            for p in (old, old.with_suffix(INDEX_SUFFIX)):
+                try:
+                    p.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+def _segment_key(path: Path) -> Tuple[int, int, str]:
+    # telemetry-<first_ms>-<n>; older recordings have no sequence number (or an unpadded one)
+    parts = path.stem.split("-")
+    try:
+        return int(parts[1]), int(parts[2]) if len(parts) > 2 else 0, path.name
+    except (IndexError, ValueError):
+        return 0, 0, path.name
+
+
+def list_segments(directory: Path) -> List[Path]:
+    """Segment files sorted oldest first (file names embed the first timestamp and a sequence number)."""
+    return sorted(Path(directory).glob(f"*{SEGMENT_SUFFIX}"), key=_segment_key)
+
+
+def _load_index(seg_path: Path) -> Tuple[List[int], List[int]]:
+    idx_path = seg_path.with_suffix(INDEX_SUFFIX)
+    if not idx_path.exists():
+        return [], []
+    data = idx_path.read_bytes()
+    usable = len(data) - len(data) % _IDX_ENTRY.size
+    ts_list: List[int] = []
+    off_list: List[int] = []
+    for ts, off in _IDX_ENTRY.iter_unpack(data[:usable]):
+        ts_list.append(ts)
+        off_list.append(off)
+    return ts_list, off_list
+
+
+def iter_segment(seg_path: Path, since_ms: Optional[int] = None) -> Iterator[Record]:
+    start = len(MAGIC)
+    if since_ms is not None:
+        ts_list, off_list = _load_index(seg_path)
+        i = bisect.bisect_left(ts_list, since_ms) - 1
+        if i >= 0:
+            start = off_list[i]
+
+    with seg_path.open("rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a telemetry log: {seg_path}")
+        f.seek(start)
+        while True:
+            header = f.read(_REC_HEADER.size)
+            if len(header) < _REC_HEADER.size:
+                return  # EOF or truncated tail from a crash
+            ts, topic_len, payload_len = _REC_HEADER.unpack(header)
+            body = f.read(topic_len + payload_len)
+            if len(body) < topic_len + payload_len:
+                return
+            if since_ms is not None and ts < since_ms:
+                continue
+            yield ts, body[:topic_len].decode("utf-8", errors="replace"), body[topic_len:]
+
+
+def iter_records(directory: Path, since_ms: Optional[int] = None) -> Iterator[Record]:
+    """Iterate all recorded messages in a directory in write order."""
+    for seg_path in list_segments(directory):
+        yield from iter_segment(seg_path, since_ms=since_ms)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+import paho.mqtt.client as mqtt
+
+from .recorder import iter_records
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def replay(
+    client: mqtt.Client,
+    directory: Path,
+    *,
+    speed: float = 1.0,
+    since_ms: Optional[int] = None,
+    topics: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Re-publish a recording. speed=1.0 keeps original timing, 10.0 is 10x faster,
+    0 publishes as fast as possible. Returns the number of published messages.
+    """
+    wanted = set(topics) if topics else None
+    first_ts: Optional[int] = None
+    wall_start = time.monotonic()
+    count = 0
+    info = None
+    for ts, topic, payload in iter_records(directory, since_ms=since_ms):
+        if wanted is not None and topic not in wanted:
+            continue
+        if first_ts is None:
+            first_ts = ts
+        if speed > 0:
+            due = wall_start + (ts - first_ts) / 1000.0 / speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        info = client.publish(topic, payload, qos=0, retain=False)
+        count += 1
+    if info is not None:
+        info.wait_for_publish(timeout=5.0)
+    return count
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Replay a telemetry recording to an MQTT broker")
+    ap.add_argument("--dir", required=True, help="recording directory (AGV_RECORD_DIR of the webapp)")
+    ap.add_argument("--mqtt", default=str(REPO_ROOT / "config" / "dev" / "mqtt.json"), help="path to mqtt.json")
+    ap.add_argument("--speed", type=float, default=1.0, help="playback speed multiplier (0 = no delay)")
+    ap.add_argument("--since", type=int, default=None, help="start from this timestamp (ms)")
+    ap.add_argument("--topic", action="append", default=None, help="only replay this topic (repeatable)")
+    args = ap.parse_args()
+
+    cfg = json.loads(Path(args.mqtt).read_text(encoding="utf-8"))
+    client = mqtt.Client(client_id=f"{cfg.get('client_id', 'agv_dev')}_replay")
+    username = (cfg.get("username") or "").strip()
+    if username:
+        client.username_pw_set(username, (cfg.get("password") or "").strip())
+    client.connect(cfg.get("broker", "localhost"), int(cfg.get("port", 1883)), int(cfg.get("keepalive", 60)))
+    client.loop_start()
+    try:
+        started = time.monotonic()
+        count = replay(client, Path(args.dir), speed=args.speed, since_ms=args.since, topics=args.topic)
+        print(f"[replay] published {count} messages in {time.monotonic() - started:.1f}s")
+    finally:
+        client.loop_stop()
+        client.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,23 @@ import json
 import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import paho.mqtt.client as mqtt
 
+from agv_common import codec
+from agv_common.schemas import SchemaError, validate_path
+
+from .recorder import TelemetryRecorder
+from .trajectory import PoseHistory
+
+DEFAULT_AGV_ID = "default"
+
 
 class AgvTelemetry:
     """Keep the latest AGV pose/status from MQTT and publish go/stop commands."""
 
-    def __init__(self, cfg_path: Path):
+    def __init__(self, cfg_path: Path, record_dir: Optional[Path] = None):
         self.cfg_path = cfg_path
         self.cfg = self._load_cfg(cfg_path)
         topics = self.cfg.get("topics", {})
@@ -33,7 +41,23 @@ class AgvTelemetry:
         self.port = int(self.cfg.get("port", 1883))
         self.keepalive = int(self.cfg.get("keepalive", 60))
 
+        self.history_size = int(self.cfg.get("history_size", 3000))
+        # pose 메시지는 latest-wins로 합쳐서 최대 pose_max_rate_hz 만큼만 파싱/반영한다 (0 = 제한 없음)
+        max_rate = float(self.cfg.get("pose_max_rate_hz", 20))
+        self.pose_min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+
+        # Optional raw message recording (see recorder.py / replay.py)
+        self.recorder: Optional[TelemetryRecorder] = None
+        if record_dir is not None:
+            rec_cfg = self.cfg.get("recording", {}) or {}
+            self.recorder = TelemetryRecorder(
+                record_dir,
+                max_segment_bytes=int(rec_cfg.get("max_segment_mb", 64)) * 1024 * 1024,
+                max_segments=int(rec_cfg.get("max_segments", 20)),
+            )
+
         self._lock = threading.Lock()
+        self._history: Dict[str, PoseHistory] = {}
         self._connected = False
         self._last_error: Optional[str] = None
         self._state: Dict[str, Any] = {
@@ -42,9 +66,19 @@ class AgvTelemetry:
             "velocity": None,
             "last_seen_ms": None,
             "frame": None,
-            "path": None,
             "path_last_ms": None,
+            "path_error": None,
         }
+        # The path is kept as the raw MQTT payload and spliced into the snapshot as-is.
+        self._path_raw: Optional[bytes] = None
+        # pose messages are numbered on arrival; an older one never overwrites a newer one
+        self._pose_seq = 0
+        self._pose_applied_seq = 0
+        self._pending_pose: Optional[Tuple[int, bytes]] = None
+        self._pose_applied_at = float("-inf")
+        self._version = 0
+        self._snapshot_key: Optional[Tuple[int, bool, Optional[str]]] = None
+        self._snapshot_cache = b""
 
     def _load_cfg(self, path: Path) -> Dict[str, Any]:
         try:
@@ -68,6 +102,8 @@ class AgvTelemetry:
             self.client.disconnect()
         except Exception:
             pass
+        if self.recorder is not None:
+            self.recorder.close()
 
     def _on_connect(self, client, userdata, flags, rc):
         if rc != 0:
@@ -76,59 +112,168 @@ class AgvTelemetry:
         self._connected = True
         client.subscribe(self.pose_topic, qos=1)
         client.subscribe(self.path_topic, qos=1)
+        if self.recorder is not None:
+            client.subscribe(self.cmd_topic, qos=1)
+            client.subscribe(self.items_topic, qos=1)
 
     def _on_message(self, client, userdata, msg):
-        try:
-            payload = json.loads(msg.payload.decode("utf-8"))
-        except Exception:
-            return
-
         topic = getattr(msg, "topic", "")
+        if self.recorder is not None:
+            try:
+                self.recorder.write(topic, msg.payload)
+            except Exception as exc:
+                self._last_error = f"Recording failed: {exc}"
+
         if topic == self.pose_topic:
-            pose = payload.get("pose") or {
-                "x": payload.get("x"),
-                "y": payload.get("y"),
-                "theta": payload.get("theta"),
-            }
-            status = payload.get("status")
-            velocity = payload.get("velocity")
-            frame = payload.get("frame")
-            ts = payload.get("timestamp_ms") or payload.get("created_ms") or int(time.time() * 1000)
+            now = time.monotonic()
             with self._lock:
-                self._state.update(
-                    {
-                        "pose": pose,
-                        "status": status,
-                        "velocity": velocity,
-                        "last_seen_ms": ts,
-                        "frame": frame,
-                    }
-                )
+                self._pose_seq += 1
+                seq = self._pose_seq
+                if now - self._pose_applied_at < self.pose_min_interval:
+                    self._pending_pose = (seq, msg.payload)  # parsed lazily on the next read
+                    return
+                self._pending_pose = None
+            self._apply_pose(msg.payload, seq, applied_at=now)
         elif topic == self.path_topic:
-            ts = payload.get("created_ms") or payload.get("timestamp_ms") or int(time.time() * 1000)
+            self._apply_path(msg.payload)
+
+    def _apply_pose(self, raw: bytes, seq: int, applied_at: Optional[float] = None) -> bool:
+        """Parse and apply pose message number `seq`; False if invalid or older than the applied one."""
+        try:
+            payload = codec.loads(raw)
+        except Exception:
+            return False
+        if not isinstance(payload, dict):
+            return False
+
+        pose = payload.get("pose") or {
+            "x": payload.get("x"),
+            "y": payload.get("y"),
+            "theta": payload.get("theta"),
+        }
+        status = payload.get("status")
+        velocity = payload.get("velocity")
+        frame = payload.get("frame")
+        ts = payload.get("timestamp_ms") or payload.get("created_ms") or int(time.time() * 1000)
+        agv_id = str(payload.get("agv_id") or DEFAULT_AGV_ID)
+        with self._lock:
+            if seq <= self._pose_applied_seq:
+                return False  # a newer pose was applied while this one was parsed
+            self._pose_applied_seq = seq
+            if applied_at is not None:
+                self._pose_applied_at = applied_at
+            self._state.update(
+                {
+                    "pose": pose,
+                    "status": status,
+                    "velocity": velocity,
+                    "last_seen_ms": ts,
+                    "frame": frame,
+                }
+            )
+            samples = payload.get("samples")
+            if isinstance(samples, list) and samples:
+                # batched publisher (Drive_Control PosePublisher): [[t_ms, x, y, theta], ...]
+                for sample in samples:
+                    if isinstance(sample, (list, tuple)) and len(sample) >= 3:
+                        theta = sample[3] if len(sample) > 3 else None
+                        self._record_pose(agv_id, sample[0], {"x": sample[1], "y": sample[2], "theta": theta})
+            else:
+                self._record_pose(agv_id, ts, pose)
+            self._version += 1
+        return True
+
+    def _apply_path(self, raw: bytes) -> None:
+        try:
+            payload = codec.loads(raw)
+        except Exception:
+            return
+        if not isinstance(payload, dict):
+            return
+
+        try:
+            validate_path(payload)
+        except SchemaError as e:
+            # planner failures arrive as {"error": ...}; keep the last good path on screen
             with self._lock:
-                self._state.update(
-                    {
-                        "path": payload,
-                        "path_last_ms": ts,
-                    }
-                )
-
-    def snapshot(self) -> Dict[str, Any]:
+                self._state["path_error"] = str(payload.get("error") or e)
+                self._version += 1
+            return
+
+        ts = payload.get("created_ms") or payload.get("timestamp_ms") or int(time.time() * 1000)
+        with self._lock:
+            self._path_raw = bytes(raw)
+            self._state["path_last_ms"] = ts
+            self._state["path_error"] = None
+            self._version += 1
+
+    def _flush_pending_pose(self) -> None:
+        with self._lock:
+            pending = self._pending_pose
+            self._pending_pose = None
+        if pending is not None:
+            self._apply_pose(pending[1], pending[0])
+
+    def _record_pose(self, agv_id: str, ts: Any, pose: Any) -> None:
+        # caller holds self._lock
+        if not isinstance(pose, dict):
+            return
+        x, y = pose.get("x"), pose.get("y")
+        if x is None or y is None:
+            return
+        try:
+            theta = pose.get("theta")
+            theta = float(theta) if theta is not None else None
+            sample = (int(ts), float(x), float(y), theta)
+        except (TypeError, ValueError):
+            return
+        history = self._history.get(agv_id)
+        if history is None:
+            history = self._history[agv_id] = PoseHistory(self.history_size)
+        history.append(*sample)
+
+    def trajectory(
+        self,
+        agv_id: Optional[str] = None,
+        since_ms: Optional[int] = None,
+        downsample: int = 1,
+    ) -> Dict[str, Any]:
+        """Return recorded pose history per AGV (columns: t_ms/x/y/theta)."""
+        self._flush_pending_pose()
+        with self._lock:
+            if agv_id is not None:
+                targets = {agv_id: self._history[agv_id]} if agv_id in self._history else {}
+            else:
+                targets = dict(self._history)
+            tracks = {aid: h.query(since_ms=since_ms, downsample=downsample) for aid, h in targets.items()}
+        return {"since_ms": since_ms, "downsample": max(int(downsample), 1), "agvs": tracks}
+
+    def snapshot(self) -> bytes:
+        """
+        Current state as a serialized JSON document. The bytes are cached and only
+        rebuilt when pose/path/connection state changed since the last call.
+        """
+        self._flush_pending_pose()
         with self._lock:
-            state = dict(self._state)
-        state["connected"] = self._connected
-        state["last_error"] = self._last_error
-        state["pose_topic"] = self.pose_topic
-        state["command_topic"] = self.cmd_topic
-        state["path_topic"] = self.path_topic
-        state["items_topic"] = self.items_topic
-        return state
+            key = (self._version, self._connected, self._last_error)
+            if key != self._snapshot_key:
+                state = dict(self._state)
+                state["connected"] = self._connected
+                state["last_error"] = self._last_error
+                state["pose_topic"] = self.pose_topic
+                state["command_topic"] = self.cmd_topic
+                state["path_topic"] = self.path_topic
+                state["items_topic"] = self.items_topic
+                body = codec.dumps(state)
+                self._snapshot_cache = b'{"path":' + (self._path_raw or b"null") + b"," + body[1:]
+                self._snapshot_key = key
+            return self._snapshot_cache
 
     def clear_path(self) -> None:
         with self._lock:
-            self._state["path"] = None
+            self._path_raw = None
             self._state["path_last_ms"] = None
+            self._version += 1
 
     def publish_command(self, action: str, source: str = "ui", utterance: str = "") -> None:
         payload = {
@@ -140,7 +285,7 @@ class AgvTelemetry:
 
         if self._connected:
             try:
-                self.client.publish(self.cmd_topic, json.dumps(payload), qos=1, retain=False)
+                self.client.publish(self.cmd_topic, codec.dumps(payload), qos=1, retain=False)
                 return
             except Exception:
                 # Fall back to one-off client below.
@@ -153,6 +298,6 @@ class AgvTelemetry:
             temp_client.username_pw_set(username, password)
 
         temp_client.connect(self.broker, self.port, self.keepalive)
-        temp_client.publish(self.cmd_topic, json.dumps(payload), qos=1, retain=False)
+        temp_client.publish(self.cmd_topic, codec.dumps(payload), qos=1, retain=False)
         temp_client.loop(timeout=1.5)
         temp_client.disconnect()
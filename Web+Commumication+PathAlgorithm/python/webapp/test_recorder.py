@@ -0,0 +1,24 @@
+"""Recorder ordering: run with `python -m pytest webapp` from python/."""
+from .recorder import TelemetryRecorder, iter_records, list_segments
+
+
+def test_same_ms_rotation_keeps_write_order(tmp_path):
+    # every record fills a segment, so all rotations happen within the same ms
+    rec = TelemetryRecorder(tmp_path, max_segment_bytes=1, max_segments=3)
+    for i in range(5):
+        rec.write("agv/pose", str(i).encode(), ts_ms=1000)
+    rec.close()
+
+    segments = list_segments(tmp_path)
+    assert len(segments) == 3  # pruning dropped the two oldest
+    assert [payload for _, _, payload in iter_records(tmp_path)] == [b"2", b"3", b"4"]
+
+
+def test_legacy_names_sort_by_sequence(tmp_path):
+    for name in ["telemetry-0000000001000-1", "telemetry-0000000001000", "telemetry-0000000000999"]:
+        (tmp_path / f"{name}.agvlog").write_bytes(b"")
+    assert [p.stem for p in list_segments(tmp_path)] == [
+        "telemetry-0000000000999",
+        "telemetry-0000000001000",
+        "telemetry-0000000001000-1",
+    ]
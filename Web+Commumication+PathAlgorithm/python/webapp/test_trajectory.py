@@ -0,0 +1,26 @@
+"""PoseHistory ring buffer: run with `python -m pytest webapp` from python/."""
+from .trajectory import PoseHistory
+
+
+def test_ring_keeps_newest_in_order():
+    hist = PoseHistory(capacity=3)
+    for t in range(5):
+        hist.append(t, float(t), 0.0)
+    assert len(hist) == 3
+    assert hist.query()["t_ms"] == [2, 3, 4]
+
+
+def test_since_filter_survives_clock_jump():
+    hist = PoseHistory(capacity=8)
+    for t in [100, 200, 50, 60]:  # AGV clock jumped back
+        hist.append(t, 0.0, 0.0, theta=None if t == 60 else 1.0)
+    out = hist.query(since_ms=55)
+    assert out["t_ms"] == [100, 200, 60]
+    assert out["theta"] == [1.0, 1.0, None]
+
+
+def test_downsample_keeps_last_sample():
+    hist = PoseHistory(capacity=10)
+    for t in range(6):
+        hist.append(t, 0.0, 0.0)
+    assert hist.query(downsample=4)["t_ms"] == [0, 4, 5]
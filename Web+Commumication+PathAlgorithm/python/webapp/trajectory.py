@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+class PoseHistory:
+    """Fixed-size ring buffer of timestamped poses stored as NumPy columns."""
+
+    def __init__(self, capacity: int = 3000):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = int(capacity)
+        self.t_ms = np.zeros(self.capacity, dtype=np.int64)
+        self.x = np.zeros(self.capacity, dtype=np.float64)
+        self.y = np.zeros(self.capacity, dtype=np.float64)
+        self.theta = np.full(self.capacity, np.nan, dtype=np.float64)
+        self._head = 0  # next write index
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, t_ms: int, x: float, y: float, theta: Optional[float] = None) -> None:
+        i = self._head
+        self.t_ms[i] = t_ms
+        self.x[i] = x
+        self.y[i] = y
+        self.theta[i] = np.nan if theta is None else theta
+        self._head = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self) -> None:
+        self._head = 0
+        self._count = 0
+
+    def _ordered_index(self) -> np.ndarray:
+        """Indices of stored samples from oldest to newest."""
+        start = (self._head - self._count) % self.capacity
+        return (start + np.arange(self._count)) % self.capacity
+
+    def query(self, since_ms: Optional[int] = None, downsample: int = 1) -> Dict[str, Any]:
+        """
+        since_ms 이후의 샘플을 시간순으로 반환. downsample=N 이면 N개 중 1개만 남기되
+        마지막 샘플(현재 위치)은 항상 포함한다.
+        """
+        if self._count == 0:
+            return {"t_ms": [], "x": [], "y": [], "theta": []}
+
+        idx = self._ordered_index()
+        if since_ms is not None:
+            # timestamps come from the AGV clock and may jump back, so filter instead of bisecting
+            idx = idx[self.t_ms[idx] > since_ms]
+
+        step = max(int(downsample), 1)
+        if step > 1 and idx.size > 1:
+            last = idx[-1]
+            idx = idx[::step]
+            if idx[-1] != last:
+                idx = np.append(idx, last)
+
+        theta = self.theta[idx]
+        theta_out: List[Optional[float]] = [None if np.isnan(v) else float(v) for v in theta]
+        return {
+            "t_ms": self.t_ms[idx].tolist(),
+            "x": self.x[idx].tolist(),
+            "y": self.y[idx].tolist(),
+            "theta": theta_out,
+        }